@@ -3,11 +3,13 @@
 
 import numpy as np
 from scipy.stats import norm, entropy
-from scipy.special import erf
+from scipy.special import erf, xlogy
 
 from sklearn.cluster import KMeans
 from sklearn.neighbors import NearestNeighbors
 
+from .model import RandomFourierFeatureSampler
+
 
 class AcquisitionFunction(object):
     """ Abstract base class for acquisition functions."""
@@ -239,32 +241,37 @@ class Random(AcquisitionFunction):
         return np.random.random()
 
 
-class EntropySearch(AcquisitionFunction):
-    """ Entropy search acquisition function
+class RepresenterPointsAcquisition(AcquisitionFunction):
+    """ Base class of acquisition functions based on GP samples at representer points.
 
-    This acquisition function samples at the position which reveals the maximal
-    amount of information about the true position of the maximum. For this
-    *n_candidates* data points (representers) for the position of the true
-    maximum (p_max) are selected. 
-    From the GP model, *n_gp_samples* samples from the posterior are
-    drawn and their entropy is computed. For each query point, the GP model is
-    updated assuming *n_samples_y* outcomes (according to the current GP model).
-    The change of entropy resulting from this assumed outcomes is computed and
-    the query point which minimizes the entropy of p_max is selected.
+    set_boundaries selects *n_candidates* representer points, factorizes the
+    covariance of the GP posterior at them once and draws a fixed block of
+    standard normal samples, from which the *n_gp_samples* GP samples are
+    obtained. The GP samples after a (noise-free) observation at a query point
+    follow from the same standard normal samples by a rank-one update
+    (Matheron's rule), so that the samples for all query points and all
+    *n_samples_y* assumed outcomes are computed at once with tensor
+    operations, in chunks of query points of at most *chunk_elements* samples.
 
-    See also:
-        Hennig, Philipp and Schuler, Christian J. 
-        Entropy Search for Information-Efficient Global Optimization. 
-        JMLR, 13:1809–1837, 2012.
+    The representer points are the maxima of *n_candidates* GP samples on a
+    pool of *n_trial_points* uniform random points (discretized Thompson
+    sampling). The samples are drawn jointly, either exactly (*trial_sampler*
+    "exact", which factorizes the covariance of the pool) or with
+    *n_features* random Fourier features ("rff", for large pools).
     """
     def __init__(self, model, n_candidates=20, n_gp_samples=500,
-                 n_samples_y=10, n_trial_points=500, rng_seed=0):
+                 n_samples_y=10, n_trial_points=500, rng_seed=0,
+                 chunk_elements=2000000, trial_sampler="exact",
+                 n_features=1000):
         self.model = model
         self.n_candidates = n_candidates
         self.n_gp_samples = n_gp_samples
         self.n_samples_y =  n_samples_y
         self.n_trial_points = n_trial_points
         self.rng_seed = rng_seed
+        self.chunk_elements = chunk_elements
+        self.trial_sampler = trial_sampler
+        self.n_features = n_features
 
         # We use an equidistant grid instead of sampling from the 1d normal
         # distribution over y
@@ -272,12 +279,12 @@ class EntropySearch(AcquisitionFunction):
         self.percent_points = norm.ppf(equidistant_grid)
 
     def __call__(self, x, incumbent=0, *args, **kwargs):
-        """ Returns the change in entropy of p_max when sampling at x.
+        """ Returns the acquisition value at the query point(s) x.
 
         Parameters
         ----------
         x: array-like
-            The position(s) at which the upper confidence bound will be evaluated.
+            The position(s) at which the acquisition function will be evaluated.
         incumbent: float
             Baseline value, typically the maximum (actual) return observed
             so far during learning. Defaults to 0. [Not used by this acquisition
@@ -285,59 +292,26 @@ class EntropySearch(AcquisitionFunction):
 
         Returns
         -------
-        entropy_change: float
-            the change in entropy of p_max when sampling at x.
+        values: ndarray, shape=(n_query_points,)
+            the acquisition value at every query point, averaged over the
+            assumed outcomes at the query point.
         """
         x = np.atleast_2d(x)
+        values = np.empty(x.shape[0])
 
-        a_ES = np.empty((x.shape[0], self.n_samples_y))
+        chunk_size = max(1, self.chunk_elements // (
+            self.n_samples_y * self.n_candidates * self.n_gp_samples))
+        for start in range(0, x.shape[0], chunk_size):
+            f_mean_delta, f_samples = \
+                self._updated_samples(x[start:start + chunk_size])
+            # Average over the different assumed outcomes y_i[j]
+            values[start:start + chunk_size] = \
+                self._acquisition(f_mean_delta, f_samples).mean(1)
 
-        # Evaluate mean and covariance of GP at all representer points and
-        # points x where MRS will be evaluated
-        f_mean_all, f_cov_all = \
-            self.model.gp.predict(np.vstack((self.X_candidate, x)),
-                                  return_cov=True)
-        f_mean = f_mean_all[:self.n_candidates]
-        f_cov = f_cov_all[:self.n_candidates, :self.n_candidates]
-
-        # Iterate over all x[i] at which we will evaluate the acquisition 
-        # function (often x.shape[0]=1)
-        for i in range(self.n_candidates, self.n_candidates+x.shape[0]):
-            # Simulate change of covariance (f_cov_delta) for a sample at x[i], 
-            # which actually would not depend on the observed value y[i]
-            f_cov_query = f_cov_all[[i]][:, [i]]
-            f_cov_cross = f_cov_all[:self.n_candidates, [i]]
-            f_cov_query_inv = np.linalg.inv(f_cov_query)
-            f_cov_delta = -np.dot(np.dot(f_cov_cross, f_cov_query_inv),
-                                  f_cov_cross.T)
-
-            # precompute samples from GP posterior for non-modified mean
-            f_samples = np.random.RandomState(self.rng_seed).multivariate_normal(
-                f_mean, f_cov + f_cov_delta, self.n_gp_samples).T
-
-            # adapt for different outcomes y_i[j] of the query at x[i]
-            for j in range(self.n_samples_y):  
-                # "sample" outcomes y_i[j] (more specifically where on the 
-                # Gaussian distribution over y_i[j] we would end up)
-                y_delta = np.sqrt(f_cov_query + self.model.gp.alpha)[:, 0] \
-                    * self.percent_points[j]
-                # Compute change in GP mean at representer points
-                f_mean_delta = f_cov_cross.dot(f_cov_query_inv).dot(y_delta)
-
-                # Adapt samples to changes in GP posterior mean
-                f_samples_j = f_samples + f_mean_delta[:, np.newaxis]
-                # Count frequency of the candidates being the optima in the samples
-                p_max = np.bincount(np.argmax(f_samples_j, 0),
-                                    minlength=f_mean.shape[0]) \
-                    / float(self.n_gp_samples)
-                # Determing entropy of distr. p_max and compare to base entropy
-                a_ES[i - self.n_candidates, j] = \
-                    self.base_entropy - entropy(p_max)
-
-         # Average entropy change over the different  assumed outcomes y_i[j]
-        return a_ES.mean(1) 
-
-    def set_boundaries(self, boundaries, X_candidate=None):
+        return values
+
+    def set_boundaries(self, boundaries, X_candidate=None,
+                       trial_sampler=None):
         """Sets boundaries of search space.
 
         This method is assumed to be called once before running the
@@ -349,43 +323,170 @@ class EntropySearch(AcquisitionFunction):
             Box constraint on search space. boundaries[:, 0] defines the lower
             bounds on the dimensions, boundaries[:, 1] defines the upper
             bounds.
+
+        X_candidate: ndarray-like, shape=(n_candidates, n_params_dims)
+            Representer points. If None, they are selected by (discretized)
+            Thompson sampling.
+
+        trial_sampler: callable, default: None
+            Sampler of the GP posterior at the trial points, as returned by
+            create_trial_sampler. Acquisition functions on the same model may
+            share one sampler. If None, a new sampler is created.
         """
         self.X_candidate = X_candidate
         if self.X_candidate is None:
-            # Sample n_candidates data points, which are checked for
-            # being selected as representer points using (discretized) Thompson
-            # sampling
-            self.X_candidate = \
-                np.empty((self.n_candidates, boundaries.shape[0]))
-            for i in range(self.n_candidates):
-                # SelectObjective n_trial_points data points uniform randomly
-                candidates = np.random.uniform(
-                    boundaries[:, 0], boundaries[:, 1],
-                    (self.n_trial_points, boundaries.shape[0]))
-                # Sample function from GP posterior and select the trial points
-                # which maximizes the posterior sample as representer points 
-                try:
-                    y_samples = self.model.gp.sample_y(candidates)
-                    self.X_candidate[i] = candidates[np.argmax(y_samples)]
-                except np.linalg.LinAlgError:  # This should happen very infrequently
-                    self.X_candidate[i] = candidates[0]
+            # SelectObjective n_trial_points data points uniform randomly
+            candidates = np.random.uniform(
+                boundaries[:, 0], boundaries[:, 1],
+                (self.n_trial_points, boundaries.shape[0]))
+            if trial_sampler is None:
+                trial_sampler = self.create_trial_sampler()
+            # Sample n_candidates functions from GP posterior jointly and
+            # select the trial points which maximize the posterior samples as
+            # representer points
+            try:
+                y_samples = trial_sampler(candidates)
+                self.X_candidate = candidates[np.argmax(y_samples, 0)]
+            except np.linalg.LinAlgError:  # This should happen very infrequently
+                self.X_candidate = candidates[:self.n_candidates]
         else:
             self.n_candidates = self.X_candidate.shape[0]
 
-        ### Determine base entropy
-        # Draw n_gp_samples functions from GP posterior
-        f_mean, f_cov = \
+        # Factorize the GP covariance at the representer points as
+        # f_cov = f_cov_root f_cov_root^T (robust to singular covariances)
+        self.f_mean, f_cov = \
             self.model.gp.predict(self.X_candidate, return_cov=True)
-        f_samples = np.random.RandomState(self.rng_seed).multivariate_normal(
-            f_mean, f_cov, self.n_gp_samples).T
+        eigvals, eigvecs = np.linalg.eigh(f_cov)
+        eigvals = np.maximum(eigvals, 0)
+        tolerance = eigvals.max() * eigvals.shape[0] * np.finfo(float).eps
+        self.f_cov_root = eigvecs * np.sqrt(eigvals)
+        self.f_cov_root_pinv = \
+            (eigvecs * np.where(eigvals > tolerance,
+                                1 / np.sqrt(np.maximum(eigvals, tolerance)),
+                                0)).T
+
+        # Draw n_gp_samples functions from GP posterior
+        rng = np.random.RandomState(self.rng_seed)
+        self.normal_samples = \
+            rng.standard_normal((self.n_candidates, self.n_gp_samples))
+        self.normal_samples_query = rng.standard_normal(self.n_gp_samples)
+        self.f_samples = self.f_mean[:, np.newaxis] \
+            + self.f_cov_root.dot(self.normal_samples)
+
+        self._set_base()
+
+    def create_trial_sampler(self):
+        """ Returns a sampler of n_candidates functions from the GP posterior.
+
+        The sampler is called with the trial points and returns the samples at
+        them, shape (n_trial_points, n_candidates).
+        """
+        random_state = np.random.randint(np.iinfo(np.int32).max)
+        if self.trial_sampler == "rff":
+            return RandomFourierFeatureSampler(
+                self.model.gp, self.n_candidates, n_features=self.n_features,
+                random_state=random_state)
+        if self.trial_sampler != "exact":
+            raise ValueError("Unknown trial sampler %s" % self.trial_sampler)
+
+        def sample_exact(X):
+            return self.model.gp.sample_y(X, self.n_candidates,
+                                          random_state=random_state)
+        return sample_exact
+
+    def _updated_samples(self, x):
+        """ GP samples at representer points after observations at x.
+
+        Returns the change of the GP mean at the representer points for every
+        query point and assumed outcome, shape (n_query_points, n_samples_y,
+        n_candidates), and the GP samples for the unchanged mean, shape
+        (n_query_points, n_gp_samples, n_candidates).
+        """
+        # Evaluate mean and covariance of GP at all representer points and
+        # points x where the acquisition function will be evaluated
+        _, f_cov_all = \
+            self.model.gp.predict(np.vstack((self.X_candidate, x)),
+                                  return_cov=True)
+        f_cov_cross = f_cov_all[:self.n_candidates, self.n_candidates:]
+        f_var_query = np.diag(f_cov_all)[self.n_candidates:]
+
+        # Samples of the GP at x jointly with the samples at the representer
+        # points (without the mean)
+        coefs = self.f_cov_root_pinv.dot(f_cov_cross)
+        residual = np.sqrt(np.maximum(f_var_query - (coefs ** 2).sum(0), 0))
+        f_query_samples = coefs.T.dot(self.normal_samples) \
+            + residual[:, np.newaxis] * self.normal_samples_query
+
+        # Simulate change of covariance for a sample at x[i], which actually
+        # would not depend on the observed value y[i], by conditioning the
+        # samples on the GP at x[i]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            gain = np.where(f_var_query > 0, f_cov_cross / f_var_query, 0).T
+        f_samples = self.f_samples.T[np.newaxis] \
+            - f_query_samples[:, :, np.newaxis] * gain[:, np.newaxis]
+
+        # "sample" outcomes y_i[j] (more specifically where on the Gaussian
+        # distribution over y_i[j] we would end up) and compute the change in
+        # GP mean at representer points
+        y_delta = np.sqrt(f_var_query + self.model.gp.alpha)[:, np.newaxis] \
+            * self.percent_points
+        f_mean_delta = gain[:, np.newaxis] * y_delta[:, :, np.newaxis]
+
+        return f_mean_delta, f_samples
+
+    def _p_max(self, argmax):
+        """ Frequency of the representer points being the optima in samples.
+
+        argmax has shape (..., n_gp_samples) and contains the index of the
+        optimal representer point in every sample.
+        """
+        shape = argmax.shape[:-1] + (self.n_candidates,)
+        argmax = argmax.reshape(-1, self.n_gp_samples)
+        offsets = self.n_candidates * np.arange(argmax.shape[0])[:, np.newaxis]
+        counts = np.bincount((argmax + offsets).ravel(),
+                             minlength=argmax.shape[0] * self.n_candidates)
+        return counts.reshape(shape) / float(self.n_gp_samples)
+
+    def _set_base(self):
+        raise NotImplementedError()
+
+    def _acquisition(self, f_mean_delta, f_samples):
+        """ Acquisition value for every query point and assumed outcome. """
+        raise NotImplementedError()
+
+
+class EntropySearch(RepresenterPointsAcquisition):
+    """ Entropy search acquisition function
+
+    This acquisition function samples at the position which reveals the maximal
+    amount of information about the true position of the maximum. For this
+    *n_candidates* data points (representers) for the position of the true
+    maximum (p_max) are selected. 
+    From the GP model, *n_gp_samples* samples from the posterior are
+    drawn and their entropy is computed. For each query point, the GP model is
+    updated assuming *n_samples_y* outcomes (according to the current GP model).
+    The change of entropy resulting from this assumed outcomes is computed and
+    the query point which minimizes the entropy of p_max is selected.
+
+    See also:
+        Hennig, Philipp and Schuler, Christian J. 
+        Entropy Search for Information-Efficient Global Optimization. 
+        JMLR, 13:1809–1837, 2012.
+    """
+    def _set_base(self):
+        # Determine entropy of distr. p_max
+        self.base_entropy = entropy(self._p_max(np.argmax(self.f_samples, 0)))
+
+    def _acquisition(self, f_mean_delta, f_samples):
+        # Adapt samples to changes in GP posterior mean
+        f_samples_j = f_samples[:, np.newaxis] + f_mean_delta[:, :, np.newaxis]
         # Count frequency of the candidates being the optima in the samples
-        p_max = np.bincount(np.argmax(f_samples, 0), minlength=f_mean.shape[0]) \
-            / float(self.n_gp_samples)
-        # Determing entropy of distr. p_max
-        self.base_entropy = entropy(p_max)
+        p_max = self._p_max(np.argmax(f_samples_j, -1))
+        # Determine entropy of distr. p_max and compare to base entropy
+        return self.base_entropy + xlogy(p_max, p_max).sum(-1)
 
 
-class MinimalRegretSearch(AcquisitionFunction):
+class MinimalRegretSearch(RepresenterPointsAcquisition):
     """ Minimum regret search acquisition function
 
     This acquisition function samples at the position which reduces the expected
@@ -407,163 +508,64 @@ class MinimalRegretSearch(AcquisitionFunction):
         ICML, 2016
     """
     def __init__(self, model, n_candidates=20, n_gp_samples=500,
-                 n_samples_y=10, n_trial_points=500, point=False, rng_seed=0):
-        self.model = model
-        self.n_candidates = n_candidates
-        self.n_gp_samples = n_gp_samples
-        self.n_samples_y =  n_samples_y
-        self.n_trial_points = n_trial_points
+                 n_samples_y=10, n_trial_points=500, point=False, rng_seed=0,
+                 chunk_elements=2000000, trial_sampler="exact",
+                 n_features=1000):
+        super(MinimalRegretSearch, self).__init__(
+            model, n_candidates=n_candidates, n_gp_samples=n_gp_samples,
+            n_samples_y=n_samples_y, n_trial_points=n_trial_points,
+            rng_seed=rng_seed, chunk_elements=chunk_elements,
+            trial_sampler=trial_sampler, n_features=n_features)
         self.point = point
-        self.rng_seed = rng_seed
-
-        equidistant_grid = np.linspace(0.0, 1.0, 2 * self.n_samples_y +1)[1::2]
-        self.percent_points = norm.ppf(equidistant_grid)
-
-    def __call__(self, x, incumbent=0, *args, **kwargs):
-        """ Returns the change in entropy of p_max when sampling at x.
-
-        Parameters
-        ----------
-        x: array-like
-            The position at which the upper confidence bound will be evaluated.
-        incumbent: float
-            Baseline value, typically the maximum (actual) return observed
-            so far during learning. Defaults to 0. [Not used by this acquisition
-            function]
-
-        Returns
-        -------
-        regret_change: float
-            the change in regret when sampling at x.
-        """
-        x = np.atleast_2d(x)
-
-        a_MRS = np.empty((x.shape[0], self.n_samples_y))
-
-        # Evaluate mean and covariance of GP at all representer points and
-        # points x where MRS will be evaluated
-        f_mean_all, f_cov_all = \
-            self.model.gp.predict(np.vstack((self.X_candidate, x)),
-                                  return_cov=True)
-        f_mean = f_mean_all[:self.n_candidates]
-        f_cov = f_cov_all[:self.n_candidates, :self.n_candidates]
-
-        # Iterate over all x[i] at which we will evaluate the acquisition 
-        # function (often x.shape[0]=1)
-        for i in range(self.n_candidates, self.n_candidates+x.shape[0]):
-            # Simulate change of covariance (f_cov_delta) for a sample at x[i], 
-            # which actually would not depend on the observed value y_i
-            f_cov_query = f_cov_all[[i]][:, [i]]
-            f_cov_cross = f_cov_all[:self.n_candidates, [i]]
-            f_cov_query_inv = np.linalg.inv(f_cov_query)
-            f_cov_delta = -np.dot(np.dot(f_cov_cross, f_cov_query_inv),
-                                  f_cov_cross.T)
-
-            # precompute samples from GP posterior for non-modified mean
-            f_samples = np.random.RandomState(self.rng_seed).multivariate_normal(
-                f_mean, f_cov + f_cov_delta, self.n_gp_samples).T
-
-            # adapt for different outcomes y_i[j] of the query at x[i]
-            for j in range(self.n_samples_y):
-                # "sample" outcomes y_i[j] (more specifically where on the 
-                # Gaussian distribution over y_i[j] we would end up)
-                y_delta = np.sqrt(f_cov_query + self.model.gp.alpha)[:, 0] \
-                    * self.percent_points[j]
-                # Compute change in GP mean at representer points
-                f_mean_delta = f_cov_cross.dot(f_cov_query_inv).dot(y_delta)
-
-                # Adapt GP posterior mean and samples for modified mean
-                f_mean_j = f_mean + f_mean_delta
-                f_samples_j = f_samples + f_mean_delta[:, np.newaxis]
-
-                if self.point:
-                    # MRS point:
-                    # SelectObjective representer point for the j-th assumed outcome
-                    # y_i[j] as the maximum of the GP mean
-                    opt_ind = f_mean_j.argmax()  # selected representer point
-                    # Compute regret of selected representer point compared
-                    # to optimal representer point in the respective GP samples
-                    regrets = f_samples_j.max(0) - f_samples_j[opt_ind, :]
-                    # Store mean of regret change (to base regret) 
-                    # over all GP samples as MRS_point
-                    a_MRS[i - self.n_candidates, j] = \
-                        np.mean(self.base_regrets - regrets)
-                else:
-                    # MRS:
-                    # Determine frequency of how often each representer point 
-                    # is the optimum in the GP samples
-                    bincount = np.bincount(np.argmax(f_samples_j, 0),
-                                           minlength=f_mean.shape[0])
-                    p_max =  bincount / float(self.n_gp_samples)
-                    # Compute the incurred regrets for ALL representer points 
-                    # relative to the respective optima of the GP samples
-                    regrets = f_samples_j.max(0) - f_samples_j
-                    # Compute mean of regret change (to base regret) 
-                    # over all GP samples
-                    mean_regrets = np.mean(self.base_regrets - regrets, 1)
-                    # Compute weighted mean over all representer points where
-                    # the probability of being the optimum (p_max) of a 
-                    # representer point is used as weight.
-                    a_MRS[i - self.n_candidates, j] = \
-                        (mean_regrets * p_max).sum()
-
-        # Average MRS over the different assumed outcomes y_i[j]
-        return a_MRS.mean(1) 
-
-    def set_boundaries(self, boundaries, X_candidate=None):
-        """Sets boundaries of search space.
-
-        This method is assumed to be called once before running the
-        optimization of the acquisition function.
-
-        Parameters
-        ----------
-        boundaries: ndarray-like, shape=(n_params_dims, 2)
-            Box constraint on search space. boundaries[:, 0] defines the lower
-            bounds on the dimensions, boundaries[:, 1] defines the upper
-            bounds.
-        """
-        self.X_candidate = X_candidate
-        if self.X_candidate is None:
-            # Sample n_candidates data points, which are checked for
-            # being selected as representer points using (discretized) Thompson
-            # sampling
-            self.X_candidate = \
-                np.empty((self.n_candidates, boundaries.shape[0]))
-            for i in range(self.n_candidates):
-                # SelectObjective n_trial_points data points uniform randomly
-                candidates = np.random.uniform(
-                    boundaries[:, 0], boundaries[:, 1],
-                    (self.n_trial_points, boundaries.shape[0]))
-                # Sample function from GP posterior and select the trial points
-                # which maximizes the posterior sample as representer points 
-                try:
-                    y_samples = self.model.gp.sample_y(candidates)
-                    self.X_candidate[i] = candidates[np.argmax(y_samples)]
-                except np.linalg.LinAlgError:  # This should happen very infrequently
-                    self.X_candidate[i] = candidates[0]
-        else:
-            self.n_candidates = self.X_candidate.shape[0]
-
-        ### Determine base regret
-        # Draw n_gp_samples functions from GP posterior
-        f_mean, f_cov = \
-            self.model.gp.predict(self.X_candidate, return_cov=True)
-        f_samples = np.random.RandomState(self.rng_seed).multivariate_normal(
-            f_mean, f_cov, self.n_gp_samples).T
 
+    def _set_base(self):
         if self.point:
             # MRS point:
             # Compute the incurred regret of the representer points that 
             # maximizes the GP mean relative to the respective optima of
             # the GP samples
-            opt_ind = f_mean.argmax()  # selected representer point
-            self.base_regrets  = f_samples.max(0) - f_samples[opt_ind, :]
+            opt_ind = self.f_mean.argmax()  # selected representer point
+            self.base_regrets = \
+                self.f_samples.max(0) - self.f_samples[opt_ind, :]
         else:
             # MRS:
             # Compute the incurred regrets for ALL representer points 
             # relative to the respective optima of the GP samples
-            self.base_regrets = f_samples.max(0) - f_samples
+            self.base_regrets = self.f_samples.max(0) - self.f_samples
+
+    def _acquisition(self, f_mean_delta, f_samples):
+        # Adapt GP posterior mean and samples for modified mean
+        f_samples_j = f_samples[:, np.newaxis] + f_mean_delta[:, :, np.newaxis]
+        argmax = np.argmax(f_samples_j, -1)
+        f_samples_max = \
+            np.take_along_axis(f_samples_j, argmax[..., np.newaxis], -1)[..., 0]
+
+        if self.point:
+            # MRS point:
+            # SelectObjective representer point for the j-th assumed outcome
+            # y_i[j] as the maximum of the GP mean
+            opt_ind = (self.f_mean + f_mean_delta).argmax(-1)
+            # Compute regret of selected representer point compared
+            # to optimal representer point in the respective GP samples
+            regrets = f_samples_max - np.take_along_axis(
+                f_samples_j, opt_ind[..., np.newaxis, np.newaxis], -1)[..., 0]
+            # Mean of regret change (to base regret) over all GP samples
+            return np.mean(self.base_regrets - regrets, -1)
+
+        # MRS:
+        # Determine frequency of how often each representer point 
+        # is the optimum in the GP samples
+        p_max = self._p_max(argmax)
+        # Compute mean of the incurred regrets for ALL representer points 
+        # relative to the respective optima of the GP samples and its change
+        # to the base regret over all GP samples
+        mean_regrets = self.base_regrets.mean(-1) \
+            - f_samples_max.mean(-1)[..., np.newaxis] \
+            + f_samples.mean(-2)[:, np.newaxis] + f_mean_delta
+        # Compute weighted mean over all representer points where
+        # the probability of being the optimum (p_max) of a 
+        # representer point is used as weight.
+        return (mean_regrets * p_max).sum(-1)
 
 
 ACQUISITION_FUNCTIONS = {
@@ -1,5 +1,6 @@
 # Author: Jan Hendrik Metzen <janmetzen@mailbox.org>
 
+from collections import OrderedDict
 from itertools import cycle
 
 import numpy as np
@@ -9,6 +10,39 @@ from sklearn.utils import check_random_state
 from .utils.optimization import global_optimization
 
 
+class GrowingArray(object):
+    """ Rows stored in an array whose capacity doubles when it is full.
+
+    Appending a row copies amortized O(1) rows. The property array is a view
+    of the stored rows; rows are never overwritten, so that views handed out
+    earlier remain valid.
+    """
+    def __init__(self, capacity=16):
+        self.capacity = capacity
+        self.buffer = None
+        self.n_rows = 0
+
+    def append(self, row):
+        row = np.asarray(row, dtype=float)
+        if self.buffer is None:
+            self.buffer = np.empty((self.capacity,) + row.shape)
+        elif self.n_rows == self.buffer.shape[0]:
+            buffer = np.empty((2 * self.n_rows,) + self.buffer.shape[1:])
+            buffer[:self.n_rows] = self.buffer
+            self.buffer = buffer
+        self.buffer[self.n_rows] = row
+        self.n_rows += 1
+
+    @property
+    def array(self):
+        if self.buffer is None:
+            return np.empty(0)
+        return self.buffer[:self.n_rows]
+
+    def __len__(self):
+        return self.n_rows
+
+
 class BayesianOptimizer(object):
     """Bayesian optimization for global black-box optimization
 
@@ -59,20 +93,29 @@ class BayesianOptimizer(object):
 
     random_state : RandomState or int (default: None)
         Seed for the random number generator.
+
+    n_restarts : int, default: 1
+        The number of best random points from which the "random+lbfgs"
+        optimizer starts L-BFGS.
+
+    n_jobs : int, default: 1
+        The number of threads which run the L-BFGS restarts.
     """
     def __init__(self, model, acquisition_function, optimizer="direct",
                  maxf=1000, initial_random_samples=5, random_state=0,
-                 *args, **kwargs):
+                 n_restarts=1, n_jobs=1, *args, **kwargs):
         self.model = model
         self.acquisition_function = acquisition_function
         self.optimizer = optimizer
         self.maxf = maxf
         self.initial_random_samples = initial_random_samples
+        self.n_restarts = n_restarts
+        self.n_jobs = n_jobs
 
         self.rng = check_random_state(random_state)
 
-        self.X_ = []
-        self.y_ = []
+        self.X_buffer_ = GrowingArray()
+        self.y_buffer_ = GrowingArray()
 
     def select_query_point(self, boundaries,
                            incumbent_fct=lambda y: np.max(y)):
@@ -98,27 +141,46 @@ class BayesianOptimizer(object):
             self.acquisition_function.set_boundaries(boundaries)
 
             def objective_function(x):
-                # Check boundaries
-                if not np.all(np.logical_and(x >= boundaries[:, 0],
-                                             x <= boundaries[:, 1])):
-                    return -np.inf
-
-                incumbent = incumbent_fct(self.y_)
-                return self.acquisition_function(x, incumbent=incumbent)
+                return self._acquisition_values(x, boundaries, incumbent_fct)
 
             X_query = global_optimization(
                 objective_function, boundaries=boundaries,
-                optimizer=self.optimizer, maxf=self.maxf, random=self.rng)
+                optimizer=self.optimizer, maxf=self.maxf, random=self.rng,
+                vectorized=True, n_restarts=self.n_restarts,
+                n_jobs=self.n_jobs)
 
         # Clip to hard boundaries
         return np.clip(X_query, boundaries[:, 0], boundaries[:, 1])
 
+    @property
+    def X_(self):
+        """ The observed parameters, one row per observation. """
+        return self.X_buffer_.array
+
+    @property
+    def y_(self):
+        """ The observed function values. """
+        return self.y_buffer_.array
+
     def update(self, X, y):
         """ Update internal model for observed (X, y) from true function. """
-        self.X_.append(X)
-        self.y_.append(y)
+        self.X_buffer_.append(X)
+        self.y_buffer_.append(y)
         self.model.fit(self.X_, self.y_)
 
+    def _acquisition_values(self, X, boundaries, incumbent_fct):
+        """ Acquisition function at the rows of X, -inf outside boundaries. """
+        X = np.atleast_2d(X)
+        inside = np.all(np.logical_and(X >= boundaries[:, 0],
+                                       X <= boundaries[:, 1]), axis=1)
+
+        values = np.full(X.shape[0], -np.inf)
+        if np.any(inside):
+            incumbent = incumbent_fct(self.y_)
+            values[inside] = np.ravel(
+                self.acquisition_function(X[inside], incumbent=incumbent))
+        return values
+
     def best_params(self):
         """ Returns the best parameters found so far."""
         return self.X_[np.argmax(self.y_)]
@@ -165,11 +227,14 @@ class REMBOOptimizer(BayesianOptimizer):
         those dimensions come first in the data representation, i.e., the first
         n_keep_dims dimensions are maintained.
 
+    boundaries_cache_size : int, default: 128
+        The number of boundaries whose embedded boundaries are cached.
+
     Further parameters are the same as in BayesianOptimizer
     """
 
     def __init__(self, n_dims, n_embedding_dims=2, data_space=None,
-                 n_keep_dims=0, *args, **kwargs):
+                 n_keep_dims=0, boundaries_cache_size=128, *args, **kwargs):
         super(REMBOOptimizer, self).__init__(*args, **kwargs)
 
         self.n_dims = n_dims
@@ -187,8 +252,9 @@ class REMBOOptimizer(BayesianOptimizer):
                                        self.n_embedding_dims))
         #self.A /= np.linalg.norm(self.A, axis=1)[:, np.newaxis]  # XXX
 
-        self.X_embedded_ = []
-        self.boundaries_cache = {}
+        self.X_embedded_buffer_ = GrowingArray()
+        self.boundaries_cache = OrderedDict()
+        self.boundaries_cache_size = boundaries_cache_size
 
     def select_query_point(self, boundaries,
                            incumbent_fct=lambda y: np.max(y)):
@@ -223,19 +289,16 @@ class REMBOOptimizer(BayesianOptimizer):
             # SelectObjective query point by finding optimum of acquisition function
             # within boundaries
             def objective_function(x):
-                # Check boundaries
-                if not np.all(np.logical_and(x >= boundaries_embedded[:, 0],
-                                             x <= boundaries_embedded[:, 1])):
-                    return -np.inf
-
-                incumbent = incumbent_fct(self.y_)
-                return self.acquisition_function(x, incumbent=incumbent)
+                return self._acquisition_values(x, boundaries_embedded,
+                                                incumbent_fct)
 
             X_query_embedded = global_optimization(
                 objective_function, boundaries=boundaries_embedded,
-                optimizer=self.optimizer, maxf=self.maxf, random=self.rng)
+                optimizer=self.optimizer, maxf=self.maxf, random=self.rng,
+                vectorized=True, n_restarts=self.n_restarts,
+                n_jobs=self.n_jobs)
 
-        self.X_embedded_.append(X_query_embedded)
+        self.X_embedded_buffer_.append(X_query_embedded)
 
         # Map to higher dimensional space and clip to hard boundaries
         X_query = np.clip(self._map_to_dataspace(X_query_embedded),
@@ -244,10 +307,15 @@ class REMBOOptimizer(BayesianOptimizer):
 
     def update(self, X, y):
         """ Update internal model for observed (X, y) from true function. """
-        self.X_.append(X)
-        self.y_.append(y)
+        self.X_buffer_.append(X)
+        self.y_buffer_.append(y)
         self.model.fit(self.X_embedded_, self.y_)
 
+    @property
+    def X_embedded_(self):
+        """ The observed parameters on the manifold, one row per observation. """
+        return self.X_embedded_buffer_.array
+
     def _map_to_dataspace(self, X_embedded):
         """ Map data from manifold to original data space. """
         X_query_kd = self.A.dot(X_embedded[self.n_keep_dims:])
@@ -260,48 +328,109 @@ class REMBOOptimizer(BayesianOptimizer):
         return X_query
 
     def _compute_boundaries_embedding(self, boundaries):
-        """ Approximate box constraint boundaries on low-dimensional manifold"""
-        # Check if boundaries have been determined before
-        boundaries_hash = hash(boundaries[self.n_keep_dims:].tostring())
-        if boundaries_hash in self.boundaries_cache:
-            boundaries_embedded = \
-                np.array(self.boundaries_cache[boundaries_hash])
-            boundaries_embedded[:self.n_keep_dims] = \
-                boundaries[:self.n_keep_dims]  # Overwrite keep-dim's boundaries
-            return boundaries_embedded
-
-        # Determine boundaries on embedded space
+        """ Box constraint boundaries on low-dimensional manifold.
+
+        The boundary of an embedded dimension is where more than half of the
+        embedded dimensions of the data space leave boundaries when moving
+        along that dimension from the origin. Every data-space dimension stays
+        within boundaries on an interval of the embedded dimension, so the
+        boundary is found exactly by sweeping over the ends of these intervals,
+        for all embedded dimensions at once.
+
+        The boundaries are cached in an LRU cache. Boundaries which are equal
+        up to a positive scaling (in the data space normalized by data_space)
+        share an entry, since their embedded boundaries scale alike.
+        """
+        boundaries_normalized = \
+            self._normalize_boundaries(boundaries[self.n_keep_dims:])
+        scale = np.max(np.abs(boundaries_normalized))
+        if scale == 0:
+            scale = 1.0
+
+        boundaries_key = \
+            np.round(boundaries_normalized / scale, 10).tobytes()
+        if boundaries_key in self.boundaries_cache:
+            self.boundaries_cache.move_to_end(boundaries_key)
+        else:
+            self.boundaries_cache[boundaries_key] = \
+                self._embed_boundaries(boundaries_normalized / scale)
+            if len(self.boundaries_cache) > self.boundaries_cache_size:
+                self.boundaries_cache.popitem(last=False)
+
         boundaries_embedded = \
             np.empty((self.n_keep_dims + self.n_embedding_dims, 2))
         boundaries_embedded[:self.n_keep_dims] = boundaries[:self.n_keep_dims]
-        for dim in range(self.n_keep_dims,
-                         self.n_keep_dims + self.n_embedding_dims):
-            x_embedded = np.zeros(self.n_keep_dims + self.n_embedding_dims)
-            while True:
-                x = self._map_to_dataspace(x_embedded)
-                if np.sum(np.logical_or(
-                    x[self.n_keep_dims:] < boundaries[self.n_keep_dims:, 0],
-                    x[self.n_keep_dims:] > boundaries[self.n_keep_dims:, 1])) \
-                   > (self.n_dims - self.n_keep_dims) / 2:
-                    break
-                x_embedded[dim] -= 0.01
-            boundaries_embedded[dim, 0] = x_embedded[dim]
-
-            x_embedded = np.zeros(self.n_keep_dims + self.n_embedding_dims)
-            while True:
-                x = self._map_to_dataspace(x_embedded)
-                if np.sum(np.logical_or(
-                    x[self.n_keep_dims:] < boundaries[self.n_keep_dims:, 0],
-                    x[self.n_keep_dims:] > boundaries[self.n_keep_dims:, 1])) \
-                   > (self.n_dims - self.n_keep_dims) / 2:
-                    break
-                x_embedded[dim] += 0.01
-            boundaries_embedded[dim, 1] = x_embedded[dim]
-
-        self.boundaries_cache[boundaries_hash] = boundaries_embedded
+        boundaries_embedded[self.n_keep_dims:] = \
+            self.boundaries_cache[boundaries_key] * scale
+
+        return boundaries_embedded
+
+    def _normalize_boundaries(self, boundaries):
+        """ Map boundaries of embedded dimensions to the scale of A. """
+        boundaries = np.asarray(boundaries, dtype=float)
+        if self.data_space is None:
+            return boundaries
+
+        center = (self.data_space[:, 1] + self.data_space[:, 0]) / 2
+        half_width = (self.data_space[:, 1] - self.data_space[:, 0]) / 2
+        return (boundaries - center[:, np.newaxis]) \
+            / half_width[:, np.newaxis]
+
+    def _embed_boundaries(self, boundaries):
+        """ Embedded boundaries for normalized boundaries of shape [n, 2]. """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            lower = boundaries[:, 0, np.newaxis] / self.A
+            upper = boundaries[:, 1, np.newaxis] / self.A
+        # Interval of every embedded dimension on which a data-space
+        # dimension is within boundaries
+        start = np.where(self.A > 0, lower, upper)
+        end = np.where(self.A > 0, upper, lower)
+
+        # Dimensions not moving along an embedded dimension are always or
+        # never within boundaries
+        inside = np.logical_and(boundaries[:, 0] <= 0,
+                                boundaries[:, 1] >= 0)[:, np.newaxis]
+        start = np.where(self.A == 0, np.where(inside, -np.inf, np.inf),
+                         start)
+        end = np.where(self.A == 0, np.where(inside, np.inf, -np.inf), end)
+
+        boundaries_embedded = np.empty((self.n_embedding_dims, 2))
+        boundaries_embedded[:, 0] = -self._first_exit(-end, -start)
+        boundaries_embedded[:, 1] = self._first_exit(start, end)
 
         return boundaries_embedded
 
+    def _first_exit(self, start, end):
+        """ Smallest t >= 0 with more than half of the intervals left.
+
+        start and end have shape [n, n_embedding_dims] and contain the
+        intervals [start, end] of the n data-space dimensions for every
+        embedded dimension.
+        """
+        n = start.shape[0]
+        empty = start > end
+
+        # Sweep over the ends of the intervals in increasing order, counting
+        # the intervals which contain the points just after every end
+        events = np.vstack((np.where(empty, np.inf, start),
+                            np.where(empty, np.inf, end)))
+        deltas = np.vstack((np.where(empty, 0, 1), np.where(empty, 0, -1)))
+        order = np.argsort(events, axis=0, kind="mergesort")
+        events = np.take_along_axis(events, order, axis=0)
+        counts = np.cumsum(np.take_along_axis(deltas, order, axis=0), axis=0)
+
+        # Number of intervals containing the origin
+        counts_origin = np.sum((start <= 0) & (end >= 0) & ~empty, axis=0)
+
+        exits = (events >= 0) & np.isfinite(events) & (counts < n / 2.0)
+        if not np.all(np.any(exits, axis=0) | (counts_origin < n / 2.0)):
+            raise Exception("Embedded boundaries are unbounded, too many "
+                            "dimensions do not depend on the embedding.")
+
+        first_exit = np.take_along_axis(
+            events, np.argmax(exits, axis=0)[np.newaxis], axis=0)[0]
+        return np.where(counts_origin < n / 2.0, 0.0, first_exit)
+
 
 #class InterleavedREMBOOptimizer(BayesianOptimizer):
     """ Interleaved Random EMbedding Bayesian Optimization (REMBO).
@@ -1,9 +1,11 @@
 # Author: Jan Hendrik Metzen <janmetzen@mailbox.org>
 
 import numpy as np
+from scipy.linalg import cho_solve, cholesky, solve_triangular
 
 from sklearn.gaussian_process import GaussianProcessRegressor
-from sklearn.kernel_approximation import Nystroem
+from sklearn.gaussian_process.kernels import ConstantKernel, Matern, Product, \
+    RBF, Sum, WhiteKernel
 from sklearn.utils.validation import check_random_state
 
 
@@ -101,20 +103,80 @@ class GaussianProcessModel(object):
         self.last_training_size = 0
 
     def fit(self, X, y):
-        """ Fits a new Gaussian process model on (X, y) data. """
+        """ Fits a Gaussian process model on (X, y) data.
+
+        If the hyperparameters are not reestimated and X extends the previous
+        training data, the previous model is extended incrementally.
+        """
         X = np.asarray(X)
         y = np.asarray(y)
         # Only train GP model if the training set has actually changed
         if X.shape[0] <= self.last_training_size:
             return
 
-        # Create and fit Gaussian Process model
-        self.gp = self._create_gp(training_size=X.shape[0])
-        self.gp.fit(X, y)
+        if self._extendable(X, y):
+            # Keep hyperparameters and extend the fitted GP by the new data
+            self._extend(X, y)
+        else:
+            # Create and fit Gaussian Process model
+            self.gp = self._create_gp(training_size=X.shape[0])
+            self.gp.fit(X, y)
 
         self.kernel_ = self.gp.kernel_
         self.last_training_size = X.shape[0]
 
+    def _extendable(self, X, y):
+        """ Whether the GP can be extended by the data beyond its training set.
+
+        This is the case if the hyperparameters are not reestimated and the
+        training set of the GP is the beginning of X.
+        """
+        if self.gp is None or self.gp_reestimate_hyperparams(X.shape[0]):
+            return False
+        if self.bayesian_gp or np.ndim(self.alpha) != 0 or y.ndim != 1:
+            return False
+        n_train = self.gp.X_train_.shape[0]
+        return n_train == self.last_training_size \
+            and np.array_equal(X[:n_train], self.gp.X_train_)
+
+    def _extend(self, X, y):
+        """ Extend the Cholesky factor of the GP by the rows of X beyond its
+        training set, in O(n^2) instead of O(n^3) for refitting. """
+        gp = self.gp
+        X_old, X_new = gp.X_train_, X[gp.X_train_.shape[0]:]
+
+        # [[L, 0], [L_21, L_22]] is the Cholesky factor of the kernel matrix
+        # [[K, K_12], [K_12^T, K_22]]
+        K_12 = gp.kernel_(X_old, X_new)
+        K_22 = gp.kernel_(X_new)
+        K_22[np.diag_indices_from(K_22)] += self.alpha
+        L_21 = solve_triangular(gp.L_, K_12, lower=True, check_finite=False).T
+        L_22 = cholesky(K_22 - L_21.dot(L_21.T), lower=True,
+                        check_finite=False)
+
+        n, n_new = X_old.shape[0], X_new.shape[0]
+        L = np.zeros((n + n_new, n + n_new))
+        L[:n, :n] = gp.L_
+        L[n:, :n] = L_21
+        L[n:, n:] = L_22
+
+        # The normalization of y depends on all targets, alpha_ is therefore
+        # solved anew against the extended factor
+        if self.normalize_y:
+            gp._y_train_mean = np.mean(y, axis=0)
+            gp._y_train_std = np.std(y, axis=0)
+            if gp._y_train_std == 0.0:
+                gp._y_train_std = 1.0
+            y = (y - gp._y_train_mean) / gp._y_train_std
+
+        gp.X_train_ = np.vstack((X_old, X_new))
+        gp.y_train_ = np.copy(y)
+        gp.L_ = L
+        gp.alpha_ = cho_solve((L, True), gp.y_train_, check_finite=False)
+        gp.log_marginal_likelihood_value_ = \
+            -0.5 * gp.y_train_.dot(gp.alpha_) - np.log(np.diag(L)).sum() \
+            - 0.5 * L.shape[0] * np.log(2 * np.pi)
+
     def predictive_distribution(self, X):
         """ Return predictive distributon (mean, std-dev) at X."""
         return self.gp.predict(X, return_std=True)
@@ -148,6 +210,106 @@ class GaussianProcessModel(object):
         return odict
 
 
+class RandomFourierFeatureSampler(object):
+    """Draw samples from the posterior of a Gaussian process cheaply.
+
+    Samples from the GP prior are approximated by random Fourier features and
+    conditioned on the training data of the GP by Matheron's rule (pathwise
+    conditioning), which requires solving against the Cholesky factor of the
+    GP once. The samples can then be evaluated at any number of points in time
+    linear in the number of points, while exact sampling (sample_y) requires a
+    factorization of the covariance at all points.
+
+    Supported kernels are RBF and Matern kernels, optionally multiplied by a
+    ConstantKernel and added to a WhiteKernel.
+
+    Parameters
+    ----------
+    gp : GaussianProcessRegressor
+        The fitted Gaussian process whose posterior is sampled
+
+    n_samples : int
+        The number of samples (functions) drawn from the posterior
+
+    n_features : int, default: 1000
+        The number of random Fourier features
+
+    random_state : optional, int
+        Seed for the random number generator.
+    """
+    def __init__(self, gp, n_samples, n_features=1000, random_state=None):
+        self.gp = gp
+        self.n_samples = n_samples
+        self.n_features = n_features
+        rng = check_random_state(random_state)
+
+        amplitude, length_scale, nu, noise_level = \
+            _stationary_kernel_parameters(gp.kernel_)
+        n_dims = gp.X_train_.shape[1]
+
+        # Sample frequencies from the spectral density of the kernel
+        self.frequencies = rng.standard_normal((n_dims, n_features))
+        if np.isfinite(nu):
+            self.frequencies *= \
+                np.sqrt(2 * nu / rng.chisquare(2 * nu, n_features))
+        self.frequencies /= np.reshape(length_scale, (-1, 1))
+        self.phases = rng.uniform(0, 2 * np.pi, n_features)
+        self.feature_scale = np.sqrt(2 * amplitude / n_features)
+        self.weights = rng.standard_normal((n_features, n_samples))
+
+        # Condition the prior samples on the (normalized) training data
+        noise = rng.standard_normal((gp.X_train_.shape[0], n_samples)) \
+            * np.sqrt(np.reshape(gp.alpha + noise_level, (-1, 1)))
+        f_prior = self._prior(gp.X_train_) + noise
+        self.alpha_ = gp.alpha_.reshape(-1, 1) \
+            - cho_solve((gp.L_, True), f_prior)
+
+    def _prior(self, X):
+        return self.feature_scale * np.cos(
+            X.dot(self.frequencies) + self.phases).dot(self.weights)
+
+    def __call__(self, X):
+        """ Evaluate the posterior samples at X, shape (n_points, n_samples). """
+        X = np.atleast_2d(X)
+        f = self.gp.kernel_(X, self.gp.X_train_).dot(self.alpha_) \
+            + self._prior(X)
+        return f * np.ravel(self.gp._y_train_std)[0] \
+            + np.ravel(self.gp._y_train_mean)[0]
+
+
+def _stationary_kernel_parameters(kernel):
+    """ Amplitude, length scale, nu and noise level of a stationary kernel.
+
+    nu is infinite for RBF kernels.
+    """
+    if isinstance(kernel, Sum):
+        if isinstance(kernel.k2, WhiteKernel):
+            kernel, white = kernel.k1, kernel.k2
+        elif isinstance(kernel.k1, WhiteKernel):
+            kernel, white = kernel.k2, kernel.k1
+        else:
+            raise ValueError("Kernel %s is not supported." % kernel)
+        amplitude, length_scale, nu, noise_level = \
+            _stationary_kernel_parameters(kernel)
+        return amplitude, length_scale, nu, noise_level + white.noise_level
+    if isinstance(kernel, Product):
+        if isinstance(kernel.k1, ConstantKernel):
+            kernel, constant = kernel.k2, kernel.k1
+        elif isinstance(kernel.k2, ConstantKernel):
+            kernel, constant = kernel.k1, kernel.k2
+        else:
+            raise ValueError("Kernel %s is not supported." % kernel)
+        amplitude, length_scale, nu, noise_level = \
+            _stationary_kernel_parameters(kernel)
+        return constant.constant_value * amplitude, length_scale, nu, \
+            noise_level
+    if isinstance(kernel, Matern):
+        return 1.0, kernel.length_scale, kernel.nu, 0.0
+    if isinstance(kernel, RBF):
+        return 1.0, kernel.length_scale, np.inf, 0.0
+    raise ValueError("Kernel %s is not supported." % kernel)
+
+
 class ParametricModelApproximation(object):
     """Approximate a Gaussian Process by a parametric model.
 
@@ -181,13 +343,24 @@ class ParametricModelApproximation(object):
         self.X_space = self.rng.uniform(self.bounds[:, 0], self.bounds[:, 1],
                                         (1000, self.bounds.shape[0]))
 
-        assert self.gp.X_fit_.shape[1] == self.X_space.shape[1]
+        assert self.gp.X_train_.shape[1] == self.X_space.shape[1]
 
         self.kernel = self.gp.kernel_
-        self.nystr = Nystroem(
-            n_components=min(self.n_components, self.X_space.shape[0]),
-            kernel='precomputed', random_state=self.rng)
-        self.nystr.fit(self.kernel(self.X_space))
+
+        # Nystroem feature map, cached: the features of a point are its kernel
+        # to n_components points of X_space, normalized by the inverse square
+        # root of their kernel matrix
+        n_components = min(self.n_components, self.X_space.shape[0])
+        self.X_components = self.X_space[
+            self.rng.permutation(self.X_space.shape[0])[:n_components]]
+        U, S, V = np.linalg.svd(self.kernel(self.X_components))
+        self.normalization = (U / np.sqrt(np.maximum(S, 1e-12))).dot(V)
+
+        self.Phi_train = self.features(self.gp.X_train_)
+
+    def features(self, X):
+        """ Returns the Nystroem features of the points X. """
+        return self.kernel(X, self.X_components).dot(self.normalization.T)
 
     def determine_coefs(self, X_query=None, y_query_samples=None, n_samples=1):
         """ Determine coefficients of parametric model.
@@ -203,32 +376,43 @@ class ParametricModelApproximation(object):
             returned.
 
         y_query_samples: ndarray-like, default: None
-            The possible outcomes of a query at X_query.
+            The possible outcomes of a query at X_query, one row per outcome.
 
         n_samples: int
             The number of independent samples of model coefficients from the
             Bayesian posterior over model coefficients
+
+        Returns
+        -------
+        coefs: ndarray, shape=(n_samples, n_components, n_outcomes)
+            The sampled coefficients for every outcome (a single outcome if
+            X_query is None)
         """
+        y_train = np.ravel(self.gp.y_train_)
         if X_query is not None:
-            X_query = np.asarray(X_query)
-            X_queried = np.vstack((self.gp.X_fit_, X_query))
+            Phi = np.vstack((self.Phi_train,
+                             self.features(np.atleast_2d(X_query))))
+            y_query_samples = np.asarray(y_query_samples)
+            n_outcomes = y_query_samples.shape[0]
+            Y = np.hstack((np.tile(y_train, (n_outcomes, 1)),
+                           y_query_samples.reshape(n_outcomes, -1))).T
         else:
-            X_queried = self.gp.X_fit_
-            y_queried = self.gp.y_fit_
+            Phi = self.Phi_train
+            Y = y_train[:, np.newaxis]
+            n_outcomes = 1
 
-        Phi = self.nystr.transform(self.kernel(self.X_space, X_queried))
+        # The posterior over coefficients is N(A^-1 Phi^T y, alpha A^-1), with
+        # A = L L^T shared by all outcomes
         A = Phi.T.dot(Phi) + self.gp.alpha * np.eye(Phi.shape[1])
-        A_inv = np.linalg.inv(A)
-
-        cov = self.gp.alpha * A_inv
+        L = cholesky(A, lower=True)
+        mean = cho_solve((L, True), Phi.T.dot(Y))
 
-        coefs = \
-            np.empty((n_samples, self.n_components, y_query_samples.shape[0]))
-        for i in range(y_query_samples.shape[0]): # XXX: Vectorize
-            y_queried = np.hstack((self.gp.y_fit_, y_query_samples[i]))
-            mean = A_inv.dot(Phi.T).dot(y_queried)
-            coefs[:, :, i] = self.rng.multivariate_normal(mean, cov, n_samples)
-        return np.array(coefs)
+        # L^-T z has covariance A^-1 for standard normal z
+        z = self.rng.standard_normal((Phi.shape[1], n_samples * n_outcomes))
+        noise = np.sqrt(self.gp.alpha) \
+            * solve_triangular(L, z, lower=True, trans='T')
+        noise = noise.reshape(Phi.shape[1], n_samples, n_outcomes)
+        return mean[np.newaxis] + noise.transpose(1, 0, 2)
 
     def __call__(self, X, coefs):
         """ Evaluate parametric model at X for the given sampled coefficients.
@@ -243,6 +427,6 @@ class ParametricModelApproximation(object):
         """
         X = np.atleast_2d(X)
 
-        Phi = self.nystr.transform(self.kernel(self.X_space, X))
+        Phi = self.features(X)
         f = Phi.dot(coefs)
         return f
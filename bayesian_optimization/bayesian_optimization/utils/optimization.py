@@ -1,12 +1,15 @@
 # Author: Jan Hendrik Metzen <janmetzen@mailbox.org>
 
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 from scipy.optimize import fmin_l_bfgs_b
 
 
 def global_optimization(objective_function, boundaries, optimizer, maxf,
                         x0=None, approx_grad=True, random=np.random,
-                        *args, **kwargs):
+                        vectorized=False, chunk_size=1000, n_restarts=1,
+                        n_jobs=1, *args, **kwargs):
     """Maximize objective_function within given boundaries.
 
     This function optimizes an objective function in a search space with the
@@ -14,7 +17,20 @@ def global_optimization(objective_function, boundaries, optimizer, maxf,
     objective function. The optimizer is specified by a string which may be
     any of "direct", "direct+lbfgs", "random", "random+lbfgs", "cmaes", or
     "cmaes+lbfgs".
+
+    If vectorized is True, objective_function is called with an array of
+    shape [n_points, n_dims] and returns the n_points values. The "random"
+    optimizers then evaluate their maxf random points in chunks of chunk_size
+    points, i.e., with one call (and one prediction of a GP) per chunk.
+    "random+lbfgs" refines the n_restarts best random points with L-BFGS in
+    n_jobs threads and returns the best refined point.
     """
+    if vectorized:
+        def scalar_objective_function(x):
+            return np.ravel(objective_function(x[np.newaxis]))[0]
+    else:
+        scalar_objective_function = objective_function
+
     if optimizer in ["direct", "direct+lbfgs"]:
         # Use DIRECT to perform approximate global optimization of
         # objective_function
@@ -32,7 +48,7 @@ def global_optimization(objective_function, boundaries, optimizer, maxf,
 
         def prox_func(params, grad):
             # Note: nlopt minimizes function, hence the minus
-            func_value = -objective_function(params)
+            func_value = -scalar_objective_function(params)
             if np.iterable(func_value):
                 return func_value[0]
             else:
@@ -41,26 +57,30 @@ def global_optimization(objective_function, boundaries, optimizer, maxf,
         x0 = opt.optimize(boundaries.mean(1))
     elif optimizer in ["random", "random+lbfgs"]:
         # Sample maxf points uniform randomly from the search space and
-        # remember the one with maximal objective value
+        # remember the ones with maximal objective value (x0 is preferred
+        # over random points with the same value)
+        X_trial = random.uniform(size=(maxf, boundaries.shape[0])) \
+            * (boundaries[:, 1] - boundaries[:, 0]) + boundaries[:, 0]
         if x0 is not None:
-            f_opt = objective_function(x0)
+            X_trial = np.vstack((x0, X_trial))
+
+        if vectorized:
+            f_trial = np.concatenate(
+                [np.ravel(objective_function(X_trial[i:i + chunk_size]))
+                 for i in range(0, X_trial.shape[0], chunk_size)])
         else:
-            f_opt = -np.inf
-        for _ in range(maxf):
-            x0_trial = \
-                random.uniform(size=boundaries.shape[0]) \
-                * (boundaries[:, 1] - boundaries[:, 0]) \
-                + boundaries[:, 0]
-            f_trial = objective_function(x0_trial)
-            if f_trial > f_opt:
-                f_opt = f_trial
-                x0 = x0_trial
+            f_trial = np.array([np.ravel(objective_function(x))[0]
+                                for x in X_trial])
+
+        X_start = X_trial[np.argsort(-f_trial, kind="mergesort")[:n_restarts]]
+        x0 = X_start[0]
     elif optimizer in ["cmaes", "cmaes+lbfgs"]:
         # Use CMAES to perform approximate global optimization of
         # objective_function
         if x0 is None:
             x0 = boundaries.mean(1)
-        x0 = fmin_cma(lambda x, compute_gradient=False: -objective_function(x),
+        x0 = fmin_cma(lambda x, compute_gradient=False:
+                      -scalar_objective_function(x),
                       x0=x0, xL=boundaries[:, 0], xU=boundaries[:, 1],
                       sigma0=kwargs.get("sigma0", 0.01), maxfun=maxf)
     elif x0 is None:
@@ -71,13 +91,25 @@ def global_optimization(objective_function, boundaries, optimizer, maxf,
         # return DIRECT/Random/CMAES solution without refinement
         return x0
     elif optimizer in ["lbfgs", "direct+lbfgs", "random+lbfgs", "cmaes+lbfgs"]:
-        # refine solution with L-BFGS
+        # refine solution with L-BFGS (from the best random points for
+        # "random+lbfgs")
         def proxy_function(x):
-            return -objective_function(x)
-        res = fmin_l_bfgs_b(proxy_function, x0,
-                            approx_grad=True,
-                            bounds=boundaries, disp=0)
-        return res[0]
+            return -scalar_objective_function(x)
+
+        def refine(x_start):
+            return fmin_l_bfgs_b(proxy_function, x_start,
+                                 approx_grad=True,
+                                 bounds=boundaries, disp=0)
+
+        if optimizer != "random+lbfgs":
+            X_start = [x0]
+        if n_jobs == 1 or len(X_start) == 1:
+            results = [refine(x_start) for x_start in X_start]
+        else:
+            with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+                results = list(executor.map(refine, X_start))
+        # The first of the best refined points
+        return min(results, key=lambda res: res[1])[0]
     else:
         raise Exception("Unknown optimizer %s" % optimizer)
 
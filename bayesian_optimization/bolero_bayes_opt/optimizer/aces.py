@@ -1,7 +1,7 @@
 # Author: Jan Hendrik Metzen <janmetzen@mailbox.org>
 # Date: 01/07/2015
 
-from copy import deepcopy
+from copy import copy
 
 import numpy as np
 
@@ -204,14 +204,17 @@ class SurrogateACESOptimizer(ACESOptimizer):
         self.context_samples = \
             kmeans.fit(self.context_samples).cluster_centers_
 
-        # 3. Create entropy search ensemble
+        # 3. Create entropy search ensemble, which shares the model and the
+        # sampler of the GP posterior used for selecting representer points
+        trial_sampler = self.acquisition_function.create_trial_sampler()
         self.entropy_search_ensemble = []
         for i in range(self.n_context_samples):
             cx_boundaries_i = np.copy(self.cx_boundaries)
             cx_boundaries_i[:self.context_dims] = \
                 self.context_samples[i][:, np.newaxis]
-            entropy_search_fixed_context = deepcopy(self.acquisition_function)
-            entropy_search_fixed_context.set_boundaries(cx_boundaries_i)
+            entropy_search_fixed_context = copy(self.acquisition_function)
+            entropy_search_fixed_context.set_boundaries(
+                cx_boundaries_i, trial_sampler=trial_sampler)
 
             self.entropy_search_ensemble.append(entropy_search_fixed_context)
 
@@ -0,0 +1,52 @@
+from bayopt.bench.suite import SUITES
+from bayopt.bench.suite import compare
+from bayopt.bench.suite import load_baseline
+from bayopt.bench.suite import run_suite
+from bayopt.bench.suite import save_baseline
+import argparse
+import sys
+
+
+def _format(value):
+    if value is None:
+        return '-'
+
+    return format(value, '.3g')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m bayopt.bench',
+                                     description='Benchmarks the methods with fixed seeds on the CPU.')
+    parser.add_argument('--suite', choices=sorted(SUITES), default='micro')
+    parser.add_argument('--method', action='append', help='run only the cases of these methods')
+    parser.add_argument('--save', metavar='BASELINE', help='save the results as a JSON baseline')
+    parser.add_argument('--compare', metavar='BASELINE', help='flag regressions with respect to a JSON baseline')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='relative tolerance of the comparison')
+    args = parser.parse_args(argv)
+
+    cases = [case for case in SUITES[args.suite] if not args.method or case.method in args.method]
+    results = run_suite(cases)
+
+    print('case'.ljust(40) + 'iter/s'.rjust(10) + 'RSS MiB'.rjust(10) + 'to target'.rjust(10) + 'regret'.rjust(10))
+    for result in results:
+        print(result['name'].ljust(40) + _format(result['iterations_per_second']).rjust(10) +
+              _format(result['peak_rss']).rjust(10) + _format(result['time_to_target']).rjust(10) +
+              _format(result['final_regret']).rjust(10))
+
+    if args.save:
+        save_baseline(results=results, baseline_file=args.save)
+
+    if args.compare:
+        regressions = compare(results=results, baseline=load_baseline(args.compare), tolerance=args.tolerance)
+
+        for name, metric, reference_value, value in regressions:
+            print('regression: ' + name + ' ' + metric + ' ' + _format(reference_value) + ' -> ' + _format(value))
+
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
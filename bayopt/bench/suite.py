@@ -0,0 +1,179 @@
+from bayopt.methods.factory import METHODS
+from bayopt.methods.factory import SUBSPACE_METHODS
+from bayopt.methods.factory import create_method
+from bayopt.objective_examples.experiments import GaussianMixtureFunction
+from bayopt.utils.utils import storage_dir as use_storage_dir
+from collections import namedtuple
+import contextlib
+import multiprocessing
+import numpy as np
+import json
+import os
+import platform
+import resource
+import tempfile
+import time
+
+# --- the objective is normalized to 1 at mean_1, next to its maximum, so the regret of a value y is 1 - y
+TARGET_REGRET = 0.1
+
+# --- metrics compared with a baseline and whether a larger value is better
+METRICS = {'iterations_per_second': True, 'peak_rss': False, 'time_to_target': False}
+
+
+class BenchmarkCase(namedtuple('BenchmarkCase', ['method', 'dim', 'max_iter', 'subspace_dim', 'seed'])):
+    """
+    One run of a method on the Gaussian mixture function of dimension dim, with a fixed seed.
+
+    Args:
+        method (string): one of METHODS.
+        dim (int): dimension of the objective.
+        max_iter (int): max_iter of run_optimization.
+        subspace_dim (int): subspace dimension of Dropout and REMBO.
+        seed (int): seed of the numpy random number generator.
+    """
+
+    def __new__(cls, method, dim, max_iter, subspace_dim=5, seed=0):
+        if method not in METHODS:
+            raise ValueError('method has to be one of ' + ', '.join(METHODS))
+
+        return super().__new__(cls, method, dim, max_iter, min(subspace_dim, dim), seed)
+
+    @property
+    def name(self):
+        return self.method + ' ' + str(self.dim) + 'D ' + str(self.max_iter) + 'iter ' + str(self.subspace_dim) + 'sub'
+
+
+SUITES = {
+    'micro': [BenchmarkCase(method=method, dim=5, max_iter=30, subspace_dim=2) for method in METHODS],
+    'macro': [BenchmarkCase(method=method, dim=dim, max_iter=max_iter)
+              for dim, max_iter in [(30, 50), (60, 50), (1000, 20)] for method in METHODS],
+}
+
+
+def domain_of(dim):
+    return [{'name': 'x' + str(i), 'type': 'continuous', 'domain': (1, 4), 'dimensionality': 1}
+            for i in range(dim)]
+
+
+def create_case_method(case):
+    subspace_dim = case.subspace_dim if case.method in SUBSPACE_METHODS else None
+
+    return create_method(method=case.method, f=GaussianMixtureFunction(dim=case.dim, mean_1=2, mean_2=3),
+                         domain=domain_of(case.dim), subspace_dim=subspace_dim, maximize=True)
+
+
+def time_to_target(regret, num_initial, timer, target=TARGET_REGRET):
+    """
+    Returns the elapsed time of the first iteration whose best regret is at most target,
+    0 when the initial design reaches it and None when the run does not.
+    """
+    if regret[num_initial - 1] <= target:
+        return 0.
+
+    reached = regret[np.asarray(timer.iterations, dtype=int) - 1] <= target
+    if not np.any(reached):
+        return None
+
+    return float(np.asarray(timer.elapsed)[np.argmax(reached)])
+
+
+def run_case(case, storage_dir):
+    """
+    Runs a benchmark case in the current process, saving the experiment into storage_dir.
+    """
+    np.random.seed(case.seed)
+
+    with use_storage_dir(storage_dir), open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        method = create_case_method(case)
+
+        start = time.perf_counter()
+        method.run_optimization(max_iter=case.max_iter, eps=0)
+        seconds = time.perf_counter() - start
+
+    regret = np.maximum(1 + np.minimum.accumulate(method.Y.ravel()), 0)
+    timer = method.timer
+    iterations = len(timer.iterations)
+    loop_time = timer.elapsed[-1] if iterations > 0 else 0.
+
+    return {
+        'name': case.name,
+        'case': case._asdict(),
+        'iterations': iterations,
+        'seconds': seconds,
+        'iterations_per_second': iterations / loop_time if loop_time > 0 else None,
+        'peak_rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'time_to_target': time_to_target(regret=regret, num_initial=len(method.initial_X), timer=timer),
+        'final_regret': float(regret[-1]),
+        'phases': {phase: float(t) for phase, t in timer.totals().items()},
+    }
+
+
+def run_suite(cases, storage_dir=None):
+    """
+    Runs every case in a fresh process, so that the peak RSS (in MiB) of a case does not include the others.
+    The experiments are saved into storage_dir, or into a temporary directory which is removed afterwards.
+    """
+    with tempfile.TemporaryDirectory() as temporary_dir:
+        if storage_dir is None:
+            storage_dir = temporary_dir
+
+        context = multiprocessing.get_context('spawn')
+        results = list()
+
+        for case in cases:
+            with context.Pool(processes=1) as pool:
+                results.append(pool.apply(run_case, (case, storage_dir)))
+
+        return results
+
+
+def environment():
+    import GPy
+    import GPyOpt
+    import scipy
+
+    return {'python': platform.python_version(), 'machine': platform.machine(), 'processor': platform.processor(),
+            'numpy': np.__version__, 'scipy': scipy.__version__, 'GPy': GPy.__version__,
+            'GPyOpt': GPyOpt.__version__}
+
+
+def save_baseline(results, baseline_file):
+    with open(baseline_file, 'w') as file:
+        json.dump({'environment': environment(), 'results': results}, file, indent=2)
+
+
+def load_baseline(baseline_file):
+    with open(baseline_file) as file:
+        return json.load(file)['results']
+
+
+def compare(results, baseline, tolerance=0.2):
+    """
+    Returns the metrics of results which are worse than those of the same cases in baseline by more than
+    the relative tolerance, as a list of (name, metric, baseline value, value).
+    A target regret which the baseline reaches and the result does not is a regression as well.
+    """
+    baseline = {result['name']: result for result in baseline}
+    regressions = list()
+
+    for result in results:
+        if result['name'] not in baseline:
+            continue
+
+        reference = baseline[result['name']]
+
+        for metric, larger_is_better in METRICS.items():
+            value, reference_value = result[metric], reference[metric]
+
+            if reference_value is None:
+                continue
+
+            if value is None:
+                regressions.append((result['name'], metric, reference_value, value))
+            elif larger_is_better and value < reference_value * (1 - tolerance):
+                regressions.append((result['name'], metric, reference_value, value))
+            elif not larger_is_better and value > reference_value * (1 + tolerance):
+                regressions.append((result['name'], metric, reference_value, value))
+
+    return regressions
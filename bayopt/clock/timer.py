@@ -0,0 +1,60 @@
+from contextlib import contextmanager
+import numpy as np
+import time
+
+PHASES = ['subspace', 'model', 'hyperparameters', 'acquisition', 'fill_in', 'evaluation']
+
+
+class PhaseTimer(object):
+    """
+    Accumulates the time spent in each phase of an optimization loop, one row per iteration.
+
+    The time of a phase is added to the current row by timing a block with phase(name),
+    and next_iteration closes the row. Phases which do not apply to a method stay 0.
+    The wall-clock time from the (re)start of the timer to the end of each iteration is kept in elapsed.
+
+    Args:
+        phases (list | None): names of the phases (default is PHASES).
+    """
+
+    def __init__(self, phases=None):
+        self.phases = list(PHASES if phases is None else phases)
+        self._columns = {name: i for i, name in enumerate(self.phases)}
+
+        self.iterations = list()
+        self.rows = list()
+        self.elapsed = list()
+        self._current = np.zeros(len(self.phases))
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name):
+        column = self._columns[name]
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self._current[column] += time.perf_counter() - start
+
+    def next_iteration(self, iteration):
+        self.iterations.append(iteration)
+        self.rows.append(self._current)
+        self.elapsed.append(time.perf_counter() - self._start)
+        self._current = np.zeros(len(self.phases))
+
+    def reset(self):
+        self.iterations = list()
+        self.rows = list()
+        self.elapsed = list()
+        self._current = np.zeros(len(self.phases))
+        self._start = time.perf_counter()
+
+    def totals(self):
+        """
+        Returns the time spent in each phase, including the phases of an unfinished iteration.
+        """
+        return dict(zip(self.phases, np.sum(self.rows, axis=0) + self._current))
+
+    def table(self):
+        return [['Iteration'] + self.phases] + [[i] + list(row) for i, row in zip(self.iterations, self.rows)]
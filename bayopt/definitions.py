@@ -1,3 +1,4 @@
 import os
 
 ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+STORAGE_DIR = os.environ.get('BAYOPT_STORAGE_DIR', ROOT_DIR + '/storage')
@@ -1,13 +1,13 @@
 from bayopt.objective_examples.experiments import BraininFunction
 from bayopt.methods.rembo import REMBO
 
-f = BraininFunction()
+f = BraininFunction(effective1=0, effective2=1)
 
 n_dims = 10**3
 n_embedding_dims = 4
-n_repetitions = 10
-n_trials = 100
-kappa = 2.5
 
-method = REMBO(f=f, n_dims=n_dims, n_embedding_dims=n_embedding_dims)
+domain = [{'name': 'x' + str(i), 'type': 'continuous', 'domain': (-5, 15), 'dimensionality': 1}
+          for i in range(n_dims)]
+
+method = REMBO(f=f, domain=domain, subspace_dim_size=n_embedding_dims, embedding_type='count_sketch')
 method.run_optimization(max_iter=500)
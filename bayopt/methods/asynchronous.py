@@ -0,0 +1,86 @@
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import wait
+import numpy as np
+
+
+class AsynchronousOptimization(object):
+    """
+    Optimization loop which keeps batch_size evaluations of the objective in flight.
+
+    A new point is proposed as soon as one evaluation finishes, with the model refitted on the finished evaluations.
+    The model is only refitted when an evaluation finished since the last fit, otherwise _update_unchanged
+    prepares the proposal. The points still being evaluated are passed as pending_zipped_X
+    to _compute_next_evaluations so that they are not proposed again.
+
+    The class is mixed into the methods, which provide update, _compute_next_evaluations, _checkpoint,
+    _log_evaluations, history, timer and _objective_input (the input of the objective for a suggested sample).
+    The time the loop waits for finished evaluations is recorded as the evaluation phase of the timer.
+    """
+
+    def _run_asynchronous_optimization(self):
+        pending = dict()
+        proposing = True
+        changed = True
+
+        while True:
+            while proposing and len(pending) < self.batch_size \
+                    and self.num_acquisitions + len(pending) < self.max_iter:
+                print('.')
+
+                # --- update model with the finished evaluations
+                try:
+                    if changed:
+                        self.update()
+                    else:
+                        self._update_unchanged()
+                    changed = False
+
+                except np.linalg.LinAlgError:
+                    print('np.linalg.LinAlgError')
+                    proposing = False
+                    break
+
+                suggested_sample = self._compute_next_evaluations(pending_zipped_X=self._pending_X(pending))
+                pending[self.objective.submit(self._objective_input(suggested_sample))] = suggested_sample
+
+            if len(pending) == 0:
+                break
+
+            with self.timer.phase('evaluation'):
+                done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+
+            for future in done:
+                self.suggested_sample = pending.pop(future)
+                with self.timer.phase('evaluation'):
+                    self.Y_new, cost_new = self.objective.collect(future)
+                self.cost.update_cost_model(self.suggested_sample, cost_new)
+
+                self.history.append_X(self.suggested_sample)
+                self.history.append_Y(self.Y_new)
+                changed = True
+
+                # --- Update current evaluation time and function evaluations
+                self.num_acquisitions += 1
+                self._checkpoint()
+                self._log_evaluations()
+                self.timer.next_iteration(iteration=self.X.shape[0])
+
+        if proposing and changed:
+            try:
+                self.update()
+
+            except np.linalg.LinAlgError:
+                print('np.linalg.LinAlgError')
+
+    def _update_unchanged(self):
+        """
+        Prepares a proposal when no evaluation finished since the last update, the model is kept.
+        """
+        pass
+
+    @staticmethod
+    def _pending_X(pending):
+        if len(pending) == 0:
+            return None
+
+        return np.vstack(list(pending.values()))
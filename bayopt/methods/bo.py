@@ -1,21 +1,44 @@
 from GPyOpt.methods.bayesian_optimization import BayesianOptimization
 from GPyOpt.core.errors import InvalidConfigError
-from bayopt.clock.clock import now_str
-from bayopt import definitions
-from bayopt.utils.utils import mkdir_when_not_exist
+from GPyOpt.util.general import normalize
+from bayopt.clock.timer import PhaseTimer
+from bayopt.models.gpmodel import ArgumentsManagerExt
+from bayopt.models.gpmodel import update_model
+from bayopt.methods.checkpoint import Checkpointing
+from bayopt.methods.streamlog import StreamLogging
 import GPyOpt
 import numpy as np
 import time
 from copy import deepcopy
 
 
-class BayesianOptimizationExt(BayesianOptimization):
+class BayesianOptimizationExt(Checkpointing, StreamLogging, BayesianOptimization):
+    """
+    Args:
+        model_type (string): GP, or sparseGP for long runs, which keeps its inducing inputs between the updates
+        num_inducing (int): maximum number of inducing inputs of a sparseGP model
+        checkpoint_dir (string | None): directory of the periodic checkpoints of the run (None disables them)
+        checkpoint_interval (int): number of evaluations between two checkpoints
+        resume_from (string | None): directory of a checkpoint from which the run is resumed
+        stream_log (bool): append the evaluations to evaluation.stream in the storage directory while the run goes on
+        stream_buffer_size (int): number of rows of a stream written at once
+
+    Attributes:
+        timer (PhaseTimer): time spent per iteration in model construction, hyperparameter optimization,
+            acquisition optimization and objective evaluation
+    """
 
     def __init__(self, f, domain=None, constraints=None, cost_withGradients=None, model_type='GP',
                  X=None, Y=None, initial_design_numdata=1, initial_design_type='random', acquisition_type='LCB',
                  normalize_Y=True, exact_feval=False, acquisition_optimizer_type='lbfgs', model_update_interval=1,
                  evaluator_type='sequential', batch_size=1, num_cores=1, verbosity=False, verbosity_model=False,
-                 maximize=False, de_duplication=False, ard=False):
+                 maximize=False, de_duplication=False, ard=False, checkpoint_dir=None, checkpoint_interval=1,
+                 resume_from=None, stream_log=False, stream_buffer_size=64, num_inducing=100):
+
+        self.timer = PhaseTimer()
+        self._init_stream_log(stream_log=stream_log, stream_buffer_size=stream_buffer_size)
+        X, Y = self._init_checkpoint(X=X, Y=Y, checkpoint_dir=checkpoint_dir,
+                                     checkpoint_interval=checkpoint_interval, resume_from=resume_from)
 
         super(BayesianOptimizationExt, self).__init__(
             f, domain=domain, constraints=constraints, cost_withGradients=cost_withGradients,
@@ -24,10 +47,11 @@ class BayesianOptimizationExt(BayesianOptimization):
             exact_feval=exact_feval, acquisition_optimizer_type=acquisition_optimizer_type,
             model_update_interval=model_update_interval, evaluator_type=evaluator_type,
             batch_size=batch_size, num_cores=num_cores, verbosity=verbosity, verbosity_model=verbosity_model,
-            maximize=maximize, de_duplication=de_duplication, ARD=ard)
+            maximize=maximize, de_duplication=de_duplication, ARD=ard, num_inducing=num_inducing)
 
         self.objective_name = f.get_function_name()
         self.ard = ard
+        self.num_inducing = num_inducing
 
     def run_optimization(self, max_iter=0, max_time=np.inf,  eps=1e-8, context=None, verbosity=False, save_models_parameters=True, report_file=None, evaluations_file=None, models_file=None):
         if self.objective is None:
@@ -72,10 +96,34 @@ class BayesianOptimizationExt(BayesianOptimization):
         # --- Initialize iterations and running time
         self.time_zero = time.time()
         self.cum_time  = 0
+        self.timer.reset()
         self.num_acquisitions = 0
         self.suggested_sample = self.X
         self.Y_new = self.Y
+        self._prepare_checkpoint()
+        self._open_stream_log()
+
+        try:
+            self._run_optimization()
+        finally:
+            self._close_stream_log()
+
+        self._checkpoint(force=True)
+
+        # --- Stop messages and execution time
+        self._compute_results()
+
+        # --- Print the desired result in files
+        if self.report_file is not None:
+            self.save_report(self.report_file)
+        if self.evaluations_file is not None:
+            self.save_evaluations(self.evaluations_file)
+        if self.models_file is not None:
+            self.save_models(self.models_file)
 
+        self._save()
+
+    def _run_optimization(self):
         # --- Initialize time cost of the evaluations
         while (self.max_time > self.cum_time):
             print('.')
@@ -90,7 +138,9 @@ class BayesianOptimizationExt(BayesianOptimization):
                     or (len(self.X) > 1 and self._distance_last_evaluations() <= self.eps)):
                 break
 
-            self.suggested_sample = self._compute_next_evaluations()
+            # --- the last batch only takes the evaluations left in the budget
+            suggested_sample = self._compute_next_evaluations()
+            self.suggested_sample = suggested_sample[:int(min(len(suggested_sample), self.max_iter - self.num_acquisitions))]
 
             # --- Augment X
             self.X = np.vstack((self.X,self.suggested_sample))
@@ -100,24 +150,54 @@ class BayesianOptimizationExt(BayesianOptimization):
 
             # --- Update current evaluation time and function evaluations
             self.cum_time = time.time() - self.time_zero
-            self.num_acquisitions += 1
+            self.num_acquisitions += self.suggested_sample.shape[0]
+            self._checkpoint()
+            self._log_evaluations()
+            self.timer.next_iteration(iteration=self.X.shape[0])
 
-            if verbosity:
+            if self.verbosity:
                 print("num acquisition: {}, time elapsed: {:.2f}s".format(
                     self.num_acquisitions, self.cum_time))
 
-        # --- Stop messages and execution time
-        self._compute_results()
+    def _model_chooser(self):
+        return ArgumentsManagerExt(self.kwargs).model_creator(self.model_type, self.exact_feval, self.space)
 
-        # --- Print the desired result in files
-        if self.report_file is not None:
-            self.save_report(self.report_file)
-        if self.evaluations_file is not None:
-            self.save_evaluations(self.evaluations_file)
-        if self.models_file is not None:
-            self.save_models(self.models_file)
+    def _update_model(self, normalization_type='stats'):
+        if self.num_acquisitions % self.model_update_interval == 0:
 
-        self._save()
+            with self.timer.phase('model'):
+                # input that goes into the model (is unziped in case there are categorical variables)
+                X_inmodel = self.space.unzip_inputs(self.X)
+
+                # Y_inmodel is the output that goes into the model
+                if self.normalize_Y:
+                    Y_inmodel = normalize(self.Y, normalization_type)
+                else:
+                    Y_inmodel = self.Y
+
+            update_model(model=self.model, X_all=X_inmodel, Y_all=Y_inmodel, timer=self.timer)
+
+        # Save parameters of the model
+        self._save_model_parameter_values()
+
+    def _compute_next_evaluations(self, pending_zipped_X=None, ignored_zipped_X=None):
+        with self.timer.phase('acquisition'):
+            return super()._compute_next_evaluations(pending_zipped_X=pending_zipped_X,
+                                                     ignored_zipped_X=ignored_zipped_X)
+
+    def evaluate_objective(self):
+        with self.timer.phase('evaluation'):
+            super().evaluate_objective()
+
+    def _restore_checkpoint_state(self, state):
+        X_inmodel = self.space.unzip_inputs(self.X)
+
+        if self.normalize_Y:
+            Y_inmodel = normalize(self.Y, self.normalization_type)
+        else:
+            Y_inmodel = self.Y
+
+        self._restore_model(X_inmodel=X_inmodel, Y_inmodel=Y_inmodel, hyperparameters=state.get('hyperparameters'))
 
     def _init_design_chooser(self):
         super()._init_design_chooser()
@@ -129,15 +209,21 @@ class BayesianOptimizationExt(BayesianOptimization):
         else:
             self.initial_Y = deepcopy(self.Y)
 
-    def _save(self):
-        mkdir_when_not_exist(abs_path=definitions.ROOT_DIR + '/storage/' + self.objective_name)
+    def _experiment_info(self):
+        return {'dim': self.space.dimensionality, 'method': 'bo', 'subspace_dim': None}
 
-        dir_name = definitions.ROOT_DIR + '/storage/' + self.objective_name + '/' + now_str() + ' ' + str(self.space.dimensionality) + 'D bo'
-        mkdir_when_not_exist(abs_path=dir_name)
+    def _save(self):
+        dir_name = self._storage_dir()
 
         self.save_report(report_file=dir_name + '/report.txt')
         self.save_evaluations(evaluations_file=dir_name + '/evaluation.csv')
         self.save_models(models_file=dir_name + '/model.csv')
+        self.save_timings(timings_file=dir_name + '/timing.csv')
+
+        self._register_experiment()
+
+    def save_timings(self, timings_file):
+        self._write_csv(timings_file, self.timer.table())
 
     def save_report(self, report_file= None):
         with open(report_file,'w') as file:
@@ -156,6 +242,8 @@ class BayesianOptimizationExt(BayesianOptimization):
 
             file.write('Tolerance:                   ' + str(self.eps) + '.\n')
             file.write('Optimization time:           ' + str(self.cum_time).strip('[]') +' seconds.\n')
+            for phase, phase_time in self.timer.totals().items():
+                file.write(('  ' + phase + ' time:').ljust(29) + str(phase_time) + ' seconds.\n')
 
             file.write('\n')
             file.write('--------------------------------' + ' Problem set up ' + '------------------------------------\n')
@@ -172,6 +260,8 @@ class BayesianOptimizationExt(BayesianOptimization):
             file.write('------------------------------' + ' Optimization set up ' + '---------------------------------\n')
             file.write('Normalized outputs:          ' + str(self.normalize_Y) + '\n')
             file.write('Model type:                  ' + str(self.model_type).strip('[]') + '\n')
+            if self.model_type == 'sparseGP':
+                file.write('Inducing points:             ' + str(self.num_inducing) + '\n')
             file.write('Model update interval:       ' + str(self.model_update_interval) + '\n')
             file.write('Acquisition type:            ' + str(self.acquisition_type).strip('[]') + '\n')
             file.write('Acquisition optimizer:       ' + str(self.acquisition_optimizer.optimizer_name).strip('[]') + '\n')
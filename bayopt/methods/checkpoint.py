@@ -0,0 +1,177 @@
+from bayopt.utils.utils import mkdir_when_not_exist
+import numpy as np
+import os
+
+X_FILE = 'X.bin'
+Y_FILE = 'Y.bin'
+STATE_FILE = 'state.npz'
+
+
+class Checkpoint(object):
+    """
+    Binary checkpoint of an optimization run in a directory.
+
+    X and Y are appended to raw float64 files, so that a checkpoint only writes the rows evaluated
+    since the previous one. The remaining state is replaced atomically and records how many rows are valid,
+    rows written by an interrupted checkpoint are discarded when the checkpoint is loaded.
+
+    Args:
+        directory (string): directory of the checkpoint files.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.num_rows = 0
+
+    @staticmethod
+    def exists(directory):
+        return os.path.isfile(os.path.join(directory, STATE_FILE))
+
+    def save(self, X, Y, state):
+        X = np.asarray(X, dtype=np.float64)
+        Y = np.asarray(Y, dtype=np.float64)
+
+        if X.shape[0] < self.num_rows:
+            raise ValueError('evaluations can not be removed from a checkpoint')
+
+        mkdir_when_not_exist(abs_path=self.directory)
+
+        # --- a new checkpoint overwrites the files of a previous run in the same directory
+        mode = 'ab' if self.num_rows > 0 else 'wb'
+        self._write_rows(X_FILE, X[self.num_rows:], mode)
+        self._write_rows(Y_FILE, Y[self.num_rows:], mode)
+
+        state = dict(state)
+        state['num_rows'] = X.shape[0]
+        state['x_dim'] = X.shape[1]
+        state['y_dim'] = Y.shape[1]
+
+        path = os.path.join(self.directory, STATE_FILE)
+        with open(path + '.tmp', 'wb') as file:
+            np.savez(file, **state)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(path + '.tmp', path)
+
+        self.num_rows = X.shape[0]
+
+    def load(self):
+        if not self.exists(self.directory):
+            raise FileNotFoundError('no checkpoint in ' + self.directory)
+
+        with np.load(os.path.join(self.directory, STATE_FILE)) as data:
+            state = {key: data[key] for key in data.files}
+
+        num_rows = int(state.pop('num_rows'))
+        X = self._read_rows(X_FILE, num_rows, int(state.pop('x_dim')))
+        Y = self._read_rows(Y_FILE, num_rows, int(state.pop('y_dim')))
+
+        self.num_rows = num_rows
+        return X, Y, state
+
+    def _write_rows(self, file_name, rows, mode):
+        with open(os.path.join(self.directory, file_name), mode) as file:
+            file.write(np.ascontiguousarray(rows).tobytes())
+            file.flush()
+            os.fsync(file.fileno())
+
+    def _read_rows(self, file_name, num_rows, dim):
+        path = os.path.join(self.directory, file_name)
+
+        with open(path, 'r+b') as file:
+            file.truncate(num_rows * dim * 8)
+
+        return np.fromfile(path, dtype=np.float64, count=num_rows * dim).reshape(num_rows, dim)
+
+
+class Checkpointing(object):
+    """
+    Periodic checkpoints of the optimization loop and resumption from them.
+
+    The class is mixed into the methods, which call _checkpoint after every evaluation and may extend
+    _checkpoint_state / _restore_checkpoint_state with their own state.
+
+    Args:
+        checkpoint_dir (string | None): directory of the checkpoints (None disables checkpoints).
+        checkpoint_interval (int): number of evaluations between two checkpoints.
+        resume_from (string | None): directory of a checkpoint to resume from.
+            Checkpoints are written to it as well when checkpoint_dir is None.
+    """
+
+    def _init_checkpoint(self, X, Y, checkpoint_dir=None, checkpoint_interval=1, resume_from=None):
+        if checkpoint_interval < 1:
+            raise ValueError('checkpoint_interval has to be positive')
+
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoint = None
+        self._resume_state = None
+        self._checkpoint_acquisitions = 0
+
+        if resume_from is not None:
+            checkpoint = Checkpoint(directory=resume_from)
+            X, Y, self._resume_state = checkpoint.load()
+
+            if checkpoint_dir is None or os.path.abspath(checkpoint_dir) == os.path.abspath(resume_from):
+                self.checkpoint = checkpoint
+
+        if checkpoint_dir is not None and self.checkpoint is None:
+            self.checkpoint = Checkpoint(directory=checkpoint_dir)
+
+        return X, Y
+
+    def _prepare_checkpoint(self):
+        if self._resume_state is not None:
+            state, self._resume_state = self._resume_state, None
+
+            self.num_acquisitions = int(state['num_acquisitions'])
+            self.initial_X = self.X[:int(state['num_initial'])].copy()
+            self.initial_Y = self.Y[:int(state['num_initial'])] * (-1 if self.maximize else 1)
+            np.random.set_state((str(state['rng_name']), state['rng_keys'], int(state['rng_pos']),
+                                 int(state['rng_has_gauss']), float(state['rng_cached_gaussian'])))
+            self._restore_checkpoint_state(state)
+
+        self._checkpoint_acquisitions = self.num_acquisitions
+
+    def _checkpoint(self, force=False):
+        if self.checkpoint is None:
+            return
+
+        if not force and self.num_acquisitions - self._checkpoint_acquisitions < self.checkpoint_interval:
+            return
+
+        self.checkpoint.save(X=self.X, Y=self.Y, state=self._checkpoint_state())
+        self._checkpoint_acquisitions = self.num_acquisitions
+
+    def _checkpoint_state(self):
+        rng_name, rng_keys, rng_pos, rng_has_gauss, rng_cached_gaussian = np.random.get_state()
+
+        state = {
+            'num_acquisitions': self.num_acquisitions,
+            'num_initial': self.initial_X.shape[0],
+            'rng_name': rng_name,
+            'rng_keys': rng_keys,
+            'rng_pos': rng_pos,
+            'rng_has_gauss': rng_has_gauss,
+            'rng_cached_gaussian': rng_cached_gaussian,
+        }
+
+        gp = getattr(self.model, 'model', None)
+        if gp is not None and hasattr(gp, 'param_array'):
+            state['hyperparameters'] = np.array(gp.param_array)
+
+        return state
+
+    def _restore_checkpoint_state(self, state):
+        pass
+
+    def _restore_model(self, X_inmodel, Y_inmodel, hyperparameters):
+        """
+        Builds the GP on the restored data with the checkpointed hyperparameters, without optimizing them.
+        """
+        if hyperparameters is None or not hasattr(self.model, '_create_model'):
+            return
+
+        self.model._create_model(X_inmodel, Y_inmodel)
+
+        if self.model.model.param_array.size == hyperparameters.size:
+            self.model.model[:] = hyperparameters
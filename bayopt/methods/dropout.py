@@ -1,24 +1,35 @@
 from GPyOpt.core.bo import BO
 from GPyOpt.core.task.cost import CostModel
-from GPyOpt.core.task.objective import SingleObjective
 from GPyOpt.models.gpmodel import GPModel
 from GPyOpt.optimization.acquisition_optimizer import AcquisitionOptimizer
 from GPyOpt.optimization.acquisition_optimizer import ContextManager
 from GPyOpt.experiment_design import initial_design
-from GPyOpt.util.general import normalize
 from GPyOpt.util.duplicate_manager import DuplicateManager
-from GPyOpt.util.arguments_manager import ArgumentsManager
+from GPyOpt.core.evaluators import Sequential
 from bayopt.space.space import initialize_space
 from bayopt.space.space import get_subspace
+from bayopt.space.space import unzip_inputs
+from bayopt.models.gpmodel import ArgumentsManagerExt
+from bayopt.models.gpmodel import IncrementalGPModel
+from bayopt.models.gpmodel import SparseGPModel
+from bayopt.models.gpmodel import update_model
+from bayopt.models.cache import SubspaceCache
+from bayopt.models.hyperparameters import HyperparameterStore
+from bayopt.methods.objective import PoolObjective
+from bayopt.methods.objective import NegatedFunction
+from bayopt.methods.asynchronous import AsynchronousOptimization
+from bayopt.methods.checkpoint import Checkpointing
+from bayopt.methods.streamlog import StreamLogging
+from bayopt.methods.history import EvaluationHistory
+from bayopt.methods.evaluator.constantliar import ConstantLiar
 from bayopt.clock.stopwatch import StopWatch
-from bayopt.clock.clock import now_str
-from bayopt import definitions
-from bayopt.utils.utils import mkdir_when_not_exist
+from bayopt.clock.timer import PhaseTimer
 from copy import deepcopy
+from functools import partial
 import numpy as np
 
 
-class Dropout(BO):
+class Dropout(AsynchronousOptimization, Checkpointing, StreamLogging, EvaluationHistory, BO):
     """
 
     Args:
@@ -37,29 +48,69 @@ class Dropout(BO):
         constraints (dict | None):
         space (Design_space):
         model (BOModel):
+        model_type (string): GP, or sparseGP for long runs, which keeps its inducing inputs while the subspace
+            does not change
+        num_inducing (int): maximum number of inducing inputs of a sparseGP model
+        incremental_model (bool): reuse the GP while the subspace does not change, extending its Cholesky factor
+            instead of refitting it from scratch (only for model_type='GP')
+        model_optimize_interval (int): number of incremental updates between two hyperparameter optimizations
+        model_likelihood_drift (float): tolerance of the log marginal likelihood per observation
+            which triggers a hyperparameter optimization
+        subspace_cache_size (int): number of subspaces whose fitted models are cached (0 disables the cache).
+            The model of a cache hit starts from the hyperparameters it was fitted with and refines them
+            with 1 restart of warm_start_max_iters
+        subspace_cache_memory (int | None): maximum number of bytes held by the cached models
+        ard (bool): use a lengthscale per dimension in the kernel of the GP
+        warm_start (bool): initialize the GP of a new subspace from the hyperparameters fitted on the previous ones
+            (kept per dimension in hyperparameters) and optimize them with 1 restart of warm_start_max_iters
+        warm_start_max_iters (int): maximum number of iterations of a warm-started hyperparameter optimization
+        evaluator_type (string): sequential, or local_penalization / constant_liar for batch_size > 1.
+            The points of a batch are evaluated concurrently by batch_size worker processes.
+            asynchronous keeps batch_size evaluations in flight and proposes a new point whenever one finishes
+        checkpoint_dir (string | None): directory of the periodic checkpoints of the run (None disables them)
+        checkpoint_interval (int): number of evaluations between two checkpoints
+        resume_from (string | None): directory of a checkpoint from which the run is resumed
+        stream_log (bool): append the evaluations to evaluation.stream in the storage directory while the run goes on
+        stream_buffer_size (int): number of rows of a stream written at once
         acquisition (AcquisitionBase):
         cost (CostModel):
+        timer (PhaseTimer): time spent per iteration in subspace selection, model construction,
+            hyperparameter optimization, acquisition optimization, fill-in and objective evaluation
     """
 
     def __init__(self, fill_in_strategy, f, mix=0.5, domain=None, constraints=None, cost_withGradients=None, X=None, Y=None, subspace_dim_size=0,
                  model_type='GP', initial_design_numdata=1, initial_design_type='random', acquisition_type='LCB',
                  normalize_Y=True, exact_feval=False, acquisition_optimizer_type='lbfgs', model_update_interval=1,
-                 evaluator_type='sequential', batch_size=1, maximize=False, de_duplication=False):
+                 evaluator_type='sequential', batch_size=1, maximize=False, de_duplication=False,
+                 incremental_model=False, model_optimize_interval=10, model_likelihood_drift=0.1,
+                 subspace_cache_size=0, subspace_cache_memory=None, checkpoint_dir=None, checkpoint_interval=1,
+                 resume_from=None, stream_log=False, stream_buffer_size=64, ard=False, warm_start=False,
+                 warm_start_max_iters=100, num_inducing=100):
 
         if model_type == 'input_warped_GP':
             raise NotImplementedError('input_warped_GP model is not implemented')
 
+        if incremental_model and model_type != 'GP':
+            raise NotImplementedError('incremental model is only implemented for GP')
+
+        if warm_start and model_type not in ['GP', 'sparseGP']:
+            raise NotImplementedError('warm start is only implemented for GP and sparseGP')
+
         if acquisition_type in ['EI_MCMC', 'MPI_MCMC', 'LCB_MCMC']:
             raise NotImplementedError('MCMC is not implemented')
 
-        if batch_size is not 1 or evaluator_type is not 'sequential':
-            raise NotImplementedError('only sequential evaluation is implemented')
+        if evaluator_type not in ['sequential', 'local_penalization', 'constant_liar', 'asynchronous']:
+            raise NotImplementedError(
+                'evaluator_type has to be sequential, local_penalization, constant_liar or asynchronous')
+
+        if batch_size != 1 and evaluator_type == 'sequential':
+            raise ValueError('sequential evaluation requires batch_size = 1')
 
         if fill_in_strategy not in ['random', 'copy', 'mix']:
             raise ValueError('fill_in_strategy has to be random, copy or mix')
 
         # private field
-        self._arguments_mng = ArgumentsManager(kwargs=dict())
+        self._arguments_mng = ArgumentsManagerExt(kwargs={'ARD': ard, 'num_inducing': num_inducing})
 
         self.fill_in_strategy = fill_in_strategy
         self.mix = mix
@@ -68,6 +119,7 @@ class Dropout(BO):
         self.initial_design_numdata = initial_design_numdata
         self.initial_design_type = initial_design_type
         self.model_type = model_type
+        self.num_inducing = num_inducing
         self.acquisition_type = acquisition_type
         self.evaluator_type = evaluator_type
         self.model_update_interval = model_update_interval
@@ -75,6 +127,17 @@ class Dropout(BO):
         self.normalize_Y = normalize_Y
         self.de_duplication = de_duplication
         self.subspace_dim_size = subspace_dim_size
+        self.incremental_model = incremental_model
+        self.model_optimize_interval = model_optimize_interval
+        self.model_likelihood_drift = model_likelihood_drift
+        self.ard = ard
+        self.warm_start = warm_start
+        self.warm_start_max_iters = warm_start_max_iters
+
+        if subspace_cache_size > 0:
+            self.subspace_cache = SubspaceCache(capacity=subspace_cache_size, max_memory=subspace_cache_memory)
+        else:
+            self.subspace_cache = None
 
         # --- property injected in other methods.
         self.verbosity = False
@@ -91,16 +154,21 @@ class Dropout(BO):
         # --- unnecessary property
         self.suggested_sample = None
         self.Y_new = None
+        self.timer = PhaseTimer()
 
         # --- BO class property in uncertain use
-        self.num_cores = 1
+        self.num_cores = batch_size
 
-        self.objective = SingleObjective(self._sign(f), batch_size, f.get_function_name())
+        self.objective = PoolObjective(self._sign(f), batch_size, f.get_function_name())
         self.cost = CostModel(cost_withGradients=cost_withGradients)
         self.space = initialize_space(domain=domain, constraints=constraints)
 
-        self.model = self._arguments_mng.model_creator(
-            model_type=self.model_type, exact_feval=exact_feval, space=self.space)
+        if warm_start:
+            self.hyperparameters = HyperparameterStore(dimensionality=self.dimensionality)
+        else:
+            self.hyperparameters = None
+
+        self.model = self._create_model(exact_feval=exact_feval, space=self.space)
 
         self.acquisition = self._arguments_mng.acquisition_creator(
             acquisition_type=self.acquisition_type, model=self.model, space=self.space,
@@ -110,6 +178,10 @@ class Dropout(BO):
 
         self._choose_evaluator()
 
+        self._init_stream_log(stream_log=stream_log, stream_buffer_size=stream_buffer_size)
+        X, Y = self._init_checkpoint(X=X, Y=Y, checkpoint_dir=checkpoint_dir,
+                                     checkpoint_interval=checkpoint_interval, resume_from=resume_from)
+
         self.X = X
         self.Y = Y
         self._set_initial_values()
@@ -173,11 +245,16 @@ class Dropout(BO):
         return self.objective.objective_name
 
     def _choose_evaluator(self):
-        self.evaluator = self._arguments_mng.evaluator_creator(
-            evaluator_type=self.evaluator_type, acquisition=self.acquisition,
-            batch_size=self.batch_size, model_type=self.model_type, model=self.model,
-            space=self.space, acquisition_optimizer=self.acquisition_optimizer
-        )
+        if self.evaluator_type == 'constant_liar':
+            self.evaluator = ConstantLiar(acquisition=self.acquisition, batch_size=self.batch_size)
+        elif self.evaluator_type == 'asynchronous':
+            self.evaluator = Sequential(acquisition=self.acquisition)
+        else:
+            self.evaluator = self._arguments_mng.evaluator_creator(
+                evaluator_type=self.evaluator_type, acquisition=self.acquisition,
+                batch_size=self.batch_size, model_type=self.model_type, model=self.model,
+                space=self.acquisition.space, acquisition_optimizer=self.acquisition_optimizer
+            )
 
     def run_optimization(self, max_iter=0, max_time=np.inf,  eps=1e-8, context=None,
                          verbosity=False, save_models_parameters=True, report_file=None,
@@ -218,12 +295,24 @@ class Dropout(BO):
 
         # --- Initialize iterations and running time
         stopwatch = StopWatch()
+        self.timer.reset()
         self.num_acquisitions = self.initial_design_numdata
         self.suggested_sample = self.X
         self.Y_new = self.Y
+        self._prepare_checkpoint()
         self._compute_results()
+        self._open_stream_log()
+
+        try:
+            if self.evaluator_type == 'asynchronous':
+                self._run_asynchronous_optimization()
+            else:
+                self._run_optimization()
+        finally:
+            self.objective.close()
+            self._close_stream_log()
 
-        self._run_optimization()
+        self._checkpoint(force=True)
 
         self.cum_time = stopwatch.passed_time()
 
@@ -258,13 +347,18 @@ class Dropout(BO):
             self.next_point()
 
             # --- Update current evaluation time and function evaluations
-            self.num_acquisitions += 1
+            self.num_acquisitions += self.suggested_sample.shape[0]
+            self._checkpoint()
+            self._log_evaluations()
+            self.timer.next_iteration(iteration=self.X.shape[0])
 
     def next_point(self):
-        self.suggested_sample = self._compute_next_evaluations()
+        # --- the last batch only takes the evaluations left in the budget
+        suggested_sample = self._compute_next_evaluations()
+        self.suggested_sample = suggested_sample[:int(min(len(suggested_sample), self.max_iter - self.num_acquisitions))]
 
         # --- Augment X
-        self.X = np.vstack((self.X, self.suggested_sample))
+        self.history.append_X(self.suggested_sample)
 
         # --- Evaluate *f* in X, augment Y and update cost function (if needed)
         self.evaluate_objective()
@@ -275,27 +369,48 @@ class Dropout(BO):
 
     def update(self):
         self._update_model(self.normalization_type)
-        self._update_acquisition()
-        self._update_evaluator()
 
-    def _dropout_random(self, embedded_idx):
-        return initial_design('random', get_subspace(space=self.space, subspace_idx=embedded_idx), 1)[0]
+        with self.timer.phase('acquisition'):
+            self._update_acquisition()
+            self._update_evaluator()
+
+    def _update_unchanged(self):
+        # --- a new subspace is drawn, but its GP keeps the hyperparameters as the evaluations are the same
+        self._update_model(self.normalization_type, max_iters=0)
+
+        with self.timer.phase('acquisition'):
+            self._update_acquisition()
+            self._update_evaluator()
+
+    def evaluate_objective(self):
+        """
+        Evaluates the objective
+        """
+        with self.timer.phase('evaluation'):
+            self.Y_new, cost_new = self.objective.evaluate(self.suggested_sample)
+
+        self.cost.update_cost_model(self.suggested_sample, cost_new)
+        self.history.append_Y(self.Y_new)
 
-    def _dropout_copy(self, embedded_idx):
+    def _dropout_random(self, embedded_idx, num=1):
+        return initial_design('random', get_subspace(space=self.space, subspace_idx=embedded_idx), num)
+
+    def _dropout_copy(self, embedded_idx, num=1):
         x_opt, _ = self.get_best_point()
-        return x_opt[embedded_idx]
+        return np.tile(x_opt[embedded_idx], (num, 1))
 
-    def _dropout_mix(self, embedded_idx):
-        if np.random.rand() < self.mix:
-            return self._dropout_random(embedded_idx=embedded_idx)
-        else:
-            return self._dropout_copy(embedded_idx=embedded_idx)
+    def _dropout_mix(self, embedded_idx, num=1):
+        values = self._dropout_copy(embedded_idx=embedded_idx, num=num)
+
+        is_random = np.random.rand(num) < self.mix
+        if np.any(is_random):
+            values[is_random] = self._dropout_random(embedded_idx=embedded_idx, num=np.count_nonzero(is_random))
+
+        return values
 
     def _sign(self, f):
         if self.maximize:
-            f_copy = f
-
-            def f(x): return -f_copy(x)
+            return NegatedFunction(f)
         return f
 
     def _set_initial_values(self):
@@ -312,35 +427,34 @@ class Dropout(BO):
         else:
             self.initial_Y = deepcopy(self.Y)
 
-    def _fill_in_strategy(self, embedded_idx):
+    def _fill_in_strategy(self, embedded_idx, num=1):
         if self.fill_in_strategy == 'random':
-            return self._dropout_random(embedded_idx=embedded_idx)
+            return self._dropout_random(embedded_idx=embedded_idx, num=num)
         elif self.fill_in_strategy == 'copy':
-            return self._dropout_copy(embedded_idx=embedded_idx)
+            return self._dropout_copy(embedded_idx=embedded_idx, num=num)
         elif self.fill_in_strategy == 'mix':
-            return self._dropout_mix(embedded_idx=embedded_idx)
+            return self._dropout_mix(embedded_idx=embedded_idx, num=num)
 
     def _fill_in_dimensions(self, samples):
-        full_num = self.dimensionality
+        """
+        Assembles full-dimensional samples from subspace samples of shape (n, subspace dimension),
+        drawing the values of the dropped dimensions for all n samples at once.
+        """
+        samples = np.atleast_2d(samples)
         subspace_idx = self.subspace_idx
-        embedded_idx = [i for i in range(full_num) if i not in subspace_idx]
-
-        samples_ = list()
-
-        for sample in samples:
 
-            if len(sample) > len(subspace_idx):
-                raise ValueError('samples already have been full-dimensionality')
+        if samples.shape[1] > len(subspace_idx):
+            raise ValueError('samples already have been full-dimensionality')
 
-            embedded_sample = self._fill_in_strategy(embedded_idx=embedded_idx)
+        embedded_idx = np.setdiff1d(np.arange(self.dimensionality), subspace_idx)
 
-            sample_ = deepcopy(sample)
-            for emb_idx, insert_idx in enumerate(embedded_idx):
-                sample_ = np.insert(sample_, emb_idx, embedded_sample[emb_idx])
+        samples_ = np.empty((samples.shape[0], self.dimensionality))
+        samples_[:, subspace_idx] = samples
 
-            samples_.append(sample_)
+        if len(embedded_idx) > 0:
+            samples_[:, embedded_idx] = self._fill_in_strategy(embedded_idx=embedded_idx, num=samples.shape[0])
 
-        return np.array(samples_)
+        return samples_
 
     def _update_acquisition(self):
         self.acquisition = self._arguments_mng.acquisition_creator(
@@ -350,19 +464,88 @@ class Dropout(BO):
         )
 
     def _update_evaluator(self):
-        self.evaluator.acquisition = self.acquisition
+        if self.evaluator_type == 'local_penalization' and self.batch_size > 1:
+            # --- the penalized acquisition wraps the model and the space of the current subspace
+            self._choose_evaluator()
+        else:
+            self.evaluator.acquisition = self.acquisition
+
+    def _create_model(self, exact_feval, space):
+        if self.incremental_model:
+            model = IncrementalGPModel(exact_feval=exact_feval, optimize_interval=self.model_optimize_interval,
+                                       likelihood_drift=self.model_likelihood_drift, ARD=self.ard)
+        else:
+            model = self._arguments_mng.model_creator(model_type=self.model_type, exact_feval=exact_feval,
+                                                      space=space)
+
+        # --- a warm-started optimization only refines the hyperparameters of the previous subspaces
+        if self.hyperparameters is not None and not self.hyperparameters.is_empty:
+            model.optimize_restarts = 1
+            model.max_iters = self.warm_start_max_iters
+
+        return model
+
+    def _initialize_hyperparameters(self, gp):
+        self.hyperparameters.initialize(subspace_idx=self.subspace_idx, gp=gp)
+
+    @staticmethod
+    def _copy_hyperparameters(model, gp):
+        if model is not None and model.model is not None and model.model.param_array.size == gp.param_array.size:
+            gp[:] = model.model.param_array
 
-    def _update_model(self, normalization_type='stats'):
+    def _is_reusable_model(self, previous_subspace_idx):
+        if not isinstance(self.model, (IncrementalGPModel, SparseGPModel)) or self.model.model is None:
+            return False
+
+        return previous_subspace_idx is not None and np.array_equal(previous_subspace_idx, self.subspace_idx)
+
+    def _subspace_model(self, previous_subspace_idx):
+        """
+        Returns the model of the current subspace and whether it is the model of a cache hit.
+        """
+        if self.subspace_cache is not None:
+            entry = self.subspace_cache.get(self.subspace_idx)
+            if entry is not None:
+                return entry.model, True
+
+        # --- a miss keeps the model of an unchanged subspace, e.g. after its entry was evicted
+        if self._is_reusable_model(previous_subspace_idx=previous_subspace_idx):
+            return self.model, False
+
+        return self._create_model(exact_feval=self.exact_feval, space=self.subspace), False
+
+    def _update_model(self, normalization_type='stats', max_iters=None):
         if self.num_acquisitions % self.model_update_interval == 0:
 
-            self.update_subspace()
+            previous_subspace_idx = self.subspace_idx
+            previous_model = self.model
+            with self.timer.phase('subspace'):
+                self.update_subspace()
+
+            with self.timer.phase('model'):
+                self.model, cached = self._subspace_model(previous_subspace_idx=previous_subspace_idx)
+                X_inmodel, Y_inmodel = self._input_data(normalization_type=normalization_type)
 
-            self.model = self._arguments_mng.model_creator(
-                model_type=self.model_type, exact_feval=self.exact_feval, space=self.subspace)
+            # --- the fitted hyperparameters of a cache hit are only refined
+            optimize_restarts = None
+            if cached and max_iters is None:
+                optimize_restarts, max_iters = 1, self.warm_start_max_iters
+
+            if self.hyperparameters is not None:
+                initialize = self._initialize_hyperparameters
+            elif max_iters == 0:
+                initialize = partial(self._copy_hyperparameters, previous_model)
+            else:
+                initialize = None
+            update_model(model=self.model, X_all=X_inmodel, Y_all=Y_inmodel, timer=self.timer, initialize=initialize,
+                         optimize_restarts=optimize_restarts, max_iters=max_iters)
 
-            X_inmodel, Y_inmodel = self._input_data(normalization_type=normalization_type)
+            # --- only optimized hyperparameters are kept
+            if self.hyperparameters is not None and max_iters != 0:
+                self.hyperparameters.update(subspace_idx=self.subspace_idx, gp=self.model.model)
 
-            self.model.updateModel(X_inmodel, Y_inmodel, None, None)
+            if self.subspace_cache is not None and max_iters != 0:
+                self.subspace_cache.put(subspace_idx=self.subspace_idx, space=self.subspace, model=self.model)
             self.X_inmodel = X_inmodel
             self.Y_inmodel = Y_inmodel
 
@@ -371,11 +554,11 @@ class Dropout(BO):
 
     def _input_data(self, normalization_type):
         # input that goes into the model (is unziped in case there are categorical variables)
-        X_inmodel = self.subspace.unzip_inputs(np.array([xi[self.subspace_idx] for xi in self.X]))
+        X_inmodel = unzip_inputs(self.subspace, self.history.columns(self.subspace_idx))
 
         # Y_inmodel is the output that goes into the model
         if self.normalize_Y:
-            Y_inmodel = normalize(self.Y, normalization_type)
+            Y_inmodel = self.history.normalized_Y(normalization_type)
         else:
             Y_inmodel = self.Y
 
@@ -385,17 +568,27 @@ class Dropout(BO):
         self.subspace_idx = np.sort(np.random.choice(
             range(self.dimensionality),
             self.subspace_dim_size, replace=False))
-        self.subspace = get_subspace(space=self.space, subspace_idx=self.subspace_idx)
+        self.subspace = self._get_subspace(subspace_idx=self.subspace_idx)
+
+    def _get_subspace(self, subspace_idx):
+        if self.subspace_cache is not None:
+            entry = self.subspace_cache.peek(subspace_idx)
+            if entry is not None:
+                return entry.space
+
+        return get_subspace(space=self.space, subspace_idx=subspace_idx)
 
     def _compute_next_evaluations(self, pending_zipped_X=None, ignored_zipped_X=None):
         context_manager, duplicate_manager = self._compute_setting(pending_zipped_X=pending_zipped_X, ignored_zipped_X=ignored_zipped_X)
 
         # We zip the value in case there are categorical variables
-        suggested_ = self.subspace.zip_inputs(self.evaluator.compute_batch(
-            duplicate_manager=duplicate_manager,
-            context_manager=context_manager))
+        with self.timer.phase('acquisition'):
+            suggested_ = self.subspace.zip_inputs(self.evaluator.compute_batch(
+                duplicate_manager=duplicate_manager,
+                context_manager=context_manager))
 
-        return self._fill_in_dimensions(samples=suggested_)
+        with self.timer.phase('fill_in'):
+            return self._fill_in_dimensions(samples=suggested_)
 
     def _compute_setting(self, pending_zipped_X, ignored_zipped_X):
         context_manager = ContextManager(self.subspace, self.context)
@@ -403,26 +596,84 @@ class Dropout(BO):
         # --- Update the context if any
         self.acquisition.optimizer.context_manager = context_manager
 
-        # --- Activate de_duplication
-        if self.de_duplication:
+        # --- Activate de_duplication, always for points which are still being evaluated
+        if self.de_duplication or pending_zipped_X is not None:
             duplicate_manager = DuplicateManager(
-                space=self.subspace, zipped_X=self.X, pending_zipped_X=pending_zipped_X,
-                ignored_zipped_X=ignored_zipped_X)
+                space=self.subspace, zipped_X=self._project(self.X),
+                pending_zipped_X=self._project(pending_zipped_X),
+                ignored_zipped_X=self._project(ignored_zipped_X))
         else:
             duplicate_manager = None
 
         return context_manager, duplicate_manager
 
+    def _checkpoint_state(self):
+        state = super()._checkpoint_state()
+
+        if self.subspace_idx is not None:
+            state['subspace_idx'] = self.subspace_idx
+
+        if self.hyperparameters is not None:
+            state.update({'warm_start_' + key: value for key, value in self.hyperparameters.state().items()})
+
+        return state
+
+    def _restore_checkpoint_state(self, state):
+        if self.hyperparameters is not None:
+            self.hyperparameters.restore({key[len('warm_start_'):]: value for key, value in state.items()
+                                          if key.startswith('warm_start_')})
+
+        if 'subspace_idx' not in state:
+            return
+
+        self.subspace_idx = state['subspace_idx']
+        self.subspace = self._get_subspace(subspace_idx=self.subspace_idx)
+        self.model = self._create_model(exact_feval=self.exact_feval, space=self.subspace)
+
+        X_inmodel, Y_inmodel = self._input_data(normalization_type=self.normalization_type)
+        self._restore_model(X_inmodel=X_inmodel, Y_inmodel=Y_inmodel, hyperparameters=state.get('hyperparameters'))
+
+    def _project(self, zipped_X):
+        # --- the acquisition is optimized in the subspace, so are the points compared with its suggestions
+        if zipped_X is None:
+            return None
+
+        return np.atleast_2d(zipped_X)[:, self.subspace_idx]
+
+    def _objective_input(self, suggested_sample):
+        return suggested_sample
+
+    def _experiment_info(self):
+        return {'dim': self.dimensionality, 'method': str(self.fill_in_strategy), 'subspace_dim': self.subspace_dim_size}
+
+    def _open_stream_log(self):
+        super()._open_stream_log()
+
+        # --- the times of the batches are always streamed to batch_time.stream
+        if self.batch_size > 1:
+            self.objective.batch_log = self._stream_logger(file_name='batch_time.stream', columns=['Batch', 'Time'])
+
+    def _stream_loggers(self):
+        return super()._stream_loggers() + [self.objective.batch_log]
+
+    def _close_stream_log(self):
+        super()._close_stream_log()
+        self.objective.batch_log = None
+
     def _save(self):
-        mkdir_when_not_exist(abs_path=definitions.ROOT_DIR + '/storage/' + self.objective_name)
-        
-        dir_name = definitions.ROOT_DIR + '/storage/' + self.objective_name + '/' + now_str() + ' ' + str(self.dimensionality) + 'D ' + str(self.fill_in_strategy)
-        mkdir_when_not_exist(abs_path=dir_name)
+        dir_name = self._storage_dir()
 
         self.save_report(report_file=dir_name + '/report.txt')
         self.save_evaluations(evaluations_file=dir_name + '/evaluation.csv')
         self.save_models(models_file=dir_name + '/model.csv')
 
+        self.save_timings(timings_file=dir_name + '/timing.csv')
+
+        self._register_experiment()
+
+    def save_timings(self, timings_file):
+        self._write_csv(timings_file, self.timer.table())
+
     def save_report(self, report_file=None):
         with open(report_file,'w') as file:
             import GPyOpt
@@ -440,6 +691,8 @@ class Dropout(BO):
 
             file.write('Tolerance:                   ' + str(self.eps) + '.\n')
             file.write('Optimization time:           ' + str(self.cum_time).strip('[]') +' seconds.\n')
+            for phase, phase_time in self.timer.totals().items():
+                file.write(('  ' + phase + ' time:').ljust(29) + str(phase_time) + ' seconds.\n')
 
             file.write('\n')
             file.write('--------------------------------' + ' Problem set up ' + '------------------------------------\n')
@@ -458,7 +711,15 @@ class Dropout(BO):
             file.write('------------------------------' + ' Optimization set up ' + '---------------------------------\n')
             file.write('Normalized outputs:          ' + str(self.normalize_Y) + '\n')
             file.write('Model type:                  ' + str(self.model_type).strip('[]') + '\n')
+            if self.model_type == 'sparseGP':
+                file.write('Inducing points:             ' + str(self.num_inducing) + '\n')
             file.write('Model update interval:       ' + str(self.model_update_interval) + '\n')
+            file.write('Incremental model:           ' + str(self.incremental_model) + '\n')
+            file.write('ARD used:                    ' + str(self.ard) + '\n')
+            file.write('Warm start:                  ' + str(self.warm_start) + '\n')
+            if self.subspace_cache is not None:
+                file.write('Subspace cache (hit/miss):   ' + str(self.subspace_cache.hits) + '/' +
+                           str(self.subspace_cache.misses) + '\n')
             file.write('Acquisition type:            ' + str(self.acquisition_type).strip('[]') + '\n')
             file.write('Acquisition optimizer:       ' + str(self.acquisition_optimizer.optimizer_name).strip('[]') + '\n')
 
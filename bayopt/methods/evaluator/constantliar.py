@@ -0,0 +1,63 @@
+from GPyOpt.core.evaluators.base import EvaluatorBase
+import numpy as np
+
+
+class ConstantLiar(EvaluatorBase):
+    """
+    Batch evaluator which selects the points of a batch one after another, each time conditioning
+    the GP of the acquisition on the previously selected points with a constant fake observation (the lie).
+
+    Args:
+        acquisition (AcquisitionBase): acquisition whose model is a GP model.
+        batch_size (int): the number of elements in the batch.
+        liar (string): the fake observation, min, mean or max of the observations in the model.
+    """
+
+    def __init__(self, acquisition, batch_size, liar='min'):
+        if liar not in ['min', 'mean', 'max']:
+            raise ValueError('liar has to be min, mean or max')
+
+        super().__init__(acquisition, batch_size)
+        self.liar = liar
+
+    def compute_batch(self, duplicate_manager=None, context_manager=None):
+        X_batch, _ = self._compute_batch(duplicate_manager=duplicate_manager)
+        return X_batch
+
+    def _compute_batch(self, duplicate_manager=None):
+        gp = self.acquisition.model.model
+        X, Y = np.array(gp.X), np.array(gp.Y)
+
+        lie = self._lie(Y)
+        X_batch, f_batch = list(), list()
+
+        try:
+            for k in range(self.batch_size):
+                if k > 0:
+                    gp.set_XY(np.vstack([X] + X_batch), np.vstack((Y, np.full((k, 1), lie))))
+
+                x, f = self.acquisition.optimize(duplicate_manager=duplicate_manager)
+                X_batch.append(np.atleast_2d(x))
+                f_batch.append(np.atleast_2d(f))
+        finally:
+            if gp.X.shape[0] != X.shape[0]:
+                gp.set_XY(X, Y)
+
+        return np.vstack(X_batch), np.vstack(f_batch)
+
+    def _lie(self, Y):
+        if self.liar == 'min':
+            return np.min(Y)
+        elif self.liar == 'mean':
+            return np.mean(Y)
+        else:
+            return np.max(Y)
+
+
+class ConstantLiarExt(ConstantLiar):
+
+    def compute_batch(self, duplicate_manager=None, context_manager=None):
+        """
+        Selects the new locations to evaluate the objective and returns their acquisition values.
+        """
+        return self._compute_batch(duplicate_manager=duplicate_manager)
@@ -0,0 +1,41 @@
+from bayopt.methods.bo import BayesianOptimizationExt
+from bayopt.methods.dropout import Dropout
+from bayopt.methods.interleaved import InterleavedREMBO
+from bayopt.methods.rembo import REMBO
+from bayopt.methods.select import SelectAcquisition
+from bayopt.methods.select import SelectObjective
+
+METHODS = ['bo', 'dropout_random', 'dropout_copy', 'dropout_mix', 'rembo', 'interleaved_rembo', 'select_objective',
+           'select_acquisition']
+
+# --- methods which optimize in a subspace of a given dimension
+SUBSPACE_METHODS = ['dropout_random', 'dropout_copy', 'dropout_mix', 'rembo', 'interleaved_rembo']
+
+
+def create_method(method, f, domain, subspace_dim=None, **options):
+    """
+    Creates a method by its name in METHODS. The options are passed to the constructor of the method,
+    the select methods fill in at random unless fill_in_strategy is given.
+    """
+    if method not in METHODS:
+        raise ValueError('method has to be one of ' + ', '.join(METHODS))
+
+    if method in SUBSPACE_METHODS and subspace_dim is None:
+        raise ValueError(method + ' requires subspace_dim')
+
+    if method == 'bo':
+        return BayesianOptimizationExt(f=f, domain=domain, **options)
+    if method == 'rembo':
+        return REMBO(f=f, domain=domain, subspace_dim_size=subspace_dim, **options)
+    if method == 'interleaved_rembo':
+        return InterleavedREMBO(f=f, domain=domain, subspace_dim_size=subspace_dim, **options)
+    if method.startswith('dropout_'):
+        return Dropout(f=f, domain=domain, subspace_dim_size=subspace_dim,
+                       fill_in_strategy=method[len('dropout_'):], **options)
+
+    options.setdefault('fill_in_strategy', 'random')
+
+    if method == 'select_objective':
+        return SelectObjective(f=f, domain=domain, **options)
+
+    return SelectAcquisition(f=f, domain=domain, **options)
@@ -0,0 +1,177 @@
+from GPyOpt.util.general import normalize
+import numpy as np
+
+
+class History(object):
+    """
+    X and Y of an optimization run in preallocated buffers whose capacity doubles when they are full,
+    so that appending evaluations copies amortized O(1) rows instead of the whole history.
+
+    X and Y are views of the filled rows of the buffers. Rows are only ever written beyond the filled rows
+    and setting X or Y allocates new buffers, so the views handed out (e.g. to a GP model) never change.
+    The mean, variance, minimum and maximum of Y are updated with the appended values for normalized_Y.
+
+    Args:
+        capacity (int): initial number of rows of the buffers.
+    """
+
+    def __init__(self, capacity=64):
+        if capacity < 1:
+            raise ValueError('capacity has to be positive')
+
+        self.capacity = capacity
+        self.num_x = 0
+        self.num_y = 0
+
+        self._X = None
+        self._Y = None
+        self._reset_statistics()
+
+    @property
+    def X(self):
+        if self._X is None:
+            return None
+
+        return self._X[:self.num_x]
+
+    @property
+    def Y(self):
+        if self._Y is None:
+            return None
+
+        return self._Y[:self.num_y]
+
+    def set_X(self, X):
+        self._X, self.num_x = self._allocate(X)
+
+    def set_Y(self, Y):
+        self._Y, self.num_y = self._allocate(Y)
+        self._reset_statistics()
+
+        if self._Y is not None:
+            self._update_statistics(self.Y)
+
+    def append_X(self, rows):
+        if self._X is None:
+            return self.set_X(rows)
+
+        self._X, self.num_x = self._append(self._X, self.num_x, rows)
+
+    def append_Y(self, rows):
+        if self._Y is None:
+            return self.set_Y(rows)
+
+        num_y = self.num_y
+        self._Y, self.num_y = self._append(self._Y, self.num_y, rows)
+        self._update_statistics(self._Y[num_y: self.num_y])
+
+    def columns(self, idx):
+        """
+        Returns the columns idx of X, gathered at once.
+        """
+        return np.take(self.X, idx, axis=1)
+
+    def normalized_Y(self, normalization_type='stats'):
+        """
+        Returns Y normalized as GPyOpt.util.general.normalize does, from the running statistics of Y.
+        """
+        if self._Y.shape[1] != 1:
+            return normalize(self.Y, normalization_type)
+
+        if normalization_type == 'stats':
+            Y_norm = self.Y - self._mean
+            std = np.sqrt(self._m2 / self._count)
+            if std > 0:
+                Y_norm /= std
+        elif normalization_type == 'maxmin':
+            Y_norm = self.Y - self._min
+            y_range = self._max - self._min
+            if y_range > 0:
+                Y_norm /= y_range
+                Y_norm = 2 * (Y_norm - 0.5)
+        else:
+            raise ValueError('Unknown normalization type: {}'.format(normalization_type))
+
+        return Y_norm
+
+    def _allocate(self, values):
+        if values is None:
+            return None, 0
+
+        values = np.atleast_2d(np.asarray(values, dtype=np.float64))
+
+        buffer = np.empty((max(self.capacity, 2 * values.shape[0]), values.shape[1]))
+        buffer[:values.shape[0]] = values
+
+        return buffer, values.shape[0]
+
+    @staticmethod
+    def _append(buffer, num_rows, rows):
+        rows = np.atleast_2d(rows)
+        size = num_rows + rows.shape[0]
+
+        if size > buffer.shape[0]:
+            grown = np.empty((max(2 * buffer.shape[0], size), buffer.shape[1]))
+            grown[:num_rows] = buffer[:num_rows]
+            buffer = grown
+
+        buffer[num_rows: size] = rows
+        return buffer, size
+
+    def _reset_statistics(self):
+        self._count = 0
+        self._mean = 0.
+        self._m2 = 0.
+        self._min = np.inf
+        self._max = -np.inf
+
+    def _update_statistics(self, values):
+        # --- merges the mean and the sum of squared deviations of the new values (Chan et al.)
+        values = np.ravel(values)
+        if values.size == 0:
+            return
+
+        count = self._count + values.size
+        mean = values.mean()
+        delta = mean - self._mean
+
+        self._m2 += np.sum((values - mean) ** 2) + delta ** 2 * self._count * values.size / count
+        self._mean += delta * values.size / count
+        self._count = count
+
+        self._min = min(self._min, values.min())
+        self._max = max(self._max, values.max())
+
+
+class EvaluationHistory(object):
+    """
+    X and Y of a method backed by a History.
+
+    The class is mixed into the methods. Assigning X or Y replaces the history,
+    and the loops append the new evaluations with history.append_X / history.append_Y.
+    """
+
+    @property
+    def history(self):
+        history = self.__dict__.get('_history')
+
+        if history is None:
+            history = self.__dict__['_history'] = History()
+
+        return history
+
+    @property
+    def X(self):
+        return self.history.X
+
+    @X.setter
+    def X(self, X):
+        self.history.set_X(X)
+
+    @property
+    def Y(self):
+        return self.history.Y
+
+    @Y.setter
+    def Y(self, Y):
+        self.history.set_Y(Y)
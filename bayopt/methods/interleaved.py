@@ -0,0 +1,203 @@
+from GPyOpt.optimization.acquisition_optimizer import AcquisitionOptimizer
+from GPyOpt.experiment_design import initial_design
+from GPyOpt.util.arguments_manager import ArgumentsManager
+from bayopt.models.gpmodel import update_model
+from bayopt.methods.rembo import REMBO
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+
+def _propose(model, space, acquisition_type, acquisition_optimizer_type, seed):
+    """
+    Returns the minimizer of the acquisition of a fitted model and its value.
+    The random state of the calling process is left untouched, so that the result does not depend on the process.
+    """
+    state = np.random.get_state()
+    np.random.seed(seed)
+
+    try:
+        acquisition = ArgumentsManager(kwargs=dict()).acquisition_creator(
+            acquisition_type=acquisition_type, model=model, space=space,
+            acquisition_optimizer=AcquisitionOptimizer(space=space, optimizer=acquisition_optimizer_type),
+            cost_withGradients=None
+        )
+        x, fx = acquisition.optimize()
+    finally:
+        np.random.set_state(state)
+
+    return space.zip_inputs(x), float(np.min(fx))
+
+
+class InterleavedREMBO(REMBO):
+    """
+    REMBO on num_embeddings random embeddings (interleaved REMBO of Wang et al. 2016), each with its own GP
+    on the evaluations proposed through it, so that one bad embedding does not spoil the run.
+
+    The acquisitions of the embeddings are optimized in parallel by acquisition_workers worker processes,
+    and the proposal with the lowest acquisition value is evaluated. Y is normalized over all the evaluations,
+    so that the acquisition values of the embeddings are on one scale. Only the GP of the embedding with new
+    evaluations is refitted, the others get the renormalized Y with their hyperparameters kept.
+    initial_design_numdata points are drawn for every embedding, and they count towards max_iter.
+
+    Args:
+        num_embeddings (int): number of random embeddings (k of Wang et al.).
+        acquisition_workers (int | None): number of worker processes optimizing the acquisitions
+            (default is num_embeddings, 1 optimizes them in the main process).
+
+        The other arguments are those of REMBO.
+
+    Attributes:
+        models (list): GP of every embedding.
+        assignment (ndarray): embedding of every row of X.
+        current_embedding (int): embedding of the last proposal.
+    """
+
+    def __init__(self, f, domain=None, num_embeddings=2, acquisition_workers=None, **kwargs):
+        if num_embeddings < 1:
+            raise ValueError('num_embeddings has to be positive')
+
+        if kwargs.get('X') is not None:
+            raise NotImplementedError('param X is not implemented')
+
+        if kwargs.get('evaluator_type', 'sequential') != 'sequential':
+            raise NotImplementedError('evaluator_type has to be sequential')
+
+        if kwargs.get('de_duplication', False):
+            raise NotImplementedError('de_duplication is not implemented')
+
+        self.num_embeddings = num_embeddings
+        self.acquisition_workers = num_embeddings if acquisition_workers is None else acquisition_workers
+        self.models = None
+        self.assignment = None
+        self.current_embedding = 0
+        self._pool = None
+
+        super().__init__(f=f, domain=domain, **kwargs)
+
+    def map_to_original_space(self, x, assignment=None):
+        """
+        Maps the rows of x from the subspace to the domain through the embeddings of assignment,
+        or through the embedding of the last proposal when assignment is None.
+        """
+        if assignment is None:
+            assignment = np.full(x.shape[0], self.current_embedding)
+
+        if x.ndim != 2 or x.shape[1] != self.subspace_dim_size:
+            raise ValueError('x.shape is not correct ' + str(x.shape))
+
+        z = np.empty((x.shape[0], self.embedding.dimensionality))
+        for i, embedding in enumerate(self.embeddings):
+            rows = assignment == i
+            if np.any(rows):
+                z[rows] = embedding.map(x[rows])
+
+        return self._lower + (z + 1) * self._scale
+
+    def run_optimization(self, *args, **kwargs):
+        try:
+            super().run_optimization(*args, **kwargs)
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+    def next_point(self):
+        # --- the last batch only takes the evaluations left in the budget
+        suggested_sample = self._compute_next_evaluations()
+        self.suggested_sample = suggested_sample[:int(min(len(suggested_sample), self.max_iter - self.num_acquisitions))]
+
+        # --- Augment X
+        self.history.append_X(self.suggested_sample)
+        self.assignment = np.append(self.assignment, self.current_embedding)
+
+        # --- Evaluate *f* in X, augment Y and update cost function (if needed)
+        self.evaluate_objective()
+
+    def update(self):
+        self._update_model(self.normalization_type)
+
+    def _set_initial_values(self):
+        if self.X is None:
+            self.assignment = np.repeat(np.arange(self.num_embeddings), self.initial_design_numdata)
+            self.X = initial_design(self.initial_design_type, self.subspace, self.assignment.size)
+            self.Y, _ = self.objective.evaluate(self.map_to_original_space(x=self.X, assignment=self.assignment))
+
+        super()._set_initial_values()
+
+    def _num_initial_samples(self):
+        return self.num_embeddings * self.initial_design_numdata
+
+    def _changed_embeddings(self):
+        """
+        Returns the embeddings with evaluations which are not in their models yet.
+        """
+        if self.models is None:
+            return set(range(self.num_embeddings))
+
+        return set(self.assignment[self.X_inmodel.shape[0]:].tolist())
+
+    def _update_model(self, normalization_type='stats'):
+        if self.models is None or self.num_acquisitions % self.model_update_interval == 0:
+            X_inmodel, Y_inmodel = self._input_data(normalization_type=normalization_type)
+            changed = self._changed_embeddings()
+            models = list()
+
+            for i in range(self.num_embeddings):
+                rows = self.assignment == i
+
+                with self.timer.phase('model'):
+                    if self.models is not None and (self.model_type == 'sparseGP' or i not in changed):
+                        model = self.models[i]
+                    else:
+                        model = self._arguments_mng.model_creator(
+                            model_type=self.model_type, exact_feval=self.exact_feval, space=self.subspace)
+
+                # --- the models of the other embeddings only get the renormalized Y, their hyperparameters are kept
+                update_model(model=model, X_all=X_inmodel[rows], Y_all=Y_inmodel[rows], timer=self.timer,
+                             max_iters=None if i in changed else 0)
+                models.append(model)
+
+            self.models = models
+            self.model = models[self.current_embedding]
+            self.X_inmodel = X_inmodel
+            self.Y_inmodel = Y_inmodel
+
+        # Save parameters of the model
+        self._save_model_parameter_values()
+
+    def _compute_next_evaluations(self, pending_zipped_X=None, ignored_zipped_X=None):
+        seeds = np.random.randint(2 ** 31 - 1, size=self.num_embeddings)
+        args = (self.models, [self.subspace] * self.num_embeddings,
+                [self.acquisition_type] * self.num_embeddings,
+                [self.acquisition_optimizer_type] * self.num_embeddings, seeds)
+
+        with self.timer.phase('acquisition'):
+            if self.acquisition_workers == 1:
+                proposals = list(map(_propose, *args))
+            else:
+                proposals = list(self._get_pool().map(_propose, *args))
+
+        self.current_embedding = int(np.argmin([value for _, value in proposals]))
+        self.model = self.models[self.current_embedding]
+
+        return proposals[self.current_embedding][0]
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.acquisition_workers)
+        return self._pool
+
+    def _checkpoint_state(self):
+        state = super()._checkpoint_state()
+        state['assignment'] = self.assignment
+        return state
+
+    def _restore_checkpoint_state(self, state):
+        self._restore_embeddings(state)
+        self.assignment = np.asarray(state['assignment'], dtype=int)
+        self.models = None
+
+    def _experiment_info(self):
+        return {'dim': len(self.original_domain),
+                'method': 'InterleavedREMBO_' + str(self.subspace_dim_size) + 'x' + str(self.num_embeddings),
+                'subspace_dim': self.subspace_dim_size}
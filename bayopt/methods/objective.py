@@ -0,0 +1,102 @@
+from GPyOpt.core.task.objective import SingleObjective
+from bayopt.clock.stopwatch import StopWatch
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import time
+
+_worker_func = None
+
+
+def _init_worker(func):
+    global _worker_func
+    _worker_func = func
+
+
+def _evaluate_point(x):
+    start = time.time()
+    f_eval = _worker_func(np.atleast_2d(x))
+    return np.atleast_2d(f_eval), time.time() - start
+
+
+class NegatedFunction(object):
+    """
+    Picklable negation of an objective function for maximization problems.
+    """
+
+    def __init__(self, func):
+        self.func = func
+
+    def __call__(self, x):
+        return -self.func(x)
+
+
+class PoolObjective(SingleObjective):
+    """
+    Objective which evaluates the points of a batch concurrently through a process pool
+    and logs the wall time of every evaluated batch to batch_log (a StreamLogger set by the method, or None).
+    Single points can also be submitted to the pool and collected when they finish, their times are logged
+    on collection.
+
+    Args:
+        func (function): objective function (picklable for num_cores > 1).
+        num_cores (int): number of worker processes.
+        objective_name (string): name of the objective function.
+    """
+
+    def __init__(self, func, num_cores=1, objective_name='no_name'):
+        super().__init__(func, num_cores=num_cores, objective_name=objective_name)
+        self.batch_log = None
+        self._pool = None
+
+    def evaluate(self, x):
+        stopwatch = StopWatch()
+
+        if self.n_procs == 1 or x.shape[0] == 1:
+            f_evals, cost_evals = self._eval_func(x)
+        else:
+            f_evals, cost_evals = self._pool_evaluation(x)
+
+        if x.shape[0] > 1:
+            self._log_batch_time(stopwatch.passed_time())
+        return f_evals, cost_evals
+
+    def submit(self, x):
+        """
+        Starts the evaluation of a single point in a worker and returns its future.
+        """
+        return self._get_pool().submit(_evaluate_point, np.atleast_2d(x)[0])
+
+    def collect(self, future):
+        """
+        Returns the value and the cost of a submitted evaluation, logging its time.
+        """
+        f_eval, cost_eval = future.result()
+        self._log_batch_time(cost_eval)
+        return f_eval, [cost_eval]
+
+    def _log_batch_time(self, batch_time):
+        if self.batch_log is not None:
+            self.batch_log.append([self.batch_log.num_rows + 1, batch_time])
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.n_procs, initializer=_init_worker,
+                                             initargs=(self.func,))
+        return self._pool
+
+    def _pool_evaluation(self, x):
+        results = list(self._get_pool().map(_evaluate_point, list(x)))
+
+        f_evals = np.vstack([f_eval for f_eval, _ in results])
+        cost_evals = [cost_eval for _, cost_eval in results]
+        return f_evals, cost_evals
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_pool'] = None
+        return state
@@ -1,23 +1,31 @@
 from GPyOpt.core.bo import BO
 from GPyOpt.core.task.cost import CostModel
-from GPyOpt.core.task.objective import SingleObjective
 from GPyOpt.models.gpmodel import GPModel
 from GPyOpt.optimization.acquisition_optimizer import AcquisitionOptimizer
 from GPyOpt.optimization.acquisition_optimizer import ContextManager
 from GPyOpt.experiment_design import initial_design
-from GPyOpt.util.general import normalize
 from GPyOpt.util.duplicate_manager import DuplicateManager
-from GPyOpt.util.arguments_manager import ArgumentsManager
+from GPyOpt.core.evaluators import Sequential
 from bayopt.space.space import initialize_space
+from bayopt.space.space import unzip_inputs
+from bayopt.space.embedding import EMBEDDING_TYPES
+from bayopt.space.embedding import create_embedding
+from bayopt.models.gpmodel import ArgumentsManagerExt
+from bayopt.models.gpmodel import update_model
+from bayopt.methods.objective import PoolObjective
+from bayopt.methods.objective import NegatedFunction
+from bayopt.methods.asynchronous import AsynchronousOptimization
+from bayopt.methods.checkpoint import Checkpointing
+from bayopt.methods.streamlog import StreamLogging
+from bayopt.methods.history import EvaluationHistory
+from bayopt.methods.evaluator.constantliar import ConstantLiar
 from bayopt.clock.stopwatch import StopWatch
-from bayopt.clock.clock import now_str
-from bayopt import definitions
-from bayopt.utils.utils import mkdir_when_not_exist
+from bayopt.clock.timer import PhaseTimer
 from copy import deepcopy
 import numpy as np
 
 
-class REMBO(BO):
+class REMBO(AsynchronousOptimization, Checkpointing, StreamLogging, EvaluationHistory, BO):
     """
 
     Args:
@@ -36,15 +44,35 @@ class REMBO(BO):
         constraints (dict | None):
         space (Design_space):
         model (BOModel):
+        model_type (string): GP, or sparseGP for long runs, which keeps its inducing inputs between the updates
+        num_inducing (int): maximum number of inducing inputs of a sparseGP model
         acquisition (AcquisitionBase):
         cost (CostModel):
+        timer (PhaseTimer): time spent per iteration in model construction, hyperparameter optimization,
+            acquisition optimization and objective evaluation
+        evaluator_type (string): sequential, or local_penalization / constant_liar for batch_size > 1.
+            The points of a batch are evaluated concurrently by batch_size worker processes.
+            asynchronous keeps batch_size evaluations in flight and proposes a new point whenever one finishes
+        checkpoint_dir (string | None): directory of the periodic checkpoints of the run (None disables them)
+        checkpoint_interval (int): number of evaluations between two checkpoints
+        resume_from (string | None): directory of a checkpoint from which the run is resumed
+        stream_log (bool): append the evaluations to evaluation.stream in the storage directory while the run goes on
+        stream_buffer_size (int): number of rows of a stream written at once
+        embedding_type (string): random embedding of the subspace, one of bayopt.space.embedding.EMBEDDING_TYPES.
+            gaussian is the dense matrix of REMBO, count_sketch (HeSBO) and block take O(dimensionality) memory
+        embeddings (list): the num_embeddings embeddings of the subspace into [-1, 1]^dimensionality,
+            which is scaled to the domain
     """
 
+    num_embeddings = 1
+
     def __init__(self, f, domain=None, constraints=None, cost_withGradients=None, X=None,
                  Y=None, subspace_dim_size=0,
                  model_type='GP', initial_design_numdata=1, initial_design_type='random', acquisition_type='LCB',
                  normalize_Y=True, exact_feval=False, acquisition_optimizer_type='lbfgs', model_update_interval=1,
-                 evaluator_type='sequential', batch_size=1, maximize=False, de_duplication=False):
+                 evaluator_type='sequential', batch_size=1, maximize=False, de_duplication=False,
+                 checkpoint_dir=None, checkpoint_interval=1, resume_from=None,
+                 stream_log=False, stream_buffer_size=64, embedding_type='gaussian', num_inducing=100):
 
         if model_type == 'input_warped_GP':
             raise NotImplementedError('input_warped_GP model is not implemented')
@@ -52,8 +80,15 @@ class REMBO(BO):
         if acquisition_type in ['EI_MCMC', 'MPI_MCMC', 'LCB_MCMC']:
             raise NotImplementedError('MCMC is not implemented')
 
-        if batch_size is not 1 or evaluator_type is not 'sequential':
-            raise NotImplementedError('only sequential evaluation is implemented')
+        if evaluator_type not in ['sequential', 'local_penalization', 'constant_liar', 'asynchronous']:
+            raise NotImplementedError(
+                'evaluator_type has to be sequential, local_penalization, constant_liar or asynchronous')
+
+        if batch_size != 1 and evaluator_type == 'sequential':
+            raise ValueError('sequential evaluation requires batch_size = 1')
+
+        if embedding_type not in EMBEDDING_TYPES:
+            raise ValueError('embedding_type has to be one of ' + ', '.join(EMBEDDING_TYPES))
 
         if cost_withGradients is not None:
             raise NotImplementedError('param cost is not implemented')
@@ -62,21 +97,22 @@ class REMBO(BO):
             raise NotImplementedError('param constraints is not implemented')
 
         # private field
-        self._arguments_mng = ArgumentsManager(kwargs=dict())
+        self._arguments_mng = ArgumentsManagerExt(kwargs={'num_inducing': num_inducing})
 
         self.subspace_dim_size = subspace_dim_size
         self.cost_withGradients = cost_withGradients
         self.initial_design_numdata = initial_design_numdata
         self.initial_design_type = initial_design_type
         self.model_type = model_type
+        self.num_inducing = num_inducing
         self.acquisition_type = acquisition_type
         self.evaluator_type = evaluator_type
         self.model_update_interval = model_update_interval
         self.maximize = maximize
         self.normalize_Y = normalize_Y
         self.de_duplication = de_duplication
-        self.subspace_dim_size = subspace_dim_size
         self.original_domain = domain
+        self.embedding_type = embedding_type
 
         # --- property injected in other methods.
         self.verbosity = False
@@ -92,15 +128,21 @@ class REMBO(BO):
         # --- unnecessary property
         self.suggested_sample = None
         self.Y_new = None
+        self.timer = PhaseTimer()
 
         # --- BO class property in uncertain use
-        self.num_cores = 1
+        self.num_cores = batch_size
 
-        self.objective = SingleObjective(self._sign(f), batch_size, f.get_function_name())
+        self.objective = PoolObjective(self._sign(f), batch_size, f.get_function_name())
         self.cost = CostModel(cost_withGradients=cost_withGradients)
 
         self.space = initialize_space(domain=domain, constraints=constraints)
-        self.embedding_matrix = np.random.normal(size=(self.dimensionality, subspace_dim_size))
+        self.embeddings = [create_embedding(embedding_type=embedding_type, dimensionality=self.dimensionality,
+                                            subspace_dim=subspace_dim_size) for _ in range(self.num_embeddings)]
+
+        bounds = np.asarray(self.space.get_bounds(), dtype=float)
+        self._lower = bounds[:, 0]
+        self._scale = (bounds[:, 1] - bounds[:, 0]) / 2
 
         subspace_domain = self.choose_subspace_domain(subspace_dim_size=subspace_dim_size)
 
@@ -115,11 +157,11 @@ class REMBO(BO):
             cost_withGradients=self.cost_withGradients
         )
 
-        self.evaluator = self._arguments_mng.evaluator_creator(
-            evaluator_type=self.evaluator_type, acquisition=self.acquisition,
-            batch_size=self.batch_size, model_type=self.model_type, model=self.model,
-            space=self.space, acquisition_optimizer=self.acquisition_optimizer
-        )
+        self._choose_evaluator()
+
+        self._init_stream_log(stream_log=stream_log, stream_buffer_size=stream_buffer_size)
+        X, Y = self._init_checkpoint(X=X, Y=Y, checkpoint_dir=checkpoint_dir,
+                                     checkpoint_interval=checkpoint_interval, resume_from=resume_from)
 
         self.X = X
         self.Y = Y
@@ -143,6 +185,10 @@ class REMBO(BO):
     def dimensionality(self):
         return self.space.objective_dimensionality
 
+    @property
+    def embedding(self):
+        return self.embeddings[0]
+
     @property
     def subspace_domain(self):
         return self.subspace.config_space
@@ -183,6 +229,18 @@ class REMBO(BO):
     def objective_name(self):
         return self.objective.objective_name
 
+    def _choose_evaluator(self):
+        if self.evaluator_type == 'constant_liar':
+            self.evaluator = ConstantLiar(acquisition=self.acquisition, batch_size=self.batch_size)
+        elif self.evaluator_type == 'asynchronous':
+            self.evaluator = Sequential(acquisition=self.acquisition)
+        else:
+            self.evaluator = self._arguments_mng.evaluator_creator(
+                evaluator_type=self.evaluator_type, acquisition=self.acquisition,
+                batch_size=self.batch_size, model_type=self.model_type, model=self.model,
+                space=self.subspace, acquisition_optimizer=self.acquisition_optimizer
+            )
+
     def choose_subspace_domain(self, subspace_dim_size):
         subspace_domain = list()
 
@@ -190,17 +248,19 @@ class REMBO(BO):
             subspace_domain.append({
                 'name': 'x' + str(i),
                 'type': 'continuous',
-                'domain': (-np.sqrt(self.dimensionality), np.sqrt(self.dimensionality)),
+                'domain': (-self.embedding.bound, self.embedding.bound),
                 'dimensionality': 1
             })
         return subspace_domain
 
     def map_to_original_space(self, x):
-        if x.shape != (1, self.subspace_dim_size):
+        """
+        Maps the rows of x from the subspace to the domain, clipping them into its bounds.
+        """
+        if x.ndim != 2 or x.shape[1] != self.subspace_dim_size:
             raise ValueError('x.shape is not correct ' + str(x.shape))
 
-        x = np.array([np.dot(self.embedding_matrix, el) for el in x])
-        return x
+        return self._lower + (self.embedding.map(x) + 1) * self._scale
 
     def run_optimization(self, max_iter=0, max_time=np.inf, eps=1e-8, context=None,
                          verbosity=False, save_models_parameters=True, report_file=None,
@@ -241,12 +301,24 @@ class REMBO(BO):
 
         # --- Initialize iterations and running time
         stopwatch = StopWatch()
-        self.num_acquisitions = self.initial_design_numdata
+        self.timer.reset()
+        self.num_acquisitions = self._num_initial_samples()
         self.suggested_sample = self.X
         self.Y_new = self.Y
+        self._prepare_checkpoint()
         self._compute_results()
+        self._open_stream_log()
 
-        self._run_optimization()
+        try:
+            if self.evaluator_type == 'asynchronous':
+                self._run_asynchronous_optimization()
+            else:
+                self._run_optimization()
+        finally:
+            self.objective.close()
+            self._close_stream_log()
+
+        self._checkpoint(force=True)
 
         self.cum_time = stopwatch.passed_time()
 
@@ -281,13 +353,18 @@ class REMBO(BO):
             self.next_point()
 
             # --- Update current evaluation time and function evaluations
-            self.num_acquisitions += 1
+            self.num_acquisitions += self.suggested_sample.shape[0]
+            self._checkpoint()
+            self._log_evaluations()
+            self.timer.next_iteration(iteration=self.X.shape[0])
 
     def next_point(self):
-        self.suggested_sample = self._compute_next_evaluations()
+        # --- the last batch only takes the evaluations left in the budget
+        suggested_sample = self._compute_next_evaluations()
+        self.suggested_sample = suggested_sample[:int(min(len(suggested_sample), self.max_iter - self.num_acquisitions))]
 
         # --- Augment X
-        self.X = np.vstack((self.X, self.suggested_sample))
+        self.history.append_X(self.suggested_sample)
 
         # --- Evaluate *f* in X, augment Y and update cost function (if needed)
         self.evaluate_objective()
@@ -297,9 +374,35 @@ class REMBO(BO):
         Evaluates the objective
         """
         original_suggested_sample = self.map_to_original_space(x=self.suggested_sample)
-        self.Y_new, cost_new = self.objective.evaluate(original_suggested_sample)
+
+        with self.timer.phase('evaluation'):
+            self.Y_new, cost_new = self.objective.evaluate(original_suggested_sample)
+
         self.cost.update_cost_model(self.suggested_sample, cost_new)
-        self.Y = np.vstack((self.Y, self.Y_new))
+        self.history.append_Y(self.Y_new)
+
+    def _checkpoint_state(self):
+        state = super()._checkpoint_state()
+        for i, embedding in enumerate(self.embeddings):
+            for key, value in embedding.state().items():
+                state['embedding' + str(i) + '_' + key] = value
+        return state
+
+    def _restore_embeddings(self, state):
+        for i, embedding in enumerate(self.embeddings):
+            prefix = 'embedding' + str(i) + '_'
+            embedding.restore({key[len(prefix):]: value for key, value in state.items() if key.startswith(prefix)})
+
+    def _restore_checkpoint_state(self, state):
+        self._restore_embeddings(state)
+        self.model = self._arguments_mng.model_creator(
+            model_type=self.model_type, exact_feval=self.exact_feval, space=self.subspace)
+
+        X_inmodel, Y_inmodel = self._input_data(normalization_type=self.normalization_type)
+        self._restore_model(X_inmodel=X_inmodel, Y_inmodel=Y_inmodel, hyperparameters=state.get('hyperparameters'))
+
+    def _objective_input(self, suggested_sample):
+        return self.map_to_original_space(x=suggested_sample)
 
     def get_best_point(self):
         self._compute_results()
@@ -307,14 +410,14 @@ class REMBO(BO):
 
     def update(self):
         self._update_model(self.normalization_type)
-        self._update_acquisition()
-        self._update_evaluator()
+
+        with self.timer.phase('acquisition'):
+            self._update_acquisition()
+            self._update_evaluator()
 
     def _sign(self, f):
         if self.maximize:
-            f_copy = f
-
-            def f(x): return -f_copy(x)
+            return NegatedFunction(f)
         return f
 
     def _set_initial_values(self):
@@ -331,6 +434,9 @@ class REMBO(BO):
         else:
             self.initial_Y = deepcopy(self.Y)
 
+    def _num_initial_samples(self):
+        return self.initial_design_numdata
+
     def _update_acquisition(self):
         self.acquisition = self._arguments_mng.acquisition_creator(
             acquisition_type=self.acquisition_type, model=self.model, space=self.subspace,
@@ -339,17 +445,23 @@ class REMBO(BO):
         )
 
     def _update_evaluator(self):
-        self.evaluator.acquisition = self.acquisition
+        if self.evaluator_type == 'local_penalization' and self.batch_size > 1:
+            # --- the penalized acquisition wraps the current model
+            self._choose_evaluator()
+        else:
+            self.evaluator.acquisition = self.acquisition
 
     def _update_model(self, normalization_type='stats'):
         if self.num_acquisitions % self.model_update_interval == 0:
 
-            self.model = self._arguments_mng.model_creator(
-                model_type=self.model_type, exact_feval=self.exact_feval, space=self.subspace)
-
-            X_inmodel, Y_inmodel = self._input_data(normalization_type=normalization_type)
+            with self.timer.phase('model'):
+                # --- a sparse GP is kept with its inducing inputs, the subspace never changes
+                if self.model_type != 'sparseGP' or self.model.model is None:
+                    self.model = self._arguments_mng.model_creator(
+                        model_type=self.model_type, exact_feval=self.exact_feval, space=self.subspace)
+                X_inmodel, Y_inmodel = self._input_data(normalization_type=normalization_type)
 
-            self.model.updateModel(X_inmodel, Y_inmodel, None, None)
+            update_model(model=self.model, X_all=X_inmodel, Y_all=Y_inmodel, timer=self.timer)
             self.X_inmodel = X_inmodel
             self.Y_inmodel = Y_inmodel
 
@@ -358,11 +470,11 @@ class REMBO(BO):
 
     def _input_data(self, normalization_type):
         # input that goes into the model (is unziped in case there are categorical variables)
-        X_inmodel = self.subspace.unzip_inputs(self.X)
+        X_inmodel = unzip_inputs(self.subspace, self.X)
 
         # Y_inmodel is the output that goes into the model
         if self.normalize_Y:
-            Y_inmodel = normalize(self.Y, normalization_type)
+            Y_inmodel = self.history.normalized_Y(normalization_type)
         else:
             Y_inmodel = self.Y
 
@@ -372,8 +484,8 @@ class REMBO(BO):
         # --- Update the context if any
         self.acquisition.optimizer.context_manager = ContextManager(self.subspace, self.context)
 
-        # --- Activate de_duplication
-        if self.de_duplication:
+        # --- Activate de_duplication, always for points which are still being evaluated
+        if self.de_duplication or pending_zipped_X is not None:
             duplicate_manager = DuplicateManager(
                 space=self.subspace, zipped_X=self.X, pending_zipped_X=pending_zipped_X,
                 ignored_zipped_X=ignored_zipped_X)
@@ -381,22 +493,43 @@ class REMBO(BO):
             duplicate_manager = None
 
         # We zip the value in case there are categorical variables
-        suggested_ = self.subspace.zip_inputs(self.evaluator.compute_batch(
-            duplicate_manager=duplicate_manager,
-            context_manager=self.acquisition.optimizer.context_manager))
+        with self.timer.phase('acquisition'):
+            suggested_ = self.subspace.zip_inputs(self.evaluator.compute_batch(
+                duplicate_manager=duplicate_manager,
+                context_manager=self.acquisition.optimizer.context_manager))
 
         return suggested_
 
-    def _save(self):
-        mkdir_when_not_exist(abs_path=definitions.ROOT_DIR + '/storage/' + self.objective_name)
+    def _experiment_info(self):
+        return {'dim': len(self.original_domain), 'method': 'REMBO_' + str(self.subspace_dim_size),
+                'subspace_dim': self.subspace_dim_size}
+
+    def _open_stream_log(self):
+        super()._open_stream_log()
+
+        # --- the times of the batches are always streamed to batch_time.stream
+        if self.batch_size > 1:
+            self.objective.batch_log = self._stream_logger(file_name='batch_time.stream', columns=['Batch', 'Time'])
+
+    def _stream_loggers(self):
+        return super()._stream_loggers() + [self.objective.batch_log]
 
-        dir_name = definitions.ROOT_DIR + '/storage/' + self.objective_name + '/' + now_str() + ' ' + str(
-            len(self.original_domain)) + 'D REMBO_' + str(self.subspace_dim_size)
-        mkdir_when_not_exist(abs_path=dir_name)
+    def _close_stream_log(self):
+        super()._close_stream_log()
+        self.objective.batch_log = None
+
+    def _save(self):
+        dir_name = self._storage_dir()
 
         self.save_report(report_file=dir_name + '/report.txt')
         self.save_evaluations(evaluations_file=dir_name + '/evaluation.csv')
         self.save_models(models_file=dir_name + '/model.csv')
+        self.save_timings(timings_file=dir_name + '/timing.csv')
+
+        self._register_experiment()
+
+    def save_timings(self, timings_file):
+        self._write_csv(timings_file, self.timer.table())
 
     def save_report(self, report_file=None):
         with open(report_file, 'w') as file:
@@ -410,14 +543,16 @@ class REMBO(BO):
             if self.num_acquisitions == self.max_iter:
                 file.write('Optimization completed:      ' + 'YES, ' + str(self.X.shape[0]).strip(
                     '[]') + ' samples collected.\n')
-                file.write('Number initial samples:      ' + str(self.initial_design_numdata) + ' \n')
+                file.write('Number initial samples:      ' + str(self._num_initial_samples()) + ' \n')
             else:
                 file.write('Optimization completed:      ' + 'NO,' + str(self.X.shape[0]).strip(
                     '[]') + ' samples collected.\n')
-                file.write('Number initial samples:      ' + str(self.initial_design_numdata) + ' \n')
+                file.write('Number initial samples:      ' + str(self._num_initial_samples()) + ' \n')
 
             file.write('Tolerance:                   ' + str(self.eps) + '.\n')
             file.write('Optimization time:           ' + str(self.cum_time).strip('[]') + ' seconds.\n')
+            for phase, phase_time in self.timer.totals().items():
+                file.write(('  ' + phase + ' time:').ljust(29) + str(phase_time) + ' seconds.\n')
 
             file.write('\n')
             file.write(
@@ -431,12 +566,16 @@ class REMBO(BO):
             file.write('Cost used:                   ' + self.cost.cost_type + '\n')
             file.write('Constraints:                 ' + str(self.constraints == True) + '\n')
             file.write('Subspace Dimension:          ' + str(self.subspace_dim_size) + '\n')
+            file.write('Embedding type:              ' + str(self.embedding_type) + '\n')
+            file.write('Number of embeddings:        ' + str(self.num_embeddings) + '\n')
 
             file.write('\n')
             file.write(
                 '------------------------------' + ' Optimization set up ' + '---------------------------------\n')
             file.write('Normalized outputs:          ' + str(self.normalize_Y) + '\n')
             file.write('Model type:                  ' + str(self.model_type).strip('[]') + '\n')
+            if self.model_type == 'sparseGP':
+                file.write('Inducing points:             ' + str(self.num_inducing) + '\n')
             file.write('Model update interval:       ' + str(self.model_update_interval) + '\n')
             file.write('Acquisition type:            ' + str(self.acquisition_type).strip('[]') + '\n')
             file.write(
@@ -2,11 +2,8 @@ from bayopt.methods.dropout import Dropout
 from igo.igo.optimizer.igo import BernoulliIGO
 from igo.igo.util.weight import SelectionNonIncFunc
 from igo.igo.util.weight import QuantileBasedWeight
-from bayopt.space.space import get_subspace
-from bayopt.utils.utils import mkdir_when_not_exist
-from bayopt.clock.clock import now_str
-from bayopt import definitions
 from bayopt.methods.evaluator.sequentialext import SequentialExt
+from bayopt.methods.evaluator.constantliar import ConstantLiarExt
 import numpy as np
 
 
@@ -15,7 +12,11 @@ class SelectBase(Dropout):
     def __init__(self, fill_in_strategy, f, mix=0.5, domain=None, constraints=None, cost_withGradients=None, X=None, Y=None,
                  model_type='GP', initial_design_numdata=2, initial_design_type='random', acquisition_type='LCB',
                  normalize_Y=True, exact_feval=False, acquisition_optimizer_type='lbfgs', model_update_interval=1,
-                 evaluator_type='sequential', batch_size=1, maximize=False, de_duplication=False, sample_num=2, eta=None):
+                 evaluator_type='sequential', batch_size=1, maximize=False, de_duplication=False, sample_num=2, eta=None,
+                 incremental_model=False, model_optimize_interval=10, model_likelihood_drift=0.1,
+                 subspace_cache_size=0, subspace_cache_memory=None, checkpoint_dir=None, checkpoint_interval=1,
+                 resume_from=None, stream_log=False, stream_buffer_size=64, ard=False, warm_start=False,
+                 warm_start_max_iters=100, num_inducing=100):
 
         if initial_design_numdata is not sample_num:
             raise ValueError('initial_design_numdata != sample_num')
@@ -23,13 +24,22 @@ class SelectBase(Dropout):
         if model_update_interval is not 1:
             raise ValueError('model_update_interval != 1')
 
+        if evaluator_type in ['local_penalization', 'asynchronous']:
+            raise NotImplementedError(evaluator_type + ' is not implemented')
+
         super().__init__(fill_in_strategy=fill_in_strategy, f=f, mix=mix, domain=domain, constraints=constraints,
                          cost_withGradients=cost_withGradients, X=X, Y=Y, subspace_dim_size=None, model_type=model_type,
                          initial_design_numdata=initial_design_numdata, initial_design_type=initial_design_type,
                          acquisition_type=acquisition_type, normalize_Y=normalize_Y, exact_feval=exact_feval,
                          acquisition_optimizer_type=acquisition_optimizer_type,
                          model_update_interval=model_update_interval, evaluator_type=evaluator_type,
-                         batch_size=batch_size, maximize=maximize, de_duplication=de_duplication)
+                         batch_size=batch_size, maximize=maximize, de_duplication=de_duplication,
+                         incremental_model=incremental_model, model_optimize_interval=model_optimize_interval,
+                         model_likelihood_drift=model_likelihood_drift, subspace_cache_size=subspace_cache_size,
+                         subspace_cache_memory=subspace_cache_memory, checkpoint_dir=checkpoint_dir,
+                         checkpoint_interval=checkpoint_interval, resume_from=resume_from, stream_log=stream_log,
+                         stream_buffer_size=stream_buffer_size, ard=ard, warm_start=warm_start,
+                         warm_start_max_iters=warm_start_max_iters, num_inducing=num_inducing)
 
         self.sample_num = sample_num
         self.bernoulli_theta = list()
@@ -37,6 +47,8 @@ class SelectBase(Dropout):
         self.evals = list()
 
         self.log_masks = list()
+        self.mask_log = None
+        self.distribution_log = None
 
         self.sample_index = None
         self.acq_max = None
@@ -48,7 +60,10 @@ class SelectBase(Dropout):
         self.bernoulli_igo = BernoulliIGO(d=self.dimensionality, weight_func=w, eta=eta)
 
     def _choose_evaluator(self):
-        self.evaluator = SequentialExt(self.acquisition)
+        if self.evaluator_type == 'constant_liar':
+            self.evaluator = ConstantLiarExt(acquisition=self.acquisition, batch_size=self.batch_size)
+        else:
+            self.evaluator = SequentialExt(self.acquisition)
 
     def update_subspace(self):
         while True:
@@ -57,10 +72,10 @@ class SelectBase(Dropout):
 
             if len(self.subspace_idx) is not 0:
                 self.masks.append(mask)
-                self.log_masks.append(mask)
+                self._log_mask(mask)
                 break
 
-        self.subspace = get_subspace(space=self.space, subspace_idx=self.subspace_idx)
+        self.subspace = self._get_subspace(subspace_idx=self.subspace_idx)
 
     def _update_distribution(self):
         if len(self.masks) is not self.sample_num:
@@ -79,8 +94,31 @@ class SelectBase(Dropout):
     def sample_mask(self):
         return self.bernoulli_igo.model.sampling(lam=1)
 
+    def _log_mask(self, mask):
+        if self.mask_log is not None:
+            self.mask_log.append(mask)
+        else:
+            self.log_masks.append(mask)
+
     def _log_distribution(self):
-        self.bernoulli_theta.append(self.bernoulli_igo.model.log())
+        if self.distribution_log is not None:
+            self.distribution_log.append(self.bernoulli_igo.model.theta)
+        else:
+            self.bernoulli_theta.append(self.bernoulli_igo.model.log())
+
+    def _open_stream_log(self):
+        super()._open_stream_log()
+
+        if not self.stream_log:
+            return
+
+        self.mask_log = self._stream_logger(
+            file_name='mask.stream', columns=['mask' + str(i) for i in range(self.dimensionality)], dtype='bool')
+        self.distribution_log = self._stream_logger(
+            file_name='distribution.stream', columns=self.bernoulli_igo.model.log_header())
+
+    def _stream_loggers(self):
+        return super()._stream_loggers() + [self.mask_log, self.distribution_log]
 
     def _input_data(self, normalization_type):
         X_inmodel, Y_inmodel = super()._input_data(normalization_type=normalization_type)
@@ -112,51 +150,81 @@ class SelectBase(Dropout):
                 self.next_point()
 
                 # --- Update current evaluation time and function evaluations
-                self.num_acquisitions += 1
+                self.num_acquisitions += self.suggested_sample.shape[0]
+                self._log_evaluations()
+                self.timer.next_iteration(iteration=self.X.shape[0])
 
             else:
                 self._update_distribution()
                 self._log_distribution()
+                self._checkpoint()
                 continue
 
             break
 
-    def _save(self):
-        mkdir_when_not_exist(abs_path=definitions.ROOT_DIR + '/storage/' + self.objective_name)
+    def _checkpoint(self, force=False):
+        # --- the distribution is only consistent with the evaluations between two of its updates
+        if force or len(self.masks) == 0:
+            super()._checkpoint(force=force)
 
-        dir_name = definitions.ROOT_DIR + '/storage/' + self.objective_name + '/' + now_str() + ' ' + str(
-            self.dimensionality) + 'D ' + str(self.fill_in_strategy) + '_select'
-        mkdir_when_not_exist(abs_path=dir_name)
+    def _checkpoint_state(self):
+        state = super()._checkpoint_state()
+        state['theta'] = self.bernoulli_igo.model.theta
+        return state
+
+    def _restore_checkpoint_state(self, state):
+        # --- samples of an unfinished update of the distribution are kept as evaluations only
+        self.sample_index = 0
+        self._clear_igo_cache()
+        self.bernoulli_igo.model.theta = state['theta']
+
+        super()._restore_checkpoint_state(state)
+
+    def _experiment_info(self):
+        return {'dim': self.dimensionality, 'method': str(self.fill_in_strategy) + '_select', 'subspace_dim': None}
+
+    def _save(self):
+        dir_name = self._storage_dir()
 
         self.save_report(report_file=dir_name + '/report.txt')
         self.save_evaluations(evaluations_file=dir_name + '/evaluation.csv')
         self.save_models(models_file=dir_name + '/model.csv')
         self.save_distribution(distribution_file=dir_name + '/distribution.csv')
         self.save_mask(mask_file=dir_name + '/mask.csv')
+        self.save_timings(timings_file=dir_name + '/timing.csv')
+
+        self._register_experiment()
 
     def save_distribution(self, distribution_file):
-        self._write_csv(distribution_file, self.bernoulli_theta)
+        # --- a streamed distribution is already in distribution.stream
+        if self.distribution_log is None:
+            self._write_csv(distribution_file, self.bernoulli_theta)
 
     def save_mask(self, mask_file):
-        self._write_csv(mask_file, self.log_masks)
+        # --- streamed masks are already in mask.stream
+        if self.mask_log is None:
+            self._write_csv(mask_file, self.log_masks)
 
     def _compute_next_evaluations(self, pending_zipped_X=None, ignored_zipped_X=None):
         context_manager, duplicate_manager = self._compute_setting(pending_zipped_X=pending_zipped_X,
                                                                    ignored_zipped_X=ignored_zipped_X)
 
-        x, self.acq_max = self.evaluator.compute_batch(duplicate_manager=duplicate_manager, context_manager=context_manager)
+        with self.timer.phase('acquisition'):
+            x, self.acq_max = self.evaluator.compute_batch(duplicate_manager=duplicate_manager,
+                                                           context_manager=context_manager)
 
         # We zip the value in case there are categorical variables
         suggested_ = self.subspace.zip_inputs(x)
 
-        return self._fill_in_dimensions(samples=suggested_)
+        with self.timer.phase('fill_in'):
+            return self._fill_in_dimensions(samples=suggested_)
 
 
 class SelectObjective(SelectBase):
 
     def next_point(self):
         super().next_point()
-        self.evals.append(self.Y_new[0][0])
+        self.evals.append(np.min(self.Y_new))
 
 
 class SelectAcquisition(SelectBase):
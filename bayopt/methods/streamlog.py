@@ -0,0 +1,96 @@
+from bayopt.utils.utils import mkdir_when_not_exist
+from bayopt.utils.stream import StreamLogger
+from bayopt.utils.catalog import Catalog
+from bayopt.plot.store import ExperimentStore
+from bayopt.clock.clock import from_str
+from bayopt.clock.clock import now_str
+from bayopt import definitions
+import datetime
+import numpy as np
+import os
+
+
+class StreamLogging(object):
+    """
+    Storage directory of a run, registered in the catalog of experiments and appended to the store of its function,
+    and the logs streamed into it.
+
+    The evaluations are streamed to evaluation.stream while the run goes on.
+    The class is mixed into the methods, which provide _experiment_info and call _log_evaluations
+    after every evaluation. Methods with further logs extend _open_stream_log / _stream_loggers.
+
+    Args:
+        stream_log (bool): stream the logs of the run instead of keeping them in memory until the end.
+        stream_buffer_size (int): number of rows of a log written at once.
+    """
+
+    def _init_stream_log(self, stream_log=False, stream_buffer_size=64):
+        self.stream_log = stream_log
+        self.stream_buffer_size = stream_buffer_size
+        self.storage_dir = None
+        self.created_at = None
+        self.evaluation_log = None
+
+    def _experiment_info(self):
+        """
+        Returns the dimension, the method name and the subspace dimension (or None) of the experiment.
+        """
+        raise NotImplementedError()
+
+    def _storage_dir_name(self):
+        info = self._experiment_info()
+        return definitions.STORAGE_DIR + '/' + self.objective_name + '/' + self.created_at + ' ' + str(
+            info['dim']) + 'D ' + info['method']
+
+    def _storage_dir(self):
+        if self.storage_dir is None:
+            created_at = from_str(now_str())
+
+            while True:
+                self.created_at = created_at.strftime('%Y-%m-%d %H:%M:%S')
+                self.storage_dir = self._storage_dir_name()
+                mkdir_when_not_exist(abs_path=os.path.dirname(self.storage_dir))
+
+                # --- runs saved in the same second (e.g. in parallel) take the following seconds
+                try:
+                    os.mkdir(self.storage_dir)
+                    break
+                except FileExistsError:
+                    created_at += datetime.timedelta(seconds=1)
+
+        return self.storage_dir
+
+    def _register_experiment(self):
+        Catalog().register(function=self.objective_name, created_at=self.created_at, path=self._storage_dir(),
+                           **self._experiment_info())
+        ExperimentStore(function_name=self.objective_name).append_experiment(self._storage_dir())
+
+    def _open_stream_log(self):
+        self.storage_dir = None
+
+        if not self.stream_log:
+            return
+
+        columns = ['Iteration', 'Y'] + ['var_' + str(k) for k in range(1, self.X.shape[1] + 1)]
+        self.evaluation_log = self._stream_logger(file_name='evaluation.stream', columns=columns)
+        self._log_evaluations()
+
+    def _stream_logger(self, file_name, columns, dtype='float64'):
+        return StreamLogger(file_name=self._storage_dir() + '/' + file_name, columns=columns, dtype=dtype,
+                            buffer_size=self.stream_buffer_size)
+
+    def _log_evaluations(self):
+        if self.evaluation_log is None:
+            return
+
+        n = self.evaluation_log.num_rows
+        iterations = np.arange(n + 1, self.Y.shape[0] + 1)[:, None]
+        self.evaluation_log.extend(np.hstack((iterations, self.Y[n:], self.X[n:])))
+
+    def _stream_loggers(self):
+        return [self.evaluation_log]
+
+    def _close_stream_log(self):
+        for logger in self._stream_loggers():
+            if logger is not None:
+                logger.close()
@@ -0,0 +1,106 @@
+from collections import OrderedDict
+import numpy as np
+
+
+class SubspaceCacheEntry(object):
+
+    def __init__(self, space, model=None):
+        self.space = space
+        self.model = model
+        self.hyperparameters = None
+        self.nbytes = 0
+
+    def refresh(self):
+        if self.model is not None and getattr(self.model, 'model', None) is not None:
+            self.hyperparameters = np.array(self.model.model.param_array, copy=True)
+        self.nbytes = model_nbytes(self.model)
+
+
+class SubspaceCache(object):
+    """
+    LRU cache of fitted models and design spaces keyed by the index set of the subspace.
+
+    Args:
+        capacity (int): maximum number of cached subspaces.
+        max_memory (int | None): maximum number of bytes held by the cached models (None for no limit).
+    """
+
+    def __init__(self, capacity, max_memory=None):
+        if capacity < 1:
+            raise ValueError('capacity has to be positive')
+
+        self.capacity = capacity
+        self.max_memory = max_memory
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, subspace_idx):
+        return self._key(subspace_idx) in self._entries
+
+    @property
+    def nbytes(self):
+        return sum(entry.nbytes for entry in self._entries.values())
+
+    def peek(self, subspace_idx):
+        return self._entries.get(self._key(subspace_idx))
+
+    def get(self, subspace_idx):
+        key = self._key(subspace_idx)
+        entry = self._entries.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, subspace_idx, space, model):
+        key = self._key(subspace_idx)
+        entry = self._entries.get(key)
+
+        if entry is None:
+            entry = SubspaceCacheEntry(space=space)
+            self._entries[key] = entry
+
+        entry.space = space
+        entry.model = model
+        entry.refresh()
+        self._entries.move_to_end(key)
+
+        self._evict()
+        return entry
+
+    def _evict(self):
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+        if self.max_memory is None:
+            return
+
+        # --- the most recent entry is always kept even if it alone exceeds the limit
+        while len(self._entries) > 1 and self.nbytes > self.max_memory:
+            self._entries.popitem(last=False)
+
+    @staticmethod
+    def _key(subspace_idx):
+        return tuple(int(idx) for idx in np.sort(subspace_idx))
+
+
+def model_nbytes(model):
+    gp = getattr(model, 'model', None)
+    if gp is None:
+        return 0
+
+    arrays = [gp.X, gp.Y]
+
+    posterior = getattr(gp, 'posterior', None)
+    if posterior is not None:
+        arrays += [posterior._K, posterior._woodbury_chol, posterior._woodbury_inv, posterior._woodbury_vector]
+
+    return int(sum(np.asarray(array).nbytes for array in arrays if array is not None))
@@ -0,0 +1,220 @@
+from GPyOpt.models.gpmodel import GPModel
+from GPyOpt.util.arguments_manager import ArgumentsManager
+from bayopt.models.inference import IncrementalExactGaussianInference
+from scipy.spatial.distance import cdist
+import numpy as np
+
+
+class IncrementalGPModel(GPModel):
+    """
+    GP model which is updated incrementally while its hyperparameters are kept.
+
+    The posterior is extended by a block Cholesky update when observations are appended to the training data.
+    The hyperparameters are re-optimized every optimize_interval updates or when the log marginal likelihood
+    per observation drifts by more than likelihood_drift from its value at the last optimization.
+
+    Args:
+        optimize_interval (int): number of updates between two hyperparameter optimizations.
+        likelihood_drift (float): tolerance of the log marginal likelihood per observation.
+    """
+
+    def __init__(self, kernel=None, noise_var=None, exact_feval=False, optimizer='lbfgs', max_iters=1000,
+                 optimize_restarts=5, verbose=False, ARD=False, mean_function=None, optimize_interval=10,
+                 likelihood_drift=0.1):
+
+        super().__init__(kernel=kernel, noise_var=noise_var, exact_feval=exact_feval, optimizer=optimizer,
+                         max_iters=max_iters, optimize_restarts=optimize_restarts, sparse=False,
+                         verbose=verbose, ARD=ARD, mean_function=mean_function)
+
+        self.optimize_interval = optimize_interval
+        self.likelihood_drift = likelihood_drift
+
+        self.updates_since_optimization = 0
+        self.reference_likelihood = None
+        self.num_optimizations = 0
+
+    def _create_model(self, X, Y):
+        super()._create_model(X, Y)
+        self.model.inference_method = IncrementalExactGaussianInference()
+
+    def updateModel(self, X_all, Y_all, X_new, Y_new):
+        """
+        Updates the model with new observations.
+        """
+        if self.model is None:
+            self._create_model(X_all, Y_all)
+        else:
+            self.model.set_XY(X_all, Y_all)
+
+        self.updates_since_optimization += 1
+
+        if self.max_iters > 0:
+            self.optimize()
+
+    def optimize(self):
+        if self._requires_optimization():
+            self._optimize()
+
+    def _requires_optimization(self):
+        if self.reference_likelihood is None:
+            return True
+
+        if self.updates_since_optimization >= self.optimize_interval:
+            return True
+
+        return np.abs(self._likelihood_per_datum() - self.reference_likelihood) > self.likelihood_drift
+
+    def _optimize(self):
+        optimize_hyperparameters(self)
+
+        self.reference_likelihood = self._likelihood_per_datum()
+        self.updates_since_optimization = 0
+        self.num_optimizations += 1
+
+    def _likelihood_per_datum(self):
+        return self.model.log_likelihood() / self.model.X.shape[0]
+
+
+class SparseGPModel(GPModel):
+    """
+    Sparse GP on at most num_inducing inducing inputs (GPy SparseGPRegression), whose update costs O(nm^2)
+    for m inducing inputs instead of O(n^3).
+
+    The inducing inputs are kept between updates. The new observations are added to them until there are
+    num_inducing, afterwards a new observation replaces one of the two closest inducing inputs when it is farther
+    from all inducing inputs than they are from each other. Their locations are optimized with the hyperparameters.
+
+    Args:
+        num_inducing (int): maximum number of inducing inputs.
+    """
+
+    def __init__(self, kernel=None, noise_var=None, exact_feval=False, optimizer='lbfgs', max_iters=1000,
+                 optimize_restarts=5, num_inducing=100, verbose=False, ARD=False, mean_function=None):
+
+        super().__init__(kernel=kernel, noise_var=noise_var, exact_feval=exact_feval, optimizer=optimizer,
+                         max_iters=max_iters, optimize_restarts=optimize_restarts, sparse=True,
+                         num_inducing=num_inducing, verbose=verbose, ARD=ARD, mean_function=mean_function)
+
+        self.num_data = 0
+
+    def _create_model(self, X, Y):
+        super()._create_model(X, Y)
+        self.num_data = X.shape[0]
+
+    def updateModel(self, X_all, Y_all, X_new, Y_new):
+        """
+        Updates the model with new observations.
+        """
+        if self.model is None:
+            self._create_model(X_all, Y_all)
+        else:
+            Z = self._inducing_inputs(X_all)
+
+            self.model.update_model(False)
+            if Z.shape[0] == self.model.Z.shape[0]:
+                self.model.Z[:] = Z
+            else:
+                self.model.set_Z(Z, trigger_update=False)
+            self.model.set_XY(X_all, Y_all)
+
+        if self.max_iters > 0:
+            optimize_hyperparameters(self)
+
+    def _inducing_inputs(self, X_all):
+        X_new = X_all[self.num_data:]
+        self.num_data = X_all.shape[0]
+
+        Z = np.array(self.model.Z)
+        num_added = max(0, min(self.num_inducing - Z.shape[0], X_new.shape[0]))
+        Z = np.vstack((Z, X_new[:num_added]))
+
+        for x in X_new[num_added:]:
+            distances = cdist(Z, Z)
+            np.fill_diagonal(distances, np.inf)
+            i, j = np.unravel_index(np.argmin(distances), distances.shape)
+
+            if cdist(x[None, :], Z).min() > distances[i, j]:
+                Z[i] = x
+
+        return Z
+
+    def get_model_parameters(self):
+        """
+        Returns the hyperparameters without the inducing inputs, whose number changes while they are filled up.
+        """
+        return np.atleast_2d(self.model[:][self.model.Z.size:])
+
+    def get_model_parameters_names(self):
+        return self.model.parameter_names_flat().tolist()[self.model.Z.size:]
+
+
+class ArgumentsManagerExt(ArgumentsManager):
+    """
+    ArgumentsManager whose sparseGP models are SparseGPModel with num_inducing inducing inputs (default is 100).
+    """
+
+    def model_creator(self, model_type, exact_feval, space):
+        if model_type != 'sparseGP':
+            return super().model_creator(model_type=model_type, exact_feval=exact_feval, space=space)
+
+        return SparseGPModel(noise_var=self.kwargs.get('noise_var', None), exact_feval=exact_feval,
+                             optimizer=self.kwargs.get('model_optimizer_type', 'lbfgs'),
+                             max_iters=self.kwargs.get('max_iters', 1000),
+                             optimize_restarts=self.kwargs.get('optimize_restarts', 5),
+                             num_inducing=self.kwargs.get('num_inducing', 100),
+                             verbose=self.kwargs.get('verbosity_model', False), ARD=self.kwargs.get('ARD', False))
+
+
+def optimize_hyperparameters(model):
+    """
+    Maximizes the marginal likelihood of the GP of a GPModel as GPModel.updateModel does.
+    """
+    if model.optimize_restarts == 1:
+        model.model.optimize(optimizer=model.optimizer, max_iters=model.max_iters, messages=False,
+                             ipython_notebook=False)
+    else:
+        model.model.optimize_restarts(num_restarts=model.optimize_restarts, optimizer=model.optimizer,
+                                      max_iters=model.max_iters, verbose=model.verbose)
+
+
+def update_model(model, X_all, Y_all, timer, initialize=None, optimize_restarts=None, max_iters=None):
+    """
+    Updates a model with new observations as its updateModel does, timing the construction of the GP ('model')
+    and the optimization of its hyperparameters ('hyperparameters') as separate phases of a PhaseTimer.
+    initialize(gp) is called on a newly created GP before its hyperparameters are optimized.
+    optimize_restarts and max_iters replace those of the model for this update, max_iters=0 keeps the hyperparameters.
+    Models other than GPModel are timed as a whole.
+    """
+    if not isinstance(model, GPModel):
+        with timer.phase('model'):
+            model.updateModel(X_all, Y_all, None, None)
+        return
+
+    created = model.model is None
+    model_optimize_restarts = model.optimize_restarts
+    model_max_iters = model.max_iters
+    max_iters = model_max_iters if max_iters is None else max_iters
+    model.max_iters = 0
+
+    try:
+        with timer.phase('model'):
+            model.updateModel(X_all, Y_all, None, None)
+
+            if created and initialize is not None:
+                initialize(model.model)
+
+        if max_iters <= 0:
+            return
+
+        if optimize_restarts is not None:
+            model.optimize_restarts = optimize_restarts
+        model.max_iters = max_iters
+
+        with timer.phase('hyperparameters'):
+            if isinstance(model, IncrementalGPModel):
+                model.optimize()
+            else:
+                optimize_hyperparameters(model)
+    finally:
+        model.optimize_restarts = model_optimize_restarts
+        model.max_iters = model_max_iters
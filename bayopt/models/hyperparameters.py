@@ -0,0 +1,64 @@
+import numpy as np
+
+
+class HyperparameterStore(object):
+    """
+    Kernel hyperparameters of the GPs fitted on subspaces, kept per dimension of the original space.
+
+    The lengthscale of every dimension of a subspace, the kernel variance and the noise variance are updated
+    after every fit. A GP on a new subspace is initialized from them, dimensions which were never part of a fitted
+    subspace start from the geometric mean of the known lengthscales.
+
+    Args:
+        dimensionality (int): dimension of the original space.
+    """
+
+    def __init__(self, dimensionality):
+        self.lengthscale = np.ones(dimensionality)
+        self.fitted = np.zeros(dimensionality, dtype=bool)
+        self.variance = None
+        self.noise_variance = None
+
+    @property
+    def is_empty(self):
+        return self.variance is None
+
+    def update(self, subspace_idx, gp):
+        self.lengthscale[subspace_idx] = np.asarray(gp.kern.lengthscale, dtype=float)
+        self.fitted[subspace_idx] = True
+        self.variance = float(gp.kern.variance)
+        self.noise_variance = float(gp.likelihood.variance)
+
+    def initialize(self, subspace_idx, gp):
+        if self.is_empty:
+            return
+
+        lengthscale = self.lengthscale[subspace_idx].copy()
+        lengthscale[~self.fitted[subspace_idx]] = np.exp(np.mean(np.log(self.lengthscale[self.fitted])))
+
+        # --- a kernel without ARD shares one lengthscale among the dimensions
+        if gp.kern.lengthscale.size == 1:
+            lengthscale = np.exp(np.mean(np.log(lengthscale)))
+
+        gp.update_model(False)
+        gp.kern.lengthscale[:] = lengthscale
+        gp.kern.variance[:] = self.variance
+        if not gp.likelihood.variance.is_fixed:
+            gp.likelihood.variance[:] = self.noise_variance
+        gp.update_model(True)
+
+    def state(self):
+        if self.is_empty:
+            return dict()
+
+        return {'lengthscale': self.lengthscale, 'fitted': self.fitted, 'variance': self.variance,
+                'noise_variance': self.noise_variance}
+
+    def restore(self, state):
+        if 'variance' not in state:
+            return
+
+        self.lengthscale = np.array(state['lengthscale'], dtype=float)
+        self.fitted = np.array(state['fitted'], dtype=bool)
+        self.variance = float(state['variance'])
+        self.noise_variance = float(state['noise_variance'])
@@ -0,0 +1,138 @@
+from GPy.inference.latent_function_inference.exact_gaussian_inference import ExactGaussianInference
+from GPy.inference.latent_function_inference.posterior import PosteriorExact as Posterior
+from GPy.util.linalg import pdinv, dpotrs, dtrtrs, jitchol, tdot
+import numpy as np
+
+log_2_pi = np.log(2 * np.pi)
+
+
+class IncrementalExactGaussianInference(ExactGaussianInference):
+    """
+    Exact Gaussian inference which keeps the Cholesky factor and the inverse of the covariance matrix
+    between calls. When the kernel and likelihood parameters are unchanged and the new inputs only append
+    rows to the previous ones, both are extended by a block update in O(n^2) instead of being recomputed in O(n^3).
+    Dropping trailing rows again (e.g. after fake observations of a batch evaluator) is handled in the same way.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.reset()
+
+    def reset(self):
+        self._X = None
+        self._K = None
+        self._LW = None
+        self._Wi = None
+        self._params = None
+
+    def inference(self, kern, X, likelihood, Y, mean_function=None, Y_metadata=None, K=None, variance=None,
+                  Z_tilde=None):
+        if variance is None:
+            variance = likelihood.gaussian_variance(Y_metadata)
+
+        if mean_function is not None or K is not None or Z_tilde is not None or np.size(variance) != 1:
+            self.reset()
+            return super().inference(kern=kern, X=X, likelihood=likelihood, Y=Y, mean_function=mean_function,
+                                     Y_metadata=Y_metadata, K=K, variance=variance, Z_tilde=Z_tilde)
+
+        X = np.array(X)
+        params = np.hstack((kern.param_array, likelihood.param_array))
+
+        if self._is_extension(X=X, params=params):
+            self._extend(kern=kern, X=X, variance=float(variance))
+        elif self._is_truncation(X=X, params=params):
+            self._truncate(n=X.shape[0])
+        else:
+            self._factorize(kern=kern, X=X, variance=float(variance))
+
+        self._X = X
+        self._params = params
+
+        alpha, _ = dpotrs(self._LW, Y, lower=1)
+        W_logdet = 2. * np.sum(np.log(np.diag(self._LW)))
+        log_marginal = 0.5 * (-Y.size * log_2_pi - Y.shape[1] * W_logdet - np.sum(alpha * Y))
+
+        dL_dK = 0.5 * (tdot(alpha) - Y.shape[1] * self._Wi)
+        dL_dthetaL = likelihood.exact_inference_gradients(np.diag(dL_dK), Y_metadata)
+
+        posterior = Posterior(woodbury_chol=self._LW, woodbury_vector=alpha, K=self._K, woodbury_inv=self._Wi)
+        return posterior, log_marginal, {'dL_dK': dL_dK, 'dL_dthetaL': dL_dthetaL, 'dL_dm': alpha}
+
+    def _is_extension(self, X, params):
+        if self._X is None:
+            return False
+
+        n = self._X.shape[0]
+
+        return X.shape[0] >= n and X.shape[1] == self._X.shape[1] and np.array_equal(params, self._params) \
+            and np.array_equal(X[:n], self._X)
+
+    def _is_truncation(self, X, params):
+        if self._X is None:
+            return False
+
+        n = X.shape[0]
+
+        return 0 < n < self._X.shape[0] and X.shape[1] == self._X.shape[1] \
+            and np.array_equal(params, self._params) and np.array_equal(self._X[:n], X)
+
+    def _factorize(self, kern, X, variance):
+        self._K = kern.K(X)
+
+        Ky = self._K.copy()
+        Ky[np.diag_indices_from(Ky)] += variance + 1e-8
+
+        self._Wi, self._LW, _, _ = pdinv(Ky)
+
+    def _extend(self, kern, X, variance):
+        n = self._X.shape[0]
+        if X.shape[0] == n:
+            return
+
+        X_new = X[n:]
+        K_cross = kern.K(self._X, X_new)
+        K_new = kern.K(X_new)
+
+        # --- Cholesky factor: [[L, 0], [V.T, L_s]] with L V = K_cross and L_s L_s.T the Schur complement
+        V, _ = dtrtrs(self._LW, K_cross, lower=1)
+        schur = K_new - V.T.dot(V)
+        schur[np.diag_indices_from(schur)] += variance + 1e-8
+        L_schur = jitchol(schur)
+
+        # --- inverse by the block inversion formula
+        B = self._Wi.dot(K_cross)
+        schur_inv, _ = dpotrs(L_schur, np.eye(L_schur.shape[0]), lower=1)
+        B_schur_inv = B.dot(schur_inv)
+
+        m = X.shape[0]
+        LW = np.zeros((m, m))
+        LW[:n, :n] = self._LW
+        LW[n:, :n] = V.T
+        LW[n:, n:] = L_schur
+
+        Wi = np.empty((m, m))
+        Wi[:n, :n] = self._Wi + B_schur_inv.dot(B.T)
+        Wi[:n, n:] = -B_schur_inv
+        Wi[n:, :n] = -B_schur_inv.T
+        Wi[n:, n:] = schur_inv
+
+        K = np.empty((m, m))
+        K[:n, :n] = self._K
+        K[:n, n:] = K_cross
+        K[n:, :n] = K_cross.T
+        K[n:, n:] = K_new
+
+        self._LW = np.asfortranarray(LW)
+        self._Wi = Wi
+        self._K = K
+
+    def _truncate(self, n):
+        # --- the leading block of the Cholesky factor is the factor of the leading block,
+        # --- the inverse of the leading block is the Schur complement of the trailing block of the inverse
+        Wi_cross = self._Wi[:n, n:]
+        L_trailing = jitchol(self._Wi[n:, n:])
+        C, _ = dtrtrs(L_trailing, Wi_cross.T, lower=1)
+
+        self._Wi = self._Wi[:n, :n] - C.T.dot(C)
+        self._LW = np.asfortranarray(self._LW[:n, :n])
+        self._K = self._K[:n, :n].copy()
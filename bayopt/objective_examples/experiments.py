@@ -1,5 +1,4 @@
 import numpy as np
-from scipy.stats import multivariate_normal
 
 
 def example(x):
@@ -7,29 +6,54 @@ def example(x):
     return -0.1 * (x0 ** 2 + x1 ** 2 - 16) ** 2 + 10 * np.sin(3 * x0)
 
 
+def _as_batch(x):
+    """
+    Returns x as an (n, d) batch and whether x was a single point of shape (d,).
+    """
+    x = np.asarray(x, dtype=float)
+    return np.atleast_2d(x), x.ndim == 1
+
+
+def _as_result(values, single):
+    if single:
+        return float(values[0])
+
+    return values[:, np.newaxis]
+
+
 class SchwefelsFunction:
 
     function_name = "Schwefel's function"
 
     def __call__(self, x):
-        return np.sum([(np.sum([x[dj] for dj in range(di + 1)]) ** 2) for di in range(len(x))])
+        x, single = _as_batch(x)
+        return _as_result(np.sum(np.cumsum(x, axis=1) ** 2, axis=1), single)
 
     def get_function_name(self):
         return self.function_name
 
 
 class GaussianMixtureFunction:
+    """
+    Mixture of two isotropic Gaussians with identity covariance, normalized to 1 at mean_1.
+    The normalization constants of the Gaussians cancel, so only squared distances are computed.
+    """
 
     function_name = 'Gaussian mixture function'
 
     def __init__(self, dim, mean_1, mean_2):
         self.dim = dim
-        self.np_1 = multivariate_normal(np.full(dim, mean_1), np.diag(np.ones(dim)))
-        self.np_2 = multivariate_normal(np.full(dim, mean_2), np.diag(np.ones(dim)))
-        self.max_value = self.np_1.pdf(np.full(dim, mean_1)) + 0.5 * self.np_2.pdf(np.full(dim, mean_1))
+        self.mean_1 = np.full(dim, mean_1, dtype=float)
+        self.mean_2 = np.full(dim, mean_2, dtype=float)
+        self.max_value = 1 + 0.5 * np.exp(-0.5 * np.sum((self.mean_1 - self.mean_2) ** 2))
 
     def __call__(self, x):
-        return (self.np_1.pdf(x) + 0.5 * self.np_2.pdf(x)) / self.max_value
+        x, single = _as_batch(x)
+
+        values = np.exp(-0.5 * np.sum((x - self.mean_1) ** 2, axis=1)) + \
+            0.5 * np.exp(-0.5 * np.sum((x - self.mean_2) ** 2, axis=1))
+
+        return _as_result(values / self.max_value, single)
 
     def get_function_name(self):
         return self.function_name
@@ -44,9 +68,12 @@ class BraininFunction:
         self.effective2 = effective2
 
     def __call__(self, x):
-        x1 = x[0][self.effective1]
-        x2 = x[0][self.effective2]
-        return ((x2 - (5.1*(x2**2)/(4*(np.pi**2))) + 5*x1/np.pi - 6)**2 + 10*(1-1/(8*np.pi))*np.cos(x1) + 10) - 0.397887
+        x, single = _as_batch(x)
+        x1 = x[:, self.effective1]
+        x2 = x[:, self.effective2]
+
+        values = ((x2 - (5.1*(x2**2)/(4*(np.pi**2))) + 5*x1/np.pi - 6)**2 + 10*(1-1/(8*np.pi))*np.cos(x1) + 10) - 0.397887
+        return _as_result(values, single)
 
     def get_function_name(self):
         return self.function_name
@@ -1,20 +1,27 @@
 from bayopt import definitions
 from bayopt.clock.clock import from_str
 from bayopt.utils.utils import rmdir_when_any
+from bayopt.utils.stream import read_stream
+from bayopt.plot.store import ExperimentStore
+from bayopt.utils.catalog import Catalog
 import pandas as pd
 import os
 import csv
 import numpy as np
 
 
-def load_experiments(function_name, dim, feature, start=None, end=None, iter_check=None):
+def load_experiments(function_name, dim, feature, start=None, end=None, iter_check=None, use_store=False,
+                     use_catalog=False):
+    if use_store:
+        store = ExperimentStore(function_name=function_name)
+        return store.load(dim=dim, feature=feature, start=start, end=end, iter_check=iter_check)
+
     experiments = load_files(
-        function_name=function_name, start=start, end=end, dim=dim, feature=feature)
+        function_name=function_name, start=start, end=end, use_catalog=use_catalog, dim=dim, feature=feature)
 
     results = list()
     for expt in experiments:
-        evaluation_file = expt + '/evaluation.csv'
-        y = csv_to_numpy(file=evaluation_file)
+        y = load_log(expt=expt, name='evaluation')
         y = y[:, 1]
 
         if iter_check:
@@ -35,8 +42,7 @@ def load_experiments_theta(function_name, dim, feature, created_at, update_check
     expt = _load_experiment(function_name=function_name, created_at=created_at, dim=dim,
                             feature=feature)
 
-    expt_file = expt + '/distribution.csv'
-    data = csv_to_numpy(expt_file, header=False)
+    data = load_log(expt=expt, name='distribution', header=False)
 
     if update_check:
         if len(data) < update_check:
@@ -51,8 +57,7 @@ def load_experiments_mask(function_name, dim, feature, created_at, update_check=
     expt = _load_experiment(function_name=function_name, created_at=created_at, dim=dim,
                             feature=feature)
 
-    expt_file = expt + '/mask.csv'
-    data = csv_to_numpy(expt_file, header=False, dtype='str')
+    data = load_log(expt=expt, name='mask', header=False, dtype='bool')
 
     if update_check:
         if len(data) < update_check:
@@ -97,6 +102,28 @@ def _load_experiment(function_name, created_at, dim, feature):
     return expt
 
 
+def load_log(expt, name, header=True, dtype='float'):
+    """
+    Loads the log <name>.csv of an experiment, or <name>.stream if the log was streamed
+    (the rows written so far for a running experiment).
+    """
+    csv_file = expt + '/' + name + '.csv'
+    if os.path.exists(csv_file):
+        if dtype == 'bool':
+            return csv_to_numpy(file=csv_file, header=header, dtype='str') == 'True'
+
+        return csv_to_numpy(file=csv_file, header=header, dtype=dtype)
+
+    data = read_stream(expt + '/' + name + '.stream')
+
+    if dtype == 'bool':
+        return data.astype(bool)
+    elif dtype == 'str':
+        return data.astype(str)
+
+    return data.astype(float)
+
+
 def csv_to_numpy(file, header=True, dtype='float'):
     y = list()
 
@@ -115,14 +142,19 @@ def csv_to_numpy(file, header=True, dtype='float'):
         return np.array(y, dtype=np.str)
 
 
-def load_files(function_name, start=None, end=None, **kwargs):
+def load_files(function_name, start=None, end=None, use_catalog=False, **kwargs):
     """
     :param function_name: string
     :param start: string
     :param end:  string
+    :param use_catalog: query the catalog of experiments instead of listing the storage directory
     :return: list
     """
-    storage_dir = definitions.ROOT_DIR + '/storage/' + function_name
+    if use_catalog:
+        return Catalog().query(function=function_name, dim=kwargs.get('dim'), method=kwargs.get('feature'),
+                               start=start, end=end)
+
+    storage_dir = definitions.STORAGE_DIR + '/' + function_name
     experiments = os.listdir(storage_dir)
 
     masked = list()
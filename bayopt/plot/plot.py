@@ -28,10 +28,10 @@ class Plot(ABC):
         pass
 
     def finish(self, option=None):
-        mkdir_when_not_exist(abs_path=definitions.ROOT_DIR + '/storage/images')
+        mkdir_when_not_exist(abs_path=definitions.STORAGE_DIR + '/images')
         if option:
-            self._plt.savefig(definitions.ROOT_DIR + "/storage/images/" + clock.now_str() + '_' + option)
+            self._plt.savefig(definitions.STORAGE_DIR + "/images/" + clock.now_str() + '_' + option)
         else:
-            self._plt.savefig(definitions.ROOT_DIR + "/storage/images/" + clock.now_str())
+            self._plt.savefig(definitions.STORAGE_DIR + "/images/" + clock.now_str())
 
         self._plt.cla()
@@ -6,122 +6,97 @@ def maximum_locus(data):
     if len(data.shape) is not 1:
         raise ValueError('shape (n, 0)')
 
-    data_ = list()
-    maximum = 0
-
-    for i in range(len(data)):
-        if maximum < data[i]:
-            maximum = data[i]
-
-        data_.append(maximum)
-
-    return np.array(data_)
+    return maximum_loci(data[np.newaxis])[0]
 
 
 def minimum_locus(data):
     if len(data.shape) is not 1:
-        raise ValueError('shape (m, 0)')
-
-    data_ = list()
-    minimum = 0
+        raise ValueError('shape (n, 0)')
 
-    for i in range(len(data)):
-        if minimum > data[i]:
-            minimum = data[i]
+    return minimum_loci(data[np.newaxis])[0]
 
-        data_.append(minimum)
 
-    return np.array(data_)
+def maximum_loci(data):
+    """
+    Running maxima (starting at 0) of every run of a (runs, iterations) matrix, which may be memory-mapped.
+    """
+    if data.ndim != 2:
+        raise ValueError('shape (runs, iterations)')
 
+    return np.maximum.accumulate(np.maximum(data, 0), axis=1)
 
-def minimum_locus(data):
-    if len(data.shape) is not 1:
-        raise ValueError('shape (n, 0)')
 
-    data_ = list()
-    minimum = np.inf
+def minimum_loci(data):
+    """
+    Running minima of every run of a (runs, iterations) matrix, which may be memory-mapped.
+    """
+    if data.ndim != 2:
+        raise ValueError('shape (runs, iterations)')
 
-    for i in range(len(data)):
-        if data[i] < minimum:
-            minimum = data[i]
-
-        data_.append(minimum)
-
-    return np.array(data_)
+    return np.minimum.accumulate(data, axis=1)
 
 
 def with_confidential(data):
-    data = pd.DataFrame(data)
+    data = np.asarray(data, dtype=float)
 
     if len(data) == 0:
         raise ValueError('No Data')
 
-    if np.any(data.isnull().values):
+    if np.any(np.isnan(data)):
         print(data)
         raise ValueError('Nan exists')
 
-    mean = data.mean(axis='columns')
-
-    if len(data.columns) is not 1:
-        std = data.std(axis='columns')
+    if data.shape[1] != 1:
+        std = data.std(axis=1, ddof=1)
     else:
         std = np.zeros(len(data))
 
-    median = data.median(axis='columns')
-    quantile = data.quantile(q=[0.25, 0.75], axis=1)
+    lower, median, upper = np.quantile(data, q=[0.25, 0.5, 0.75], axis=1)
 
-    data['mean'] = mean
-    data['std'] = std
-    data['median'] = median
-    data['upper'] = quantile.loc[0.75, :]
-    data['lower'] = quantile.loc[0.25, :]
+    summary = np.column_stack((data, data.mean(axis=1), std, median, upper, lower))
+    columns = list(range(data.shape[1])) + ['mean', 'std', 'median', 'upper', 'lower']
 
-    if np.any(data.isnull().values):
-        print(data)
-        raise ValueError('Nan exists after inserting mean, std')
-
-    return data
+    return pd.DataFrame(summary, columns=columns)
 
 
 def histogram(data, start, stop, step):
     x = np.arange(start=start, stop=stop + step, step=step)
-    y = list()
 
-    for i in range(len(x) - 1):
-        if i == (len(x) - 2):
-            y.append(np.count_nonzero((x[i] <= data) & (data <= x[i + 1])))
-        else:
-            y.append(np.count_nonzero((x[i] <= data) & (data < x[i + 1])))
+    # --- the bins are half-open except for the last one, which includes stop
+    y, _ = np.histogram(data, bins=x)
 
-    return np.round(x[:-1], 1).astype(np.str), np.array(y)
+    return np.round(x[:-1], 1).astype(np.str), y
 
 
 def pivot_table(data, value, columns, index):
+    """
+    Table of a (iterations, dimensions) matrix with a row per dimension and a column per iteration.
+    value names the values of the long form of the table and is kept for compatibility.
+    """
+    data = np.asarray(data, dtype=float)
 
-    df = {value: list(), columns: list(), index: list()}
+    return pd.DataFrame(
+        data.T,
+        index=pd.Index(np.arange(1, data.shape[1] + 1), name=index),
+        columns=pd.Index(np.arange(1, data.shape[0] + 1), name=columns)
+    )
 
-    for iteration_idx in range(len(data)):
-        for dim_idx in range(len(data[iteration_idx])):
 
-            df[value].append(data[iteration_idx][dim_idx])
-            df[columns].append(iteration_idx + 1)
-            df[index].append(dim_idx + 1)
+def to_zero_one(data):
+    return to_bool(data).astype(int)
 
-    df = pd.DataFrame(df)
-    df_pivot = pd.pivot_table(data=df, values=value, columns=columns, index=index, aggfunc=np.mean)
-    return df_pivot
 
+def to_bool(data):
+    """
+    Masks as booleans, from native booleans or from the strings True / False of mask.csv.
+    """
+    data = np.asarray(data)
 
-def to_zero_one(data):
-    def f(x):
-        if x == 'True':
-            return 1
-        else:
-            return 0
+    if data.dtype == np.bool_:
+        return data
 
-    return np.vectorize(f)(data)
+    return data == 'True'
 
 
 def count_true(data):
-    data = to_zero_one(data)
-    return np.apply_along_axis(np.sum, 1, data)
+    return np.count_nonzero(to_bool(data), axis=1)
@@ -0,0 +1,216 @@
+from bayopt import definitions
+from bayopt.clock.clock import from_str
+from bayopt.utils.stream import read_stream
+from bayopt.utils.utils import mkdir_when_not_exist
+import contextlib
+import fcntl
+import numpy as np
+import os
+
+INDEX_DTYPE = np.dtype([
+    ('name', 'U128'),
+    ('timestamp', 'datetime64[s]'),
+    ('dim', 'U16'),
+    ('feature', 'U64'),
+    ('offset', 'i8'),
+    ('length', 'i8'),
+])
+
+
+class ExperimentStore(object):
+    """
+    Columnar store of the evaluations of all experiments on one function.
+
+    The Y column of every experiment is appended to a single float64 file which is memory-mapped for reading,
+    and an index records the timestamp, dimension, feature and position of each experiment.
+    Loading the experiments which match a query is a single gather instead of parsing one CSV per experiment.
+
+    The store lives next to the experiment directories in storage/<function_name>.store.
+    The methods append every experiment they save, and changes to the store hold a file lock,
+    so that runs in parallel processes do not lose each other's entries.
+
+    Args:
+        function_name (string): name of the objective function.
+        storage_dir (string | None): storage directory (default is definitions.STORAGE_DIR).
+    """
+
+    def __init__(self, function_name, storage_dir=None):
+        if storage_dir is None:
+            storage_dir = definitions.STORAGE_DIR
+
+        self.function_name = function_name
+        self.experiments_dir = storage_dir + '/' + function_name
+        self.directory = self.experiments_dir + '.store'
+        self.index = self._load_index()
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, name):
+        return bool(np.any(self.index['name'] == name))
+
+    @property
+    def index_file(self):
+        return self.directory + '/index.npy'
+
+    @property
+    def values_file(self):
+        return self.directory + '/values.bin'
+
+    def exists(self):
+        return os.path.isfile(self.index_file)
+
+    @property
+    def lock_file(self):
+        return self.directory + '/lock'
+
+    def append(self, name, created_at, dim, feature, y):
+        with self._lock():
+            self._append(name=name, created_at=created_at, dim=dim, feature=feature, y=y)
+            self._write_index()
+
+    def append_experiment(self, expt):
+        """
+        Appends the experiment directory expt of the function, unless it is in the store already.
+        """
+        name = os.path.basename(expt)
+        y = read_evaluations(expt)
+
+        try:
+            dt, tm, dim, feature = name.split(' ')
+        except ValueError:
+            y = None
+
+        if y is None:
+            print('discard: ' + expt)
+            return
+
+        with self._lock():
+            if name not in self:
+                self._append(name=name, created_at=dt + ' ' + tm, dim=dim, feature=feature, y=y[:, 1])
+                self._write_index()
+
+    def import_experiments(self):
+        """
+        Imports the experiment directories of the function which are not in the store yet.
+        """
+        with self._lock():
+            return self._import_experiments()
+
+    def _import_experiments(self):
+        imported = set(self.index['name'])
+        count = 0
+
+        for expt in sorted(os.listdir(self.experiments_dir)):
+            try:
+                dt, tm, dim, feature = expt.split(' ')
+            except ValueError:
+                print('discard: ' + expt)
+                continue
+
+            if expt in imported:
+                continue
+
+            y = read_evaluations(self.experiments_dir + '/' + expt)
+            if y is None:
+                print('discard: ' + expt)
+                continue
+
+            self._append(name=expt, created_at=dt + ' ' + tm, dim=dim, feature=feature, y=y[:, 1])
+            count += 1
+
+        if count > 0:
+            self._write_index()
+
+        return count
+
+    def query(self, dim=None, feature=None, start=None, end=None):
+        """
+        Returns the index entries of the matching experiments ordered by their timestamp.
+        """
+        mask = np.ones(len(self.index), dtype=bool)
+
+        if dim is not None:
+            mask &= self.index['dim'] == dim
+        if feature is not None:
+            mask &= self.index['feature'] == feature
+        if start:
+            mask &= self.index['timestamp'] >= np.datetime64(from_str(start))
+        if end:
+            mask &= self.index['timestamp'] <= np.datetime64(from_str(end))
+
+        entries = self.index[mask]
+        return entries[np.argsort(entries['timestamp'], kind='stable')]
+
+    def load(self, dim=None, feature=None, start=None, end=None, iter_check=None):
+        """
+        Returns the Y of the matching experiments as an array of shape (experiments, iterations),
+        cut to the length of the shortest one.
+        """
+        entries = self.query(dim=dim, feature=feature, start=start, end=end)
+
+        if len(entries) == 0:
+            return np.empty((0, 0))
+
+        if iter_check and np.any(entries['length'] < iter_check):
+            expt = entries['name'][np.argmax(entries['length'] < iter_check)]
+            print('Error in ' + expt + ': expect ' + str(iter_check) + ' given ' + str(entries['length'].min()))
+            raise ValueError('iterations is not enough')
+
+        length = entries['length'].min()
+        values = np.memmap(self.values_file, dtype=np.float64, mode='r')
+
+        return np.asarray(values[entries['offset'][:, None] + np.arange(length)])
+
+    @contextlib.contextmanager
+    def _lock(self):
+        """
+        Holds the lock of the store and reloads the index, which other processes may have changed.
+        """
+        mkdir_when_not_exist(abs_path=self.directory)
+
+        with open(self.lock_file, 'w') as file:
+            fcntl.flock(file, fcntl.LOCK_EX)
+            try:
+                self.index = self._load_index()
+                yield
+            finally:
+                fcntl.flock(file, fcntl.LOCK_UN)
+
+    def _append(self, name, created_at, dim, feature, y):
+        y = np.asarray(y, dtype=np.float64).ravel()
+
+        with open(self.values_file, 'ab') as file:
+            offset = file.tell() // 8
+            file.write(y.tobytes())
+
+        entry = np.array([(name, np.datetime64(from_str(created_at)), dim, feature, offset, len(y))],
+                         dtype=INDEX_DTYPE)
+        self.index = np.concatenate((self.index, entry))
+
+    def _load_index(self):
+        if not os.path.isfile(self.index_file):
+            return np.empty(0, dtype=INDEX_DTYPE)
+
+        return np.load(self.index_file)
+
+    def _write_index(self):
+        with open(self.index_file + '.tmp', 'wb') as file:
+            np.save(file, self.index)
+        os.replace(self.index_file + '.tmp', self.index_file)
+
+
+def read_evaluations(expt):
+    csv_file = expt + '/evaluation.csv'
+    if os.path.isfile(csv_file):
+        return np.loadtxt(csv_file, delimiter='\t', skiprows=1, ndmin=2)
+
+    stream_file = expt + '/evaluation.stream'
+    if os.path.isfile(stream_file):
+        return read_stream(stream_file)
+
+    return None
+
+
+def import_experiments(function_name, storage_dir=None):
+    return ExperimentStore(function_name=function_name, storage_dir=storage_dir).import_experiments()
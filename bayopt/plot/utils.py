@@ -5,8 +5,8 @@ from bayopt.plot.loader import load_experiments_model
 from bayopt.plot.staticplot import StaticPlot
 from bayopt.plot.staticplot import BarPlot
 from bayopt.plot.staticplot import HeatMap
-from bayopt.plot.stats import maximum_locus
-from bayopt.plot.stats import minimum_locus
+from bayopt.plot.stats import maximum_loci
+from bayopt.plot.stats import minimum_loci
 from bayopt.plot.stats import with_confidential
 from bayopt.plot.stats import histogram
 from bayopt.plot.stats import pivot_table
@@ -15,7 +15,7 @@ from bayopt.plot.stats import count_true
 import numpy as np
 
 
-def plot_experiments(function_name, dim, method, is_median=False, single=False, iter_check=None, maximize=True, start=None, end=None):
+def plot_experiments(function_name, dim, method, is_median=False, single=False, iter_check=None, maximize=True, start=None, end=None, use_store=False, use_catalog=False):
 
     data = dict()
 
@@ -26,21 +26,18 @@ def plot_experiments(function_name, dim, method, is_median=False, single=False,
             end=end,
             dim=dim,
             feature=fill,
-            iter_check=iter_check
+            iter_check=iter_check,
+            use_store=use_store,
+            use_catalog=use_catalog
         )
 
-        results_ = list()
+        results = np.atleast_2d(results)
 
         if maximize:
-            results = results * -1
-
-            for i in range(len(results)):
-                results_.append(maximum_locus(results[i]))
+            results_ = maximum_loci(results * -1)
         else:
-            for i in range(len(results)):
-                results_.append(minimum_locus(results[i]))
+            results_ = minimum_loci(results)
 
-        results_ = np.array(results_)
         results_ = results_.T
 
         results_ = with_confidential(results_)
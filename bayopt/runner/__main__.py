@@ -0,0 +1,30 @@
+from bayopt.runner.sweep import Sweep
+import argparse
+import sys
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m bayopt.runner',
+                                     description='Runs the grid of a sweep config over a process pool, '
+                                                 'skipping the finished runs and resuming the interrupted ones.')
+    parser.add_argument('config', help='JSON config of the sweep')
+    parser.add_argument('--workers', type=int, default=None, help='number of worker processes')
+    parser.add_argument('--dry-run', action='store_true', help='list the pending runs without running them')
+    args = parser.parse_args(argv)
+
+    sweep = Sweep(config=args.config, workers=args.workers)
+    pending = sweep.pending()
+
+    print(str(len(pending)) + ' of ' + str(len(sweep.runs)) + ' runs pending')
+
+    if args.dry_run:
+        for run in pending:
+            print(run.key)
+        return 0
+
+    failed = sweep.run()
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,230 @@
+from bayopt import definitions
+from bayopt.methods.checkpoint import Checkpoint
+from bayopt.methods.factory import METHODS
+from bayopt.methods.factory import SUBSPACE_METHODS
+from bayopt.methods.factory import create_method
+from bayopt.objective_examples.experiments import BraininFunction
+from bayopt.objective_examples.experiments import GaussianMixtureFunction
+from bayopt.objective_examples.experiments import SchwefelsFunction
+from bayopt.utils.utils import storage_dir as use_storage_dir
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import as_completed
+import contextlib
+import json
+import multiprocessing
+import numpy as np
+import os
+import shutil
+import zlib
+
+OBJECTIVES = {
+    'gaussian_mixture': lambda dim, mean_1=2, mean_2=3: GaussianMixtureFunction(dim=dim, mean_1=mean_1,
+                                                                                mean_2=mean_2),
+    'schwefel': lambda dim: SchwefelsFunction(),
+    'brainin': lambda dim, effective1=0, effective2=1: BraininFunction(effective1=effective1,
+                                                                       effective2=effective2),
+}
+
+# --- threads of the linear algebra libraries in every worker, the workers already use all cores
+THREAD_VARIABLES = ['OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS']
+
+
+class Run(namedtuple('Run', ['objective', 'dim', 'method', 'subspace_dim', 'repetition'])):
+    """
+    One optimization run of a sweep. objective is the index of its objective in the config.
+    """
+
+    @property
+    def key(self):
+        subspace = '' if self.subspace_dim is None else ' ' + str(self.subspace_dim) + 'sub'
+        return str(self.objective) + ' ' + str(self.dim) + 'D ' + self.method + subspace + ' #' + str(self.repetition)
+
+    def seed(self, entropy):
+        """
+        Returns the seed of the run, drawn from a stream of its own which does not depend on the other runs.
+        """
+        sequence = np.random.SeedSequence(entropy=entropy, spawn_key=(zlib.crc32(self.key.encode()),))
+        return sequence.generate_state(8)
+
+
+def load_config(config_file):
+    with open(config_file) as file:
+        return json.load(file)
+
+
+def expand(config):
+    """
+    Returns the runs of the grid objective x dimension x method x subspace dimension x repetition of a config.
+    Methods which do not optimize in a subspace are run once per dimension and repetition.
+    """
+    for method in config['methods']:
+        if method not in METHODS:
+            raise ValueError('method has to be one of ' + ', '.join(METHODS))
+
+    for objective in config['objectives']:
+        if objective['function'] not in OBJECTIVES:
+            raise ValueError('function has to be one of ' + ', '.join(OBJECTIVES))
+
+    runs = list()
+
+    for i in range(len(config['objectives'])):
+        for dim in config['dims']:
+            for method in config['methods']:
+                subspace_dims = config.get('subspace_dims', [None]) if method in SUBSPACE_METHODS else [None]
+
+                for subspace_dim in subspace_dims:
+                    if subspace_dim is not None and subspace_dim > dim:
+                        continue
+
+                    for repetition in range(config.get('repetitions', 1)):
+                        runs.append(Run(objective=i, dim=dim, method=method, subspace_dim=subspace_dim,
+                                        repetition=repetition))
+
+    return runs
+
+
+def create_objective(spec, dim):
+    kwargs = {key: value for key, value in spec.items() if key not in ['function', 'domain']}
+    return OBJECTIVES[spec['function']](dim=dim, **kwargs)
+
+
+def domain_of(spec, dim):
+    lower, upper = spec.get('domain', (1, 4))
+    return [{'name': 'x' + str(i), 'type': 'continuous', 'domain': (lower, upper), 'dimensionality': 1}
+            for i in range(dim)]
+
+
+class Sweep(object):
+    """
+    Parallel sweep over the runs of a config, which fans the runs out over a process pool.
+
+    Every run seeds the numpy random number generator of its worker from its own stream and saves its experiment
+    into the usual storage/<function> layout. The finished runs are recorded in sweeps/<name>/runs.jsonl,
+    and every run checkpoints into sweeps/<name>/checkpoints, so that running the same config again
+    skips the finished runs and resumes the interrupted ones.
+
+    The config is a dict (or a JSON file) with the keys:
+        name (string): name of the sweep.
+        objectives (list): dicts with the key function (one of OBJECTIVES), the bounds domain of every dimension
+            (default is [1, 4]) and the other arguments of the function.
+        dims (list): dimensions.
+        methods (list): names of the methods in bayopt.methods.factory.METHODS.
+        subspace_dims (list): subspace dimensions of Dropout and REMBO.
+        repetitions (int): number of repetitions of every run (default is 1).
+        max_iter (int): max_iter of run_optimization.
+        eps (float): eps of run_optimization (default is 0).
+        seed (int): entropy of the seeds of the runs (default is 0).
+        options (dict): arguments of the constructors of the methods, e.g. maximize.
+        checkpoint_interval (int): number of evaluations between two checkpoints of a run (default is 10).
+
+    Args:
+        config (dict | string): config or path of a JSON config.
+        workers (int | None): number of worker processes (default is the number of cores).
+        storage_dir (string | None): storage directory (default is definitions.STORAGE_DIR).
+    """
+
+    def __init__(self, config, workers=None, storage_dir=None):
+        if isinstance(config, str):
+            config = load_config(config)
+
+        self.config = config
+        self.workers = workers
+        self.storage_dir = definitions.STORAGE_DIR if storage_dir is None else storage_dir
+        self.runs = expand(config)
+
+    @property
+    def sweep_dir(self):
+        return self.storage_dir + '/sweeps/' + self.config['name']
+
+    @property
+    def manifest_file(self):
+        return self.sweep_dir + '/runs.jsonl'
+
+    def finished(self):
+        """
+        Returns the records of the finished runs by their keys.
+        """
+        if not os.path.isfile(self.manifest_file):
+            return dict()
+
+        with open(self.manifest_file) as file:
+            records = [json.loads(line) for line in file if line.strip()]
+
+        return {record['key']: record for record in records}
+
+    def pending(self):
+        finished = self.finished()
+        return [run for run in self.runs if run.key not in finished]
+
+    def run(self):
+        """
+        Runs the pending runs and returns the runs which failed.
+        """
+        pending = self.pending()
+        if len(pending) == 0:
+            return list()
+
+        os.makedirs(self.sweep_dir + '/checkpoints', exist_ok=True)
+        os.makedirs(self.sweep_dir + '/logs', exist_ok=True)
+
+        for variable in THREAD_VARIABLES:
+            os.environ.setdefault(variable, '1')
+
+        failed = list()
+
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+            futures = {pool.submit(execute, run, self.config, self.sweep_dir, self.storage_dir): run
+                       for run in pending}
+
+            for future in as_completed(futures):
+                run = futures[future]
+
+                try:
+                    path = future.result()
+                except Exception as e:
+                    print('failed: ' + run.key + ' (' + repr(e) + ')')
+                    failed.append(run)
+                    continue
+
+                self._record(run=run, path=path)
+                print('finished: ' + run.key)
+
+        return failed
+
+    def _record(self, run, path):
+        record = dict(run._asdict(), key=run.key, path=os.path.relpath(path, self.storage_dir))
+
+        with open(self.manifest_file, 'a') as file:
+            file.write(json.dumps(record) + '\n')
+
+        shutil.rmtree(checkpoint_dir(sweep_dir=self.sweep_dir, run=run), ignore_errors=True)
+
+
+def checkpoint_dir(sweep_dir, run):
+    return sweep_dir + '/checkpoints/' + run.key
+
+
+def execute(run, config, sweep_dir, storage_dir):
+    """
+    Executes a run in the current process and returns the directory of its experiment.
+    """
+    spec = config['objectives'][run.objective]
+    directory = checkpoint_dir(sweep_dir=sweep_dir, run=run)
+
+    options = dict(config.get('options', dict()))
+    options['checkpoint_interval'] = config.get('checkpoint_interval', 10)
+    if Checkpoint.exists(directory):
+        options['resume_from'] = directory
+    else:
+        options['checkpoint_dir'] = directory
+
+    np.random.seed(run.seed(entropy=config.get('seed', 0)))
+
+    with use_storage_dir(storage_dir), open(sweep_dir + '/logs/' + run.key + '.log', 'a') as log, \
+            contextlib.redirect_stdout(log):
+        method = create_method(method=run.method, f=create_objective(spec=spec, dim=run.dim),
+                               domain=domain_of(spec=spec, dim=run.dim), subspace_dim=run.subspace_dim, **options)
+        method.run_optimization(max_iter=config['max_iter'], eps=config.get('eps', 0))
+
+    return method.storage_dir
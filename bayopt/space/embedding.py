@@ -0,0 +1,143 @@
+import numpy as np
+
+EMBEDDING_TYPES = ['gaussian', 'count_sketch', 'block']
+
+
+class Embedding(object):
+    """
+    Random linear embedding of a subspace of dimension subspace_dim into the box [-1, 1]^dimensionality.
+
+    map embeds a batch of points of the subspace at once, points outside the box are clipped back into it.
+    The subspace is the box [-bound, bound]^subspace_dim.
+
+    Args:
+        dimensionality (int): dimension of the original space.
+        subspace_dim (int): dimension of the subspace.
+    """
+
+    embedding_type = None
+
+    def __init__(self, dimensionality, subspace_dim):
+        if subspace_dim < 1 or subspace_dim > dimensionality:
+            raise ValueError('subspace_dim has to be between 1 and dimensionality')
+
+        self.dimensionality = dimensionality
+        self.subspace_dim = subspace_dim
+
+    @property
+    def bound(self):
+        return 1.
+
+    def map(self, x):
+        x = np.atleast_2d(np.asarray(x, dtype=float))
+
+        if x.shape[1] != self.subspace_dim:
+            raise ValueError('x.shape is not correct ' + str(x.shape))
+
+        return np.clip(self._project(x), -1., 1.)
+
+    def _project(self, x):
+        raise NotImplementedError
+
+    def state(self):
+        """
+        Returns the arrays which define the embedding.
+        """
+        raise NotImplementedError
+
+    def restore(self, state):
+        raise NotImplementedError
+
+
+class GaussianEmbedding(Embedding):
+    """
+    Dense embedding by a matrix with standard normal entries, on the subspace [-sqrt(subspace_dim), sqrt(subspace_dim)]
+    (Wang et al. 2016). It takes dimensionality x subspace_dim floats.
+    """
+
+    embedding_type = 'gaussian'
+
+    def __init__(self, dimensionality, subspace_dim):
+        super().__init__(dimensionality=dimensionality, subspace_dim=subspace_dim)
+        self.matrix = np.random.normal(size=(dimensionality, subspace_dim))
+
+    @property
+    def bound(self):
+        return np.sqrt(self.subspace_dim)
+
+    def _project(self, x):
+        return x.dot(self.matrix.T)
+
+    def state(self):
+        return {'matrix': self.matrix}
+
+    def restore(self, state):
+        self.matrix = np.asarray(state['matrix'], dtype=float)
+
+
+class CountSketchEmbedding(Embedding):
+    """
+    Hashing embedding of HeSBO (Nayebi et al. 2019): every dimension of the original space is a subspace dimension,
+    chosen at random, times a random sign. It takes an index and a sign per dimension of the original space,
+    and the embedded points are never clipped.
+    """
+
+    embedding_type = 'count_sketch'
+
+    def __init__(self, dimensionality, subspace_dim):
+        super().__init__(dimensionality=dimensionality, subspace_dim=subspace_dim)
+
+        # --- every subspace dimension is hit at least once
+        index = np.concatenate([np.arange(subspace_dim),
+                                np.random.randint(subspace_dim, size=dimensionality - subspace_dim)])
+        self.index = np.random.permutation(index)
+        self.sign = np.random.choice(np.array([-1, 1], dtype=np.int8), size=dimensionality)
+
+    def _project(self, x):
+        return x[:, self.index] * self.sign
+
+    def state(self):
+        return {'index': self.index, 'sign': self.sign}
+
+    def restore(self, state):
+        self.index = np.asarray(state['index'], dtype=int)
+        self.sign = np.asarray(state['sign'], dtype=np.int8)
+
+
+class BlockEmbedding(Embedding):
+    """
+    Block structured embedding: the dimensions of the original space are split into subspace_dim contiguous blocks
+    of nearly equal size, and every dimension is the subspace dimension of its block times a standard normal weight.
+    It takes a weight per dimension of the original space.
+    """
+
+    embedding_type = 'block'
+
+    def __init__(self, dimensionality, subspace_dim):
+        super().__init__(dimensionality=dimensionality, subspace_dim=subspace_dim)
+        self.weights = np.random.normal(size=dimensionality)
+
+    @property
+    def block_sizes(self):
+        return np.diff(np.linspace(0, self.dimensionality, self.subspace_dim + 1).astype(int))
+
+    def _project(self, x):
+        return np.repeat(x, self.block_sizes, axis=1) * self.weights
+
+    def state(self):
+        return {'weights': self.weights}
+
+    def restore(self, state):
+        self.weights = np.asarray(state['weights'], dtype=float)
+
+
+def create_embedding(embedding_type, dimensionality, subspace_dim):
+    if embedding_type == 'gaussian':
+        return GaussianEmbedding(dimensionality=dimensionality, subspace_dim=subspace_dim)
+    if embedding_type == 'count_sketch':
+        return CountSketchEmbedding(dimensionality=dimensionality, subspace_dim=subspace_dim)
+    if embedding_type == 'block':
+        return BlockEmbedding(dimensionality=dimensionality, subspace_dim=subspace_dim)
+
+    raise ValueError('embedding_type has to be one of ' + ', '.join(EMBEDDING_TYPES))
+
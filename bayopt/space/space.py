@@ -1,4 +1,5 @@
 from GPyOpt.core.task.space import Design_space
+import numpy as np
 
 
 def initialize_space(domain, constraints):
@@ -15,3 +16,14 @@ def get_subspace(space, subspace_idx):
     subspace_domain = [dim for idx, dim in enumerate(space.config_space) if idx in subspace_idx]
     # Todo: constraints
     return Design_space(space=subspace_domain, constraints=None)
+
+
+def unzip_inputs(space, X):
+    """
+    Returns the model inputs of X as space.unzip_inputs does, without a loop over the rows of X
+    when the space has no categorical variables (their model inputs are the objective inputs).
+    """
+    if space._has_bandit() or any(variable.type == 'categorical' for variable in space.space_expanded):
+        return space.unzip_inputs(X)
+
+    return np.atleast_2d(np.asarray(X, dtype=float))
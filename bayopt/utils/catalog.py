@@ -0,0 +1,150 @@
+from bayopt import definitions
+from bayopt.clock.clock import from_str
+from bayopt.utils.utils import mkdir_when_not_exist
+import contextlib
+import os
+import sqlite3
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS experiments (
+        id INTEGER PRIMARY KEY,
+        function TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        dim INTEGER NOT NULL,
+        method TEXT NOT NULL,
+        subspace_dim INTEGER,
+        path TEXT NOT NULL UNIQUE
+    )
+    """,
+    'CREATE INDEX IF NOT EXISTS experiments_dim ON experiments (function, dim, method, created_at)',
+    'CREATE INDEX IF NOT EXISTS experiments_method ON experiments (function, method, created_at)',
+    'CREATE INDEX IF NOT EXISTS experiments_subspace_dim ON experiments (function, subspace_dim, created_at)',
+]
+
+
+class Catalog(object):
+    """
+    SQLite catalog of the experiments in the storage directory.
+
+    The methods register every experiment they save, so that experiments are found by indexed queries
+    instead of listing and parsing the experiment directories. Paths are kept relative to the storage directory.
+
+    Args:
+        path (string | None): path of the catalog database (default is catalog.sqlite in definitions.STORAGE_DIR).
+    """
+
+    def __init__(self, path=None):
+        if path is None:
+            path = definitions.STORAGE_DIR + '/catalog.sqlite'
+
+        self.path = path
+        self.storage_dir = os.path.dirname(os.path.abspath(path))
+
+    def register(self, function, created_at, dim, method, path, subspace_dim=None):
+        with self._connect() as connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO experiments (function, created_at, dim, method, subspace_dim, path) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (function, _to_created_at(created_at), _to_dim(dim), method,
+                 None if subspace_dim is None else int(subspace_dim), self._relative_path(path)))
+
+    def query(self, function, dim=None, method=None, subspace_dim=None, start=None, end=None):
+        """
+        Returns the paths of the matching experiments ordered by their creation time.
+        """
+        conditions = ['function = ?']
+        params = [function]
+
+        if dim is not None:
+            conditions.append('dim = ?')
+            params.append(_to_dim(dim))
+        if method is not None:
+            conditions.append('method = ?')
+            params.append(method)
+        if subspace_dim is not None:
+            conditions.append('subspace_dim = ?')
+            params.append(int(subspace_dim))
+        if start:
+            conditions.append('created_at >= ?')
+            params.append(_to_created_at(start))
+        if end:
+            conditions.append('created_at <= ?')
+            params.append(_to_created_at(end))
+
+        with self._connect() as connection:
+            rows = connection.execute(
+                'SELECT path FROM experiments WHERE ' + ' AND '.join(conditions) + ' ORDER BY created_at, id',
+                params).fetchall()
+
+        return [self.storage_dir + '/' + path for path, in rows]
+
+    def import_experiments(self, function):
+        """
+        Registers the experiment directories of a function which were saved before the catalog existed.
+        """
+        experiments_dir = self.storage_dir + '/' + function
+        count = 0
+
+        for expt in sorted(os.listdir(experiments_dir)):
+            try:
+                dt, tm, dim, method = expt.split(' ')
+                created_at = from_str(dt + ' ' + tm)
+                dim = _to_dim(dim)
+            except ValueError:
+                print('discard: ' + expt)
+                continue
+
+            subspace_dim = None
+            if method.startswith('REMBO_'):
+                subspace_dim = int(method[len('REMBO_'):])
+
+            self.register(function=function, created_at=created_at, dim=dim, method=method,
+                          path=experiments_dir + '/' + expt, subspace_dim=subspace_dim)
+            count += 1
+
+        return count
+
+    def _connect(self):
+        mkdir_when_not_exist(abs_path=self.storage_dir)
+
+        connection = sqlite3.connect(self.path, timeout=30)
+        for statement in SCHEMA:
+            connection.execute(statement)
+
+        return _Transaction(connection)
+
+    def _relative_path(self, path):
+        return os.path.relpath(os.path.abspath(path), self.storage_dir)
+
+
+class _Transaction(contextlib.AbstractContextManager):
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self.connection
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                self.connection.commit()
+            else:
+                self.connection.rollback()
+        finally:
+            self.connection.close()
+
+
+def _to_dim(dim):
+    if isinstance(dim, str) and dim.endswith('D'):
+        dim = dim[:-1]
+
+    return int(dim)
+
+
+def _to_created_at(created_at):
+    if isinstance(created_at, str):
+        created_at = from_str(created_at)
+
+    return created_at.strftime('%Y-%m-%d %H:%M:%S')
@@ -0,0 +1,100 @@
+import numpy as np
+import json
+import os
+
+
+class StreamLogger(object):
+    """
+    Append-only binary log of fixed-width rows.
+
+    The file starts with a single JSON line describing the columns and the dtype, followed by the raw rows.
+    Rows are collected in a buffer of buffer_size rows and appended to the file when it is full,
+    so the memory held by the logger does not grow with the number of rows.
+
+    Args:
+        file_name (string): path of the log file, which is overwritten.
+        columns (list): names of the columns.
+        dtype (string): dtype of the rows.
+        buffer_size (int): number of rows written at once.
+    """
+
+    def __init__(self, file_name, columns, dtype='float64', buffer_size=64):
+        if buffer_size < 1:
+            raise ValueError('buffer_size has to be positive')
+
+        self.file_name = file_name
+        self.columns = list(columns)
+        self.dtype = np.dtype(dtype)
+        self.num_rows = 0
+
+        self._buffer = np.empty((buffer_size, len(self.columns)), dtype=self.dtype)
+        self._buffered = 0
+
+        self._file = open(file_name, 'wb')
+        self._file.write((json.dumps({'columns': self.columns, 'dtype': self.dtype.str}) + '\n').encode())
+        self._file.flush()
+
+    def append(self, row):
+        self.extend(np.atleast_2d(row))
+
+    def extend(self, rows):
+        rows = np.atleast_2d(rows)
+
+        if rows.shape[1] != len(self.columns):
+            raise ValueError('rows have to have ' + str(len(self.columns)) + ' columns')
+
+        start = 0
+        while start < rows.shape[0]:
+            size = min(rows.shape[0] - start, self._buffer.shape[0] - self._buffered)
+            self._buffer[self._buffered: self._buffered + size] = rows[start: start + size]
+            self._buffered += size
+            start += size
+
+            if self._buffered == self._buffer.shape[0]:
+                self.flush()
+
+        self.num_rows += rows.shape[0]
+
+    def flush(self):
+        if self._file is None:
+            return
+
+        if self._buffered > 0:
+            self._file.write(self._buffer[:self._buffered].tobytes())
+            self._buffered = 0
+
+        self._file.flush()
+
+    def close(self):
+        if self._file is None:
+            return
+
+        self.flush()
+        self._file.close()
+        self._file = None
+
+
+def read_stream_header(file_name):
+    with open(file_name, 'rb') as file:
+        return json.loads(file.readline().decode())
+
+
+def read_stream(file_name, start=0):
+    """
+    Reads the rows of a log written by StreamLogger from row start on.
+    A row which is only partly written (e.g. by a running experiment) is ignored.
+    """
+    with open(file_name, 'rb') as file:
+        header = json.loads(file.readline().decode())
+        offset = file.tell()
+
+    dtype = np.dtype(header['dtype'])
+    num_columns = len(header['columns'])
+    row_size = dtype.itemsize * num_columns
+
+    num_rows = (os.path.getsize(file_name) - offset) // row_size
+    if num_columns == 0 or num_rows <= start:
+        return np.empty((0, num_columns), dtype=dtype)
+
+    return np.fromfile(file_name, dtype=dtype, count=(num_rows - start) * num_columns,
+                       offset=offset + start * row_size).reshape(-1, num_columns)
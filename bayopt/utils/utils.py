@@ -1,3 +1,5 @@
+from bayopt import definitions
+from contextlib import contextmanager
 import os
 import shutil
 
@@ -11,3 +13,17 @@ def mkdir_when_not_exist(abs_path):
 
 def rmdir_when_any(abs_path):
     shutil.rmtree(abs_path)
+
+
+@contextmanager
+def storage_dir(abs_path):
+    """
+    Saves the experiments into abs_path instead of definitions.STORAGE_DIR within the block.
+    """
+    storage = definitions.STORAGE_DIR
+    definitions.STORAGE_DIR = abs_path
+
+    try:
+        yield
+    finally:
+        definitions.STORAGE_DIR = storage
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from bayopt import definitions
+from bayopt.bench.suite import BenchmarkCase
+from bayopt.bench.suite import compare
+from bayopt.bench.suite import run_case
+from bayopt.bench.suite import time_to_target
+from bayopt.clock.timer import PhaseTimer
+
+
+class TestSuite(unittest.TestCase):
+
+    def test_run_case(self):
+        storage_dir = definitions.STORAGE_DIR
+
+        with tempfile.TemporaryDirectory() as directory:
+            result = run_case(BenchmarkCase(method='dropout_random', dim=3, max_iter=4, subspace_dim=2),
+                              storage_dir=directory)
+
+            self.assertEqual(['Gaussian mixture function', 'Gaussian mixture function.store', 'catalog.sqlite'],
+                             sorted(os.listdir(directory)))
+
+        self.assertEqual(storage_dir, definitions.STORAGE_DIR)
+        self.assertEqual('dropout_random 3D 4iter 2sub', result['name'])
+        self.assertEqual(3, result['iterations'])
+        self.assertGreater(result['iterations_per_second'], 0)
+        self.assertGreater(result['peak_rss'], 0)
+        self.assertGreaterEqual(result['final_regret'], 0)
+
+    def test_case(self):
+        self.assertEqual(3, BenchmarkCase(method='rembo', dim=3, max_iter=1).subspace_dim)
+
+        with self.assertRaises(ValueError):
+            BenchmarkCase(method='unknown', dim=3, max_iter=1)
+
+    def test_time_to_target(self):
+        timer = PhaseTimer()
+        timer.next_iteration(iteration=3)
+        timer.next_iteration(iteration=4)
+        timer.elapsed = [1., 2.]
+
+        self.assertEqual(2., time_to_target(regret=np.array([.5, .5, .5, .05]), num_initial=2, timer=timer))
+        self.assertEqual(0., time_to_target(regret=np.array([.5, .05, .05, .05]), num_initial=2, timer=timer))
+        self.assertIsNone(time_to_target(regret=np.array([.5, .5, .5, .5]), num_initial=2, timer=timer))
+
+    def test_compare(self):
+        baseline = [{'name': 'a', 'iterations_per_second': 10., 'peak_rss': 100., 'time_to_target': 1.},
+                    {'name': 'b', 'iterations_per_second': 10., 'peak_rss': 100., 'time_to_target': None}]
+        results = [{'name': 'a', 'iterations_per_second': 7., 'peak_rss': 110., 'time_to_target': None},
+                   {'name': 'b', 'iterations_per_second': 12., 'peak_rss': 150., 'time_to_target': 1.},
+                   {'name': 'c', 'iterations_per_second': 1., 'peak_rss': 1., 'time_to_target': 1.}]
+
+        regressions = compare(results=results, baseline=baseline, tolerance=0.2)
+
+        self.assertEqual([('a', 'iterations_per_second', 10., 7.), ('a', 'time_to_target', 1., None),
+                          ('b', 'peak_rss', 100., 150.)], regressions)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import numpy as np
+from bayopt.clock.timer import PhaseTimer
+
+
+class TestPhaseTimer(unittest.TestCase):
+
+    def test_phase(self):
+        timer = PhaseTimer(phases=['model', 'evaluation'])
+
+        with timer.phase('model'):
+            np.linalg.inv(np.eye(10))
+        timer.next_iteration(iteration=1)
+
+        with timer.phase('evaluation'):
+            pass
+        timer.next_iteration(iteration=2)
+
+        table = timer.table()
+        self.assertEqual(['Iteration', 'model', 'evaluation'], table[0])
+        self.assertEqual([1, 2], [row[0] for row in table[1:]])
+        self.assertGreater(table[1][1], 0)
+        self.assertEqual(0, table[1][2])
+        self.assertEqual(0, table[2][1])
+
+    def test_totals(self):
+        timer = PhaseTimer(phases=['model'])
+        self.assertEqual({'model': 0}, timer.totals())
+
+        with timer.phase('model'):
+            pass
+        timer.next_iteration(iteration=1)
+
+        # --- an unfinished iteration is part of the totals, but not of the table
+        with timer.phase('model'):
+            pass
+
+        self.assertAlmostEqual(timer.totals()['model'], timer.rows[0][0] + timer._current[0])
+        self.assertEqual(2, len(timer.table()))
+
+    def test_exception(self):
+        timer = PhaseTimer(phases=['model'])
+
+        with self.assertRaises(ValueError):
+            with timer.phase('model'):
+                raise ValueError()
+
+        self.assertGreater(timer.totals()['model'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from bayopt.methods.checkpoint import Checkpoint
+from bayopt.methods.dropout import Dropout
+from bayopt.utils.utils import storage_dir
+from tests.utils.example_function import ExampleFunction
+
+
+class TestCheckpoint(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = self.directory.name + '/checkpoint'
+        self.storage = storage_dir(self.directory.name + '/storage')
+        self.storage.__enter__()
+
+    def tearDown(self) -> None:
+        self.storage.__exit__(None, None, None)
+        self.directory.cleanup()
+
+    def test_append(self):
+        X = np.arange(12, dtype=float).reshape(4, 3)
+        Y = np.arange(4, dtype=float).reshape(4, 1)
+
+        checkpoint = Checkpoint(directory=self.path)
+        checkpoint.save(X=X[:2], Y=Y[:2], state={'num_acquisitions': 2})
+        checkpoint.save(X=X, Y=Y, state={'num_acquisitions': 4})
+
+        self.assertEqual(os.path.getsize(self.path + '/X.bin'), X.nbytes)
+
+        X_, Y_, state = Checkpoint(directory=self.path).load()
+        self.assertTrue(np.array_equal(X, X_))
+        self.assertTrue(np.array_equal(Y, Y_))
+        self.assertEqual(4, int(state['num_acquisitions']))
+
+    def test_interrupted_save(self):
+        X = np.ones((2, 3))
+        Y = np.ones((2, 1))
+
+        Checkpoint(directory=self.path).save(X=X, Y=Y, state={})
+
+        # --- rows appended without the state being replaced
+        with open(self.path + '/X.bin', 'ab') as file:
+            file.write(np.zeros((1, 3)).tobytes())
+
+        X_, _, _ = Checkpoint(directory=self.path).load()
+        self.assertEqual((2, 3), X_.shape)
+        self.assertEqual(os.path.getsize(self.path + '/X.bin'), X.nbytes)
+
+    def test_resume(self):
+        domain = [{'name': 'x' + str(i), 'type': 'continuous', 'domain': (-3, 3), 'dimensionality': 1}
+                  for i in range(5)]
+
+        method = Dropout(f=ExampleFunction(), domain=domain, subspace_dim_size=3, fill_in_strategy='random',
+                         checkpoint_dir=self.path, checkpoint_interval=2)
+        method.max_iter = 4
+        method.num_acquisitions = 1
+        method._prepare_checkpoint()
+        method._run_optimization()
+        method._checkpoint(force=True)
+
+        resumed = Dropout(f=ExampleFunction(), domain=domain, subspace_dim_size=3, fill_in_strategy='random',
+                          resume_from=self.path)
+        resumed._prepare_checkpoint()
+
+        self.assertEqual(4, resumed.num_acquisitions)
+        self.assertTrue(np.array_equal(method.X, resumed.X))
+        self.assertTrue(np.array_equal(method.Y, resumed.Y))
+        self.assertTrue(np.array_equal(method.subspace_idx, resumed.subspace_idx))
+        self.assertTrue(np.array_equal(method.model.model.param_array, resumed.model.model.param_array))
+        self.assertEqual(1, resumed.initial_X.shape[0])
+        self.assertEqual(np.random.get_state()[2], int(np.load(self.path + '/state.npz')['rng_pos']))
@@ -1,6 +1,11 @@
+import tempfile
 import unittest
 import numpy as np
 from bayopt.methods.dropout import Dropout
+from bayopt.models.cache import SubspaceCache
+from bayopt.plot.loader import load_log
+from bayopt.utils.utils import storage_dir
+from GPyOpt.util.general import normalize
 from tests.utils.example_function import ExampleFunction
 from GPyOpt.models.gpmodel import *
 from GPyOpt.models.warpedgpmodel import *
@@ -12,6 +17,11 @@ from GPyOpt.acquisitions.LCB_mcmc import *
 class TestDropout(unittest.TestCase):
 
     def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        storage = storage_dir(directory.name)
+        storage.__enter__()
+        self.addCleanup(storage.__exit__, None, None, None)
         self.f = ExampleFunction()
 
         self.domain = [
@@ -53,6 +63,253 @@ class TestDropout(unittest.TestCase):
         self.assertTrue(np.all(method.X_inmodel[0] == x[0][method.subspace_idx]))
         self.assertEqual(y[0][0], method.Y_inmodel)
 
+    def test_input_data(self):
+        x = np.random.uniform(-3, 3, size=(6, 5))
+        y = np.random.normal(size=(6, 1))
+        method = Dropout(
+            f=self.f, domain=self.domain, subspace_dim_size=self.subspace_dim_size, fill_in_strategy='random',
+            X=x[:2], Y=y[:2]
+        )
+        for i in range(2, 6):
+            method.history.append_X(x[i])
+            method.history.append_Y(y[i:i + 1])
+
+        method.update_subspace()
+        X_inmodel, Y_inmodel = method._input_data(normalization_type='stats')
+
+        self.assertTrue(np.array_equal(x[:, method.subspace_idx], X_inmodel))
+        self.assertTrue(np.allclose(normalize(y, 'stats'), Y_inmodel))
+
+    def test_incremental_model(self):
+        x = np.array([[0, 0, 0, 0, 0], [1, 1, 1, 1, 1]])
+        y = np.array([[1], [2]])
+        method = Dropout(
+            f=self.f, domain=self.domain, subspace_dim_size=len(self.domain), fill_in_strategy='random',
+            X=x, Y=y, incremental_model=True
+        )
+        method.update()
+        model = method.model
+
+        method.X = np.vstack((method.X, np.full((1, 5), 2)))
+        method.Y = np.vstack((method.Y, np.array([[3]])))
+        method.update()
+
+        self.assertTrue(model is method.model)
+        self.assertEqual(3, len(method.model.model.X))
+
+    def test_sparse_model(self):
+        x = np.array([[0, 0, 0, 0, 0], [1, 1, 1, 1, 1]])
+        y = np.array([[1], [2]])
+        method = Dropout(
+            f=self.f, domain=self.domain, subspace_dim_size=len(self.domain), fill_in_strategy='random',
+            X=x, Y=y, model_type='sparseGP', num_inducing=2
+        )
+        method.update()
+        model = method.model
+
+        method.X = np.vstack((method.X, np.full((1, 5), 2)))
+        method.Y = np.vstack((method.Y, np.array([[3]])))
+        method.update()
+
+        self.assertTrue(model is method.model)
+        self.assertEqual(3, len(method.model.model.X))
+        self.assertEqual(2, len(method.model.model.Z))
+
+    def test_warm_start(self):
+        method = Dropout(
+            f=self.f, domain=self.domain, subspace_dim_size=2, fill_in_strategy='random', ard=True,
+            warm_start=True, warm_start_max_iters=20
+        )
+        method.max_iter = 4
+        method.num_acquisitions = 1
+        method.context = None
+        method._run_optimization()
+
+        self.assertFalse(method.hyperparameters.is_empty)
+        self.assertEqual(1, method.model.optimize_restarts)
+        self.assertEqual(20, method.model.max_iters)
+        self.assertEqual(2, method.model.model.kern.lengthscale.size)
+        self.assertTrue(np.allclose(method.model.model.kern.lengthscale,
+                                    method.hyperparameters.lengthscale[method.subspace_idx]))
+
+    def test_subspace_cache(self):
+        x = np.array([[0, 0, 0, 0, 0], [1, 1, 1, 1, 1]])
+        y = np.array([[1], [2]])
+        method = Dropout(
+            f=self.f, domain=self.domain, subspace_dim_size=4, fill_in_strategy='random',
+            X=x, Y=y, subspace_cache_size=10
+        )
+
+        for i in range(10):
+            method.update()
+
+        self.assertEqual(method.subspace_cache.hits + method.subspace_cache.misses, 10)
+        self.assertTrue(method.subspace_cache.hits > 0)
+        self.assertTrue(method.model is method.subspace_cache.peek(method.subspace_idx).model)
+
+    def test_subspace_cache_warm_start(self):
+        x = np.array([[0, 0, 0, 0, 0], [1, 1, 1, 1, 1]])
+        y = np.array([[1], [2]])
+        method = Dropout(
+            f=self.f, domain=self.domain, subspace_dim_size=len(self.domain), fill_in_strategy='random',
+            X=x, Y=y, subspace_cache_size=10, warm_start_max_iters=20
+        )
+        method.update()
+        model = method.model
+        optimize_restarts, max_iters = model.optimize_restarts, model.max_iters
+
+        calls = list()
+        optimize = model.model.optimize
+        model.model.optimize = lambda **kwargs: (calls.append(kwargs['max_iters']), optimize(**kwargs))
+        method.update()
+
+        # --- the hit is refined by 1 restart of warm_start_max_iters, the model keeps its own settings
+        self.assertTrue(model is method.model)
+        self.assertEqual(1, method.subspace_cache.hits)
+        self.assertEqual([20], calls)
+        self.assertEqual(optimize_restarts, model.optimize_restarts)
+        self.assertEqual(max_iters, model.max_iters)
+
+    def test_subspace_cache_miss(self):
+        x = np.array([[0, 0, 0, 0, 0], [1, 1, 1, 1, 1]])
+        y = np.array([[1], [2]])
+        method = Dropout(
+            f=self.f, domain=self.domain, subspace_dim_size=len(self.domain), fill_in_strategy='random',
+            X=x, Y=y, incremental_model=True, subspace_cache_size=10
+        )
+        method.update()
+        model = method.model
+
+        # --- the entry of the unchanged subspace is evicted
+        method.subspace_cache = SubspaceCache(capacity=10)
+        method.update()
+
+        self.assertTrue(model is method.model)
+        self.assertEqual(1, method.subspace_cache.misses)
+
+    def test_fill_in_dimensions(self):
+        x = np.array([[-1, -2, -3, -4, -5]])
+        y = np.array([[1]])
+        method = Dropout(
+            f=self.f, domain=self.domain, subspace_dim_size=self.subspace_dim_size, fill_in_strategy='copy',
+            X=x, Y=y
+        )
+        method.subspace_idx = np.array([1, 3, 4])
+
+        samples = method._fill_in_dimensions(samples=np.array([[1, 3, 4], [11, 13, 14]]))
+
+        self.assertTrue(np.all(np.array([[-1, 1, -3, 3, 4], [-1, 11, -3, 13, 14]]) == samples))
+
+    def test_fill_in_dimensions_random(self):
+        method = Dropout(
+            f=self.f, domain=self.domain, subspace_dim_size=self.subspace_dim_size, fill_in_strategy='mix'
+        )
+        method.subspace_idx = np.array([0, 2, 4])
+
+        samples = method._fill_in_dimensions(samples=np.full((100, 3), 10))
+
+        self.assertEqual(samples.shape, (100, 5))
+        self.assertTrue(np.all(samples[:, [0, 2, 4]] == 10))
+        self.assertTrue(np.all(np.abs(samples[:, [1, 3]]) <= 3))
+
+    def test_batch_evaluation(self):
+        method = Dropout(
+            f=self.f, domain=self.domain, subspace_dim_size=self.subspace_dim_size, fill_in_strategy='random',
+            batch_size=3, evaluator_type='constant_liar'
+        )
+        method.max_iter = 6
+        method.num_acquisitions = 1
+        method._open_stream_log()
+        method._run_optimization()
+        method.objective.close()
+        method._close_stream_log()
+
+        # --- max_iter counts evaluations, the second batch is cut to the remaining 2
+        self.assertEqual(method.num_acquisitions, 6)
+        self.assertEqual(method.X.shape, (6, 5))
+        self.assertEqual(method.Y.shape, (6, 1))
+        self.assertEqual([1, 2], list(load_log(expt=method.storage_dir, name='batch_time')[:, 0]))
+        self.assertEqual(len(method.model.model.X), 6)
+
+    def test_asynchronous_evaluation(self):
+        method = Dropout(
+            f=self.f, domain=self.domain, subspace_dim_size=self.subspace_dim_size, fill_in_strategy='random',
+            batch_size=2, evaluator_type='asynchronous'
+        )
+        method.max_iter = 4
+        method.num_acquisitions = 1
+        method._open_stream_log()
+        method._run_asynchronous_optimization()
+        method.objective.close()
+        method._close_stream_log()
+
+        self.assertEqual(method.num_acquisitions, 4)
+        self.assertEqual(method.X.shape, (4, 5))
+        self.assertEqual(method.Y.shape, (4, 1))
+        self.assertEqual((3, 2), load_log(expt=method.storage_dir, name='batch_time').shape)
+        self.assertEqual([2, 3, 4], method.timer.iterations)
+
+    def test_asynchronous_update(self):
+        method = Dropout(
+            f=self.f, domain=self.domain, subspace_dim_size=self.subspace_dim_size, fill_in_strategy='random',
+            batch_size=3, evaluator_type='asynchronous'
+        )
+        method.max_iter = 5
+        method.num_acquisitions = 1
+
+        fitted, unchanged = list(), list()
+        update, update_unchanged = method.update, method._update_unchanged
+        method.update = lambda: (fitted.append(len(method.X)), update())
+        method._update_unchanged = lambda: (unchanged.append(len(method.X)), update_unchanged())
+        method._run_asynchronous_optimization()
+        method.objective.close()
+
+        # --- the model is refitted once per evaluated data, the other proposals only redraw the subspace
+        self.assertEqual(len(fitted), len(set(fitted)))
+        self.assertEqual([1, 1], unchanged[:2])
+        self.assertEqual(len(method.model.model.X), 5)
+
+    def test_timer(self):
+        method = Dropout(
+            f=self.f, domain=self.domain, subspace_dim_size=self.subspace_dim_size, fill_in_strategy='random'
+        )
+        method.max_iter = 3
+        method.num_acquisitions = 1
+        method.context = None
+        method._run_optimization()
+
+        table = method.timer.table()
+        self.assertEqual(['Iteration', 'subspace', 'model', 'hyperparameters', 'acquisition', 'fill_in',
+                          'evaluation'], table[0])
+        self.assertEqual([2, 3], [row[0] for row in table[1:]])
+        self.assertTrue(all(t > 0 for row in table[1:] for t in row[1:]))
+
+    def test_pending_points(self):
+        x = np.array([[0, 0, 0, 0, 0]])
+        y = np.array([[1]])
+        method = Dropout(
+            f=self.f, domain=self.domain, subspace_dim_size=self.subspace_dim_size, fill_in_strategy='random',
+            X=x, Y=y
+        )
+        method.update()
+        method.context = None
+
+        pending = np.array([[1, 2, 3, 4, 5]])
+        _, duplicate_manager = method._compute_setting(pending_zipped_X=pending, ignored_zipped_X=None)
+
+        self.assertTrue(duplicate_manager.is_zipped_x_duplicate(pending[:, method.subspace_idx]))
+        self.assertTrue(duplicate_manager.is_zipped_x_duplicate(x[:, method.subspace_idx]))
+
+        _, duplicate_manager = method._compute_setting(pending_zipped_X=None, ignored_zipped_X=None)
+        self.assertIsNone(duplicate_manager)
+
+    def test_batch_size_exception(self):
+        with self.assertRaises(ValueError):
+            Dropout(
+                f=self.f, domain=self.domain, subspace_dim_size=self.subspace_dim_size, fill_in_strategy='random',
+                batch_size=3
+            )
+
     def test_initial_value(self):
         x = np.array([[0, 0, 0, 0, 0]])
         y = np.array([[1]])
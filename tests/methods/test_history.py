@@ -0,0 +1,63 @@
+import unittest
+import numpy as np
+from GPyOpt.util.general import normalize
+from bayopt.methods.history import History
+
+
+class TestHistory(unittest.TestCase):
+
+    def setUp(self) -> None:
+        rng = np.random.RandomState(0)
+        self.X = rng.uniform(-3, 3, size=(20, 4))
+        self.Y = rng.normal(size=(20, 1))
+
+    def test_append(self):
+        history = History(capacity=2)
+        history.set_X(self.X[:1])
+        history.set_Y(self.Y[:1])
+
+        for i in range(1, 20):
+            history.append_X(self.X[i])
+            history.append_Y(self.Y[i:i + 1])
+
+        self.assertTrue(np.array_equal(self.X, history.X))
+        self.assertTrue(np.array_equal(self.Y, history.Y))
+        self.assertLessEqual(history._X.shape[0], 2 * 20)
+
+    def test_views(self):
+        history = History(capacity=4)
+        history.set_X(self.X[:3])
+        view = history.X
+
+        history.append_X(self.X[3:10])
+        history.set_X(self.X[:2])
+
+        self.assertTrue(np.array_equal(self.X[:3], view))
+        self.assertTrue(np.array_equal(self.X[:2], history.X))
+
+    def test_normalized_Y(self):
+        history = History(capacity=2)
+        history.set_Y(self.Y[:5])
+
+        for i in range(5, 20):
+            history.append_Y(self.Y[i:i + 1])
+
+            for normalization_type in ['stats', 'maxmin']:
+                self.assertTrue(np.allclose(normalize(self.Y[:i + 1], normalization_type),
+                                            history.normalized_Y(normalization_type)))
+
+        history.set_Y(np.ones((3, 1)))
+        self.assertTrue(np.array_equal(np.zeros((3, 1)), history.normalized_Y('stats')))
+
+        with self.assertRaises(ValueError):
+            history.normalized_Y('unknown')
+
+    def test_columns(self):
+        history = History()
+        history.set_X(self.X)
+
+        self.assertTrue(np.array_equal(self.X[:, [0, 2]], history.columns(np.array([0, 2]))))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import tempfile
+import unittest
+import numpy as np
+from bayopt.methods.interleaved import InterleavedREMBO
+from bayopt.utils.utils import storage_dir
+from bayopt.objective_examples.experiments import GaussianMixtureFunction
+
+
+class TestInterleavedREMBO(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.f = GaussianMixtureFunction(dim=6, mean_1=2, mean_2=3)
+        self.domain = [{'name': 'x' + str(i), 'type': 'continuous', 'domain': (1, 4), 'dimensionality': 1}
+                       for i in range(6)]
+
+    def _run(self, acquisition_workers, max_iter=9):
+        np.random.seed(0)
+        method = InterleavedREMBO(f=self.f, domain=self.domain, subspace_dim_size=2, num_embeddings=3,
+                                  initial_design_numdata=2, acquisition_workers=acquisition_workers)
+
+        with tempfile.TemporaryDirectory() as directory, storage_dir(directory):
+            method.run_optimization(max_iter=max_iter)
+
+        return method
+
+    def test_run_optimization(self):
+        method = self._run(acquisition_workers=1)
+
+        self.assertEqual(3, len(method.embeddings))
+        self.assertEqual(3, len(method.models))
+        self.assertEqual(9, method.num_acquisitions)
+        self.assertEqual((9, 2), method.X.shape)
+        self.assertEqual([0, 0, 1, 1, 2, 2], list(method.assignment[:6]))
+        self.assertEqual(method.X.shape[0], method.assignment.size)
+
+        original = method.map_to_original_space(x=method.X, assignment=method.assignment)
+        self.assertTrue(np.all((1 <= original) & (original <= 4)))
+        self.assertTrue(np.allclose(self.f(original).ravel(), method.Y.ravel()))
+
+    def test_acquisition_workers(self):
+        sequential = self._run(acquisition_workers=1, max_iter=8)
+        parallel = self._run(acquisition_workers=3, max_iter=8)
+
+        self.assertTrue(np.allclose(sequential.X, parallel.X))
+        self.assertTrue(np.array_equal(sequential.assignment, parallel.assignment))
+
+    def test_update_model(self):
+        method = InterleavedREMBO(f=self.f, domain=self.domain, subspace_dim_size=2, num_embeddings=3,
+                                  initial_design_numdata=2, acquisition_workers=1)
+        method.max_iter = 7
+        method.num_acquisitions = 6
+        method.update()
+        models = list(method.models)
+        parameters = [model.model.param_array.copy() for model in models]
+
+        method.next_point()
+        method.update()
+
+        for i in range(3):
+            if i == method.current_embedding:
+                self.assertIsNot(models[i], method.models[i])
+            else:
+                self.assertIs(models[i], method.models[i])
+                self.assertTrue(np.allclose(parameters[i], method.models[i].model.param_array))
+                self.assertTrue(np.allclose(method.Y_inmodel[method.assignment == i], method.models[i].model.Y))
+
+    def test_not_implemented(self):
+        with self.assertRaises(NotImplementedError):
+            InterleavedREMBO(f=self.f, domain=self.domain, subspace_dim_size=2,
+                             evaluator_type='asynchronous', batch_size=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
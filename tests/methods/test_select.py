@@ -1,11 +1,21 @@
+import tempfile
 import unittest
+import numpy as np
 from bayopt.methods.select import SelectObjective
+from bayopt.plot.loader import load_log
+from bayopt.utils.utils import rmdir_when_any
+from bayopt.utils.utils import storage_dir
 from tests.utils.example_function import ExampleFunction
 
 
 class TestSelect(unittest.TestCase):
 
     def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        storage = storage_dir(directory.name)
+        storage.__enter__()
+        self.addCleanup(storage.__exit__, None, None, None)
         self.f = ExampleFunction()
 
         self.domain = [
@@ -22,3 +32,20 @@ class TestSelect(unittest.TestCase):
         self.assertEqual(method.num_acquisitions, 10)
         self.assertEqual(len(method.bernoulli_theta), 4)
         self.assertTrue(True)
+
+    def test_stream_log(self):
+        method = SelectObjective(fill_in_strategy='random', f=self.f, domain=self.domain, stream_log=True,
+                                 stream_buffer_size=3)
+        method.run_optimization(max_iter=10)
+
+        self.assertEqual(len(method.bernoulli_theta), 0)
+        self.assertEqual(len(method.log_masks), 0)
+
+        evaluations = load_log(expt=method.storage_dir, name='evaluation')
+        self.assertTrue(np.array_equal(evaluations[:, 1:2], method.Y))
+        self.assertTrue(np.array_equal(evaluations[:, 2:], method.X))
+
+        self.assertEqual(load_log(expt=method.storage_dir, name='distribution', header=False).shape, (4, 5))
+        self.assertEqual(load_log(expt=method.storage_dir, name='mask', header=False, dtype='str').shape, (9, 5))
+
+        rmdir_when_any(method.storage_dir)
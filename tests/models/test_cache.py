@@ -0,0 +1,49 @@
+import unittest
+import numpy as np
+from bayopt.models.cache import SubspaceCache
+from bayopt.models.gpmodel import IncrementalGPModel
+
+
+class TestSubspaceCache(unittest.TestCase):
+
+    def test_hit_and_miss(self):
+        cache = SubspaceCache(capacity=2)
+        self.assertIsNone(cache.get(np.array([0, 2])))
+
+        cache.put(subspace_idx=np.array([2, 0]), space='space', model='model')
+        entry = cache.get(np.array([0, 2]))
+
+        self.assertEqual(entry.model, 'model')
+        self.assertEqual(entry.space, 'space')
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 1)
+
+    def test_capacity(self):
+        cache = SubspaceCache(capacity=2)
+        cache.put(subspace_idx=[0], space=None, model='a')
+        cache.put(subspace_idx=[1], space=None, model='b')
+        cache.get([0])
+        cache.put(subspace_idx=[2], space=None, model='c')
+
+        self.assertEqual(len(cache), 2)
+        self.assertTrue([0] in cache)
+        self.assertFalse([1] in cache)
+
+    def test_memory(self):
+        X = np.random.uniform(size=(10, 2))
+        Y = np.random.uniform(size=(10, 1))
+
+        model = IncrementalGPModel(max_iters=0)
+        model.updateModel(X, Y, None, None)
+
+        cache = SubspaceCache(capacity=10, max_memory=1)
+        cache.put(subspace_idx=[0, 1], space=None, model=model)
+        cache.put(subspace_idx=[1, 2], space=None, model=model)
+
+        self.assertEqual(len(cache), 1)
+        self.assertTrue(cache.nbytes > 0)
+        self.assertTrue(cache.peek([1, 2]).hyperparameters is not None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+import unittest
+import numpy as np
+from GPyOpt.models.gpmodel import GPModel
+from bayopt.models.gpmodel import ArgumentsManagerExt
+from bayopt.models.gpmodel import IncrementalGPModel
+from bayopt.models.gpmodel import SparseGPModel
+from bayopt.models.gpmodel import update_model
+from bayopt.clock.timer import PhaseTimer
+
+
+class TestIncrementalGPModel(unittest.TestCase):
+
+    def setUp(self) -> None:
+        rng = np.random.RandomState(0)
+        self.X = rng.uniform(-3, 3, size=(20, 3))
+        self.Y = np.sin(self.X).sum(axis=1)[:, None]
+        self.X_test = rng.uniform(-3, 3, size=(5, 3))
+
+    def test_extension_equals_refit(self):
+        model = IncrementalGPModel(optimize_interval=100, likelihood_drift=np.inf)
+        model.updateModel(self.X[:10], self.Y[:10], None, None)
+
+        for n in range(11, 21):
+            model.updateModel(self.X[:n], self.Y[:n], None, None)
+
+        self.assertEqual(model.num_optimizations, 1)
+
+        reference = GPModel(kernel=model.model.kern.copy(), noise_var=model.model.likelihood.variance[0],
+                            max_iters=0)
+        reference.updateModel(self.X, self.Y, None, None)
+
+        m, s = model.predict(self.X_test)
+        m_ref, s_ref = reference.predict(self.X_test)
+
+        self.assertTrue(np.allclose(m, m_ref, atol=1e-6))
+        self.assertTrue(np.allclose(s, s_ref, atol=1e-6))
+        self.assertAlmostEqual(model.model.log_likelihood(), reference.model.log_likelihood(), places=5)
+
+    def test_truncation_equals_refit(self):
+        model = IncrementalGPModel(max_iters=0)
+        model.updateModel(self.X[:15], self.Y[:15], None, None)
+        model.updateModel(self.X, self.Y, None, None)
+        model.model.set_XY(self.X[:12], self.Y[:12])
+
+        reference = GPModel(kernel=model.model.kern.copy(), noise_var=model.model.likelihood.variance[0],
+                            max_iters=0)
+        reference.updateModel(self.X[:12], self.Y[:12], None, None)
+
+        m, s = model.predict(self.X_test)
+        m_ref, s_ref = reference.predict(self.X_test)
+
+        self.assertTrue(np.allclose(m, m_ref, atol=1e-6))
+        self.assertTrue(np.allclose(s, s_ref, atol=1e-6))
+
+    def test_optimize_interval(self):
+        model = IncrementalGPModel(optimize_interval=3, likelihood_drift=np.inf, optimize_restarts=1)
+
+        for n in range(5, 12):
+            model.updateModel(self.X[:n], self.Y[:n], None, None)
+
+        self.assertEqual(model.num_optimizations, 3)
+
+    def test_likelihood_drift(self):
+        model = IncrementalGPModel(optimize_interval=100, likelihood_drift=0., optimize_restarts=1)
+
+        for n in range(5, 8):
+            model.updateModel(self.X[:n], self.Y[:n], None, None)
+
+        self.assertEqual(model.num_optimizations, 3)
+
+    def test_update_model(self):
+        np.random.seed(0)
+        reference = GPModel(optimize_restarts=1)
+        reference.updateModel(self.X, self.Y, None, None)
+
+        np.random.seed(0)
+        model = GPModel(optimize_restarts=1)
+        timer = PhaseTimer()
+        update_model(model=model, X_all=self.X, Y_all=self.Y, timer=timer)
+
+        self.assertTrue(np.allclose(reference.model.param_array, model.model.param_array))
+        self.assertEqual(1000, model.max_iters)
+        self.assertGreater(timer.totals()['model'], 0)
+        self.assertGreater(timer.totals()['hyperparameters'], 0)
+
+    def test_update_model_max_iters(self):
+        model = GPModel(optimize_restarts=1)
+        timer = PhaseTimer()
+        update_model(model=model, X_all=self.X[:10], Y_all=self.Y[:10], timer=timer)
+        parameters = model.model.param_array.copy()
+
+        update_model(model=model, X_all=self.X, Y_all=self.Y, timer=timer, max_iters=0)
+
+        self.assertTrue(np.allclose(parameters, model.model.param_array))
+        self.assertEqual(20, model.model.X.shape[0])
+        self.assertEqual(1000, model.max_iters)
+
+    def test_update_model_optimize_restarts(self):
+        model = GPModel()
+        update_model(model=model, X_all=self.X, Y_all=self.Y, timer=PhaseTimer(), optimize_restarts=1, max_iters=10)
+
+        self.assertEqual(5, model.optimize_restarts)
+        self.assertEqual(1000, model.max_iters)
+
+
+class TestSparseGPModel(unittest.TestCase):
+
+    def setUp(self) -> None:
+        rng = np.random.RandomState(0)
+        self.X = rng.uniform(-3, 3, size=(30, 2))
+        self.Y = np.sin(self.X).sum(axis=1)[:, None]
+
+    def test_inducing_inputs(self):
+        model = SparseGPModel(num_inducing=8, max_iters=0)
+        model.updateModel(self.X[:5], self.Y[:5], None, None)
+        gp = model.model
+        self.assertEqual(5, gp.Z.shape[0])
+
+        model.updateModel(self.X[:7], self.Y[:7], None, None)
+        self.assertTrue(np.allclose(gp.Z[5:], self.X[5:7]))
+
+        model.updateModel(self.X, self.Y, None, None)
+        self.assertTrue(gp is model.model)
+        self.assertEqual(8, gp.Z.shape[0])
+        self.assertEqual(30, gp.X.shape[0])
+
+    def test_replacement(self):
+        model = SparseGPModel(num_inducing=2, max_iters=0)
+        model.updateModel(np.array([[0., 0.], [0.1, 0.]]), np.zeros((2, 1)), None, None)
+        model.updateModel(np.array([[0., 0.], [0.1, 0.], [2., 2.], [0.05, 0.]]), np.zeros((4, 1)), None, None)
+
+        self.assertTrue(np.any(np.all(np.isclose(model.model.Z, [2., 2.]), axis=1)))
+        self.assertFalse(np.any(np.all(np.isclose(model.model.Z, [0.05, 0.]), axis=1)))
+
+    def test_model_parameters(self):
+        model = SparseGPModel(num_inducing=4, optimize_restarts=1, max_iters=10)
+        model.updateModel(self.X[:3], self.Y[:3], None, None)
+        parameters = model.get_model_parameters()
+        model.updateModel(self.X, self.Y, None, None)
+
+        self.assertEqual(parameters.shape, model.get_model_parameters().shape)
+        self.assertEqual(parameters.shape[1], len(model.get_model_parameters_names()))
+
+    def test_model_creator(self):
+        arguments_mng = ArgumentsManagerExt(kwargs={'num_inducing': 5, 'ARD': True})
+        model = arguments_mng.model_creator(model_type='sparseGP', exact_feval=False, space=None)
+
+        self.assertTrue(isinstance(model, SparseGPModel))
+        self.assertEqual(5, model.num_inducing)
+        self.assertTrue(model.ARD)
+        self.assertFalse(isinstance(arguments_mng.model_creator(model_type='GP', exact_feval=False, space=None),
+                                    SparseGPModel))
+
+
+if __name__ == '__main__':
+    unittest.main()
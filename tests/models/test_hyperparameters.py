@@ -0,0 +1,69 @@
+import unittest
+import numpy as np
+from GPyOpt.models.gpmodel import GPModel
+from bayopt.models.hyperparameters import HyperparameterStore
+
+
+class TestHyperparameterStore(unittest.TestCase):
+
+    def setUp(self) -> None:
+        rng = np.random.RandomState(0)
+        self.X = rng.uniform(-3, 3, size=(15, 2))
+        self.Y = np.sin(self.X).sum(axis=1)[:, None]
+
+    def _gp(self, ARD=True, exact_feval=False):
+        model = GPModel(max_iters=0, ARD=ARD, exact_feval=exact_feval)
+        model.updateModel(self.X, self.Y, None, None)
+        return model.model
+
+    def test_update(self):
+        gp = self._gp()
+        gp.kern.lengthscale[:] = [0.5, 2.]
+        gp.kern.variance[:] = 3.
+
+        store = HyperparameterStore(dimensionality=5)
+        self.assertTrue(store.is_empty)
+
+        store.update(subspace_idx=np.array([1, 3]), gp=gp)
+
+        self.assertTrue(np.allclose([1., 0.5, 1., 2., 1.], store.lengthscale))
+        self.assertEqual([False, True, False, True, False], list(store.fitted))
+        self.assertAlmostEqual(3., store.variance)
+
+    def test_initialize(self):
+        store = HyperparameterStore(dimensionality=5)
+        store.update(subspace_idx=np.array([1, 3]), gp=self._gp())
+        store.lengthscale[[1, 3]] = [0.5, 2.]
+        store.variance = 3.
+        store.noise_variance = 0.1
+
+        gp = self._gp()
+        store.initialize(subspace_idx=np.array([3, 4]), gp=gp)
+
+        # --- the unknown dimension starts from the geometric mean of the known lengthscales
+        self.assertTrue(np.allclose([2., 1.], gp.kern.lengthscale))
+        self.assertAlmostEqual(3., float(gp.kern.variance))
+        self.assertAlmostEqual(0.1, float(gp.likelihood.variance))
+
+        gp = self._gp(ARD=False, exact_feval=True)
+        store.initialize(subspace_idx=np.array([1, 3]), gp=gp)
+
+        self.assertTrue(np.allclose([1.], gp.kern.lengthscale))
+        self.assertAlmostEqual(1e-6, float(gp.likelihood.variance))
+
+    def test_state(self):
+        store = HyperparameterStore(dimensionality=3)
+        self.assertEqual(dict(), store.state())
+
+        store.update(subspace_idx=np.array([0, 2]), gp=self._gp())
+
+        restored = HyperparameterStore(dimensionality=3)
+        restored.restore(store.state())
+
+        self.assertTrue(np.array_equal(store.lengthscale, restored.lengthscale))
+        self.assertTrue(np.array_equal(store.fitted, restored.fitted))
+        self.assertEqual(store.variance, restored.variance)
+
+
+if __name__ == '__main__':
+    unittest.main()
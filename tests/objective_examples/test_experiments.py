@@ -2,6 +2,7 @@ import unittest
 import numpy as np
 from bayopt.objective_examples.experiments import GaussianMixtureFunction
 from bayopt.objective_examples.experiments import SchwefelsFunction
+from bayopt.objective_examples.experiments import BraininFunction
 
 
 class TestExperiments(unittest.TestCase):
@@ -19,6 +20,22 @@ class TestExperiments(unittest.TestCase):
         self.assertEqual(0, f(np.zeros(30)))
         self.assertEqual(9455, f(np.ones(30)))
 
+    def test_batch(self):
+        x = np.vstack((np.zeros(30), np.ones(30), np.full(30, 2)))
+
+        results = SchwefelsFunction()(x)
+        self.assertEqual(results.shape, (3, 1))
+        self.assertTrue(np.all(np.array([[0], [9455], [4 * 9455]]) == results))
+
+        results = GaussianMixtureFunction(dim=30, mean_1=2, mean_2=3)(x)
+        self.assertEqual(results.shape, (3, 1))
+        self.assertEqual(1, results[2, 0])
+
+        f = BraininFunction(effective1=1, effective2=3)
+        results = f(x)
+        self.assertEqual(results.shape, (3, 1))
+        self.assertEqual(f(np.ones(30)), results[1, 0])
+
 
 if __name__ == '__main__':
     unittest.main()
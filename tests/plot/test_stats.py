@@ -5,6 +5,11 @@ from bayopt.plot.stats import minimum_locus
 from bayopt.plot.stats import with_confidential
 from bayopt.plot.stats import histogram
 from bayopt.plot.stats import count_true
+from bayopt.plot.stats import maximum_loci
+from bayopt.plot.stats import minimum_loci
+from bayopt.plot.stats import pivot_table
+from bayopt.plot.stats import to_zero_one
+import tempfile
 
 
 class TestStats(unittest.TestCase):
@@ -63,3 +68,39 @@ class TestStats(unittest.TestCase):
         result = count_true(data)
 
         self.assertTrue(np.all([1, 0, 2] == result))
+
+    def test_loci(self):
+        data = np.array([[1, 2, 4, 3], [-1, -2, 0, -3]])
+
+        self.assertTrue(np.all(np.array([[1, 2, 4, 4], [0, 0, 0, 0]]) == maximum_loci(data)))
+        self.assertTrue(np.all(np.array([[1, 1, 1, 1], [-1, -2, -2, -3]]) == minimum_loci(data)))
+
+        with self.assertRaises(ValueError):
+            minimum_loci(np.array([1, 2]))
+
+    def test_loci_memmap(self):
+        with tempfile.TemporaryDirectory() as directory:
+            data = np.memmap(directory + '/runs.bin', dtype=np.float64, mode='w+', shape=(3, 4))
+            data[:] = [[3, 4, 2, 1], [1, 1, 1, 1], [5, 0, 6, -1]]
+            data.flush()
+
+            data = np.memmap(directory + '/runs.bin', dtype=np.float64, mode='r', shape=(3, 4))
+            results = minimum_loci(data)
+
+            self.assertTrue(np.all(np.array([[3, 3, 2, 1], [1, 1, 1, 1], [5, 0, 0, -1]]) == results))
+            del data
+
+    def test_pivot_table(self):
+        data = np.array([[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]])
+
+        results = pivot_table(data, value='theta', columns='iteration', index='dimension')
+
+        self.assertEqual(list(results.index), [1, 2, 3])
+        self.assertEqual(list(results.columns), [1, 2])
+        self.assertEqual(results.loc[3, 2], 0.6)
+
+    def test_to_zero_one(self):
+        data = np.array([[True, False], [False, False]])
+
+        self.assertTrue(np.all(np.array([[1, 0], [0, 0]]) == to_zero_one(data)))
+        self.assertTrue(np.all(np.array([1, 0]) == count_true(data)))
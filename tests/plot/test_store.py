@@ -0,0 +1,89 @@
+import tempfile
+import unittest
+import numpy as np
+from bayopt.methods.bo import BayesianOptimizationExt
+from bayopt.plot.store import ExperimentStore
+from bayopt.utils.utils import mkdir_when_not_exist
+from bayopt.utils.utils import storage_dir
+from tests.utils.example_function import ExampleFunction
+
+
+class TestStore(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.storage_dir = self.directory.name
+        mkdir_when_not_exist(abs_path=self.storage_dir + '/Unit Test')
+
+        self._make_experiment('2019-06-01 12:00:00 5D random', [3, 2, 1])
+        self._make_experiment('2019-06-02 12:00:00 5D random', [6, 5, 4, 3])
+        self._make_experiment('2019-06-03 12:00:00 5D copy', [9, 8, 7])
+        self._make_experiment('2019-07-01 12:00:00 10D random', [1, 1, 1])
+        mkdir_when_not_exist(abs_path=self.storage_dir + '/Unit Test/broken')
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def _make_experiment(self, name, y):
+        expt = self.storage_dir + '/Unit Test/' + name
+        mkdir_when_not_exist(abs_path=expt)
+
+        results = np.hstack((np.arange(1, len(y) + 1)[:, None], np.array(y)[:, None], np.zeros((len(y), 2))))
+        np.savetxt(expt + '/evaluation.csv', results, delimiter='\t', header='Iteration\tY\tvar_1\tvar_2',
+                   comments='')
+
+    def test_import(self):
+        store = ExperimentStore(function_name='Unit Test', storage_dir=self.storage_dir)
+
+        self.assertEqual(4, store.import_experiments())
+        self.assertEqual(0, store.import_experiments())
+        self.assertTrue('2019-06-03 12:00:00 5D copy' in store)
+
+        store = ExperimentStore(function_name='Unit Test', storage_dir=self.storage_dir)
+        self.assertTrue(store.exists())
+        self.assertEqual(4, len(store))
+
+    def test_load(self):
+        store = ExperimentStore(function_name='Unit Test', storage_dir=self.storage_dir)
+        store.import_experiments()
+
+        results = store.load(dim='5D', feature='random')
+        self.assertTrue(np.array_equal(results, [[3, 2, 1], [6, 5, 4]]))
+
+        results = store.load(dim='5D', start='2019-06-02', end='2019-06-30')
+        self.assertTrue(np.array_equal(results, [[6, 5, 4], [9, 8, 7]]))
+
+        self.assertEqual(store.load(dim='30D').shape, (0, 0))
+
+        with self.assertRaises(ValueError):
+            store.load(dim='5D', iter_check=4)
+
+    def test_append(self):
+        store = ExperimentStore(function_name='Unit Test', storage_dir=self.storage_dir)
+        store.import_experiments()
+        store.append(name='2019-08-01 12:00:00 5D mix', created_at='2019-08-01 12:00:00', dim='5D', feature='mix',
+                     y=[5, 4])
+
+        results = ExperimentStore(function_name='Unit Test', storage_dir=self.storage_dir).load(feature='mix')
+        self.assertTrue(np.array_equal(results, [[5, 4]]))
+
+
+    def test_saved_run(self):
+        store = ExperimentStore(function_name='Unit Test', storage_dir=self.storage_dir)
+        store.import_experiments()
+
+        f = ExampleFunction()
+        f.function_name = 'Unit Test'
+        domain = [{'name': 'x', 'type': 'continuous', 'domain': (-3, 3), 'dimensionality': 2}]
+
+        with storage_dir(self.storage_dir):
+            method = BayesianOptimizationExt(f=f, domain=domain, initial_design_numdata=3)
+            method.run_optimization(max_iter=2)
+
+        store = ExperimentStore(function_name='Unit Test', storage_dir=self.storage_dir)
+        self.assertEqual(5, len(store))
+        self.assertTrue(method.storage_dir.split('/')[-1] in store)
+
+        results = store.load(dim='2D', feature='bo')
+        self.assertTrue(np.allclose(results, method.Y.T))
+        self.assertEqual(0, store.import_experiments())
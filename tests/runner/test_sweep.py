@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from bayopt.runner.sweep import Run
+from bayopt.runner.sweep import Sweep
+from bayopt.runner.sweep import checkpoint_dir
+from bayopt.runner.sweep import execute
+from bayopt.runner.sweep import expand
+from bayopt.utils.catalog import Catalog
+
+
+class TestSweep(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.storage_dir = self.directory.name
+
+        self.config = {
+            'name': 'unit_test',
+            'objectives': [{'function': 'gaussian_mixture', 'mean_1': 2, 'mean_2': 3}],
+            'dims': [3],
+            'methods': ['dropout_random', 'bo'],
+            'subspace_dims': [1, 2],
+            'repetitions': 2,
+            'max_iter': 3,
+            'options': {'maximize': True},
+            'checkpoint_interval': 1,
+        }
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_expand(self):
+        runs = expand(self.config)
+
+        self.assertEqual(6, len(runs))
+        self.assertEqual(4, len([run for run in runs if run.method == 'dropout_random']))
+        self.assertTrue(all(run.subspace_dim is None for run in runs if run.method == 'bo'))
+        self.assertEqual(len(runs), len(set(run.key for run in runs)))
+
+        with self.assertRaises(ValueError):
+            expand(dict(self.config, methods=['unknown']))
+
+    def test_seed(self):
+        run = Run(objective=0, dim=3, method='bo', subspace_dim=None, repetition=0)
+        other = Run(objective=0, dim=3, method='bo', subspace_dim=None, repetition=1)
+
+        self.assertTrue(np.array_equal(run.seed(entropy=0), run.seed(entropy=0)))
+        self.assertFalse(np.array_equal(run.seed(entropy=0), other.seed(entropy=0)))
+        self.assertFalse(np.array_equal(run.seed(entropy=0), run.seed(entropy=1)))
+
+    def test_run(self):
+        sweep = Sweep(config=self.config, workers=2, storage_dir=self.storage_dir)
+
+        self.assertEqual([], sweep.run())
+        self.assertEqual(6, len(sweep.finished()))
+        self.assertEqual([], sweep.pending())
+        self.assertEqual([], os.listdir(sweep.sweep_dir + '/checkpoints'))
+
+        paths = [self.storage_dir + '/' + record['path'] for record in sweep.finished().values()]
+        self.assertTrue(all(os.path.isfile(path + '/evaluation.csv') for path in paths))
+        self.assertEqual(6, len(Catalog(path=self.storage_dir + '/catalog.sqlite').query(
+            function='Gaussian mixture function')))
+
+    def test_resume(self):
+        sweep = Sweep(config=self.config, storage_dir=self.storage_dir)
+        os.makedirs(sweep.sweep_dir + '/checkpoints')
+        os.makedirs(sweep.sweep_dir + '/logs')
+
+        run = Run(objective=0, dim=3, method='dropout_random', subspace_dim=2, repetition=0)
+        execute(run, self.config, sweep.sweep_dir, self.storage_dir)
+        self.assertTrue(os.path.isdir(checkpoint_dir(sweep_dir=sweep.sweep_dir, run=run)))
+
+        path = execute(run, dict(self.config, max_iter=5), sweep.sweep_dir, self.storage_dir)
+        evaluations = np.loadtxt(path + '/evaluation.csv', delimiter='\t', skiprows=1, ndmin=2)
+        self.assertEqual(5, evaluations.shape[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import numpy as np
+from bayopt.space.embedding import BlockEmbedding
+from bayopt.space.embedding import CountSketchEmbedding
+from bayopt.space.embedding import GaussianEmbedding
+from bayopt.space.embedding import create_embedding
+
+
+class TestEmbedding(unittest.TestCase):
+
+    def setUp(self) -> None:
+        np.random.seed(0)
+        self.x = np.random.uniform(-1, 1, size=(7, 3))
+
+    def test_gaussian(self):
+        embedding = GaussianEmbedding(dimensionality=20, subspace_dim=3)
+        z = embedding.map(self.x)
+
+        self.assertEqual((7, 20), z.shape)
+        self.assertTrue(np.array_equal(np.clip(self.x.dot(embedding.matrix.T), -1, 1), z))
+        self.assertAlmostEqual(np.sqrt(3), embedding.bound)
+
+    def test_count_sketch(self):
+        embedding = CountSketchEmbedding(dimensionality=20, subspace_dim=3)
+        z = embedding.map(self.x)
+
+        self.assertEqual([0, 1, 2], sorted(set(embedding.index)))
+        self.assertTrue(np.array_equal(np.abs(z), np.abs(self.x[:, embedding.index])))
+        self.assertTrue(np.array_equal(z, embedding.sign * self.x[:, embedding.index]))
+
+    def test_block(self):
+        embedding = BlockEmbedding(dimensionality=8, subspace_dim=3)
+        z = embedding.map(self.x)
+
+        self.assertEqual(8, embedding.block_sizes.sum())
+        expected = np.clip(self.x[:, [0, 0, 1, 1, 1, 2, 2, 2]] * embedding.weights, -1, 1)
+        self.assertTrue(np.allclose(expected, z))
+
+    def test_batch(self):
+        for embedding_type in ['gaussian', 'count_sketch', 'block']:
+            embedding = create_embedding(embedding_type=embedding_type, dimensionality=50, subspace_dim=3)
+            z = embedding.map(3 * self.x)
+
+            self.assertTrue(np.all(np.abs(z) <= 1))
+            self.assertTrue(np.allclose(z[2:3], embedding.map(3 * self.x[2])))
+
+        with self.assertRaises(ValueError):
+            create_embedding(embedding_type='dense', dimensionality=50, subspace_dim=3)
+
+    def test_state(self):
+        embedding = create_embedding(embedding_type='count_sketch', dimensionality=50, subspace_dim=3)
+        restored = create_embedding(embedding_type='count_sketch', dimensionality=50, subspace_dim=3)
+        restored.restore(embedding.state())
+
+        self.assertTrue(np.array_equal(embedding.map(self.x), restored.map(self.x)))
+
+
+if __name__ == '__main__':
+    unittest.main()
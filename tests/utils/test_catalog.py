@@ -0,0 +1,53 @@
+import tempfile
+import unittest
+from bayopt.utils.catalog import Catalog
+from bayopt.utils.utils import mkdir_when_not_exist
+
+
+class TestCatalog(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.storage_dir = self.directory.name
+        self.catalog = Catalog(path=self.storage_dir + '/catalog.sqlite')
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def _path(self, function, name):
+        return self.storage_dir + '/' + function + '/' + name
+
+    def test_query(self):
+        function = "Schwefel's function"
+        self.catalog.register(function=function, created_at='2019-06-02 12:00:00', dim=30, method='random',
+                              subspace_dim=5, path=self._path(function, 'b'))
+        self.catalog.register(function=function, created_at='2019-06-01 12:00:00', dim=30, method='random',
+                              subspace_dim=10, path=self._path(function, 'a'))
+        self.catalog.register(function=function, created_at='2019-06-03 12:00:00', dim=30, method='REMBO_5',
+                              subspace_dim=5, path=self._path(function, 'c'))
+        self.catalog.register(function='Other', created_at='2019-06-03 12:00:00', dim=30, method='random',
+                              path=self._path('Other', 'd'))
+
+        self.assertEqual(self.catalog.query(function=function, dim='30D', method='random'),
+                         [self._path(function, 'a'), self._path(function, 'b')])
+        self.assertEqual(self.catalog.query(function=function, subspace_dim=5),
+                         [self._path(function, 'b'), self._path(function, 'c')])
+        self.assertEqual(self.catalog.query(function=function, start='2019-06-02', end='2019-06-02 23:59:59'),
+                         [self._path(function, 'b')])
+        self.assertEqual(self.catalog.query(function=function, dim=5), [])
+
+    def test_register_twice(self):
+        for _ in range(2):
+            self.catalog.register(function='f', created_at='2019-06-01 12:00:00', dim=5, method='bo',
+                                  path=self._path('f', 'a'))
+
+        self.assertEqual(len(self.catalog.query(function='f')), 1)
+
+    def test_import(self):
+        for name in ['2019-06-01 12:00:00 5D random', '2019-06-02 12:00:00 5D REMBO_2', 'broken']:
+            mkdir_when_not_exist(abs_path=self.storage_dir + '/f')
+            mkdir_when_not_exist(abs_path=self._path('f', name))
+
+        self.assertEqual(self.catalog.import_experiments(function='f'), 2)
+        self.assertEqual(self.catalog.query(function='f', dim=5, subspace_dim=2),
+                         [self._path('f', '2019-06-02 12:00:00 5D REMBO_2')])
@@ -0,0 +1,52 @@
+import tempfile
+import unittest
+import numpy as np
+from bayopt.utils.stream import StreamLogger
+from bayopt.utils.stream import read_stream
+from bayopt.utils.stream import read_stream_header
+
+
+class TestStream(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_name = self.directory.name + '/log.stream'
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_buffered_flush(self):
+        logger = StreamLogger(file_name=self.file_name, columns=['a', 'b'], buffer_size=3)
+
+        logger.extend(np.arange(8).reshape(4, 2))
+        self.assertEqual(read_stream(self.file_name).shape, (3, 2))
+
+        logger.append([8, 9])
+        logger.close()
+
+        data = read_stream(self.file_name)
+        self.assertTrue(np.array_equal(data, np.arange(10).reshape(5, 2)))
+        self.assertTrue(np.array_equal(read_stream(self.file_name, start=3), data[3:]))
+        self.assertEqual(read_stream_header(self.file_name)['columns'], ['a', 'b'])
+
+    def test_partial_row(self):
+        logger = StreamLogger(file_name=self.file_name, columns=['a', 'b'], dtype='bool', buffer_size=1)
+        logger.append([True, False])
+
+        # --- a row which is being written
+        with open(self.file_name, 'ab') as file:
+            file.write(np.array([True]).tobytes())
+
+        data = read_stream(self.file_name)
+        logger.close()
+
+        self.assertEqual(data.dtype, np.bool_)
+        self.assertTrue(np.array_equal(data, [[True, False]]))
+
+    def test_columns(self):
+        logger = StreamLogger(file_name=self.file_name, columns=['a', 'b'])
+
+        with self.assertRaises(ValueError):
+            logger.append([1, 2, 3])
+
+        logger.close()